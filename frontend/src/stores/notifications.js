@@ -12,7 +12,7 @@ export const useNotificationStore = defineStore('notifications', () => {
 
   // Get auth token from localStorage
   const getAuthToken = () => {
-    const token = localStorage.getItem('access_token')
+    const token = localStorage.getItem('token')
     return token ? `Bearer ${token}` : null
   }
 
@@ -126,6 +126,79 @@ export const useNotificationStore = defineStore('notifications', () => {
     }
   }
 
+  // Server push: new notifications and unread count arrive over one
+  // EventSource connection, opened with a single-use ticket so the access
+  // token never goes in a URL. The backend only offers the stream with a
+  // shared cache; when it refuses, or keeps failing, poll instead.
+  let eventSource = null
+  let streamFailures = 0
+  let streamGeneration = 0
+  const MAX_STREAM_FAILURES = 3
+  const STREAM_RETRY_MS = 3000
+
+  const startStream = async () => {
+    stopStream()
+    const generation = streamGeneration
+    const token = getAuthToken()
+    if (!token || typeof EventSource === 'undefined') {
+      startPolling()
+      return
+    }
+
+    let ticket
+    try {
+      const response = await axios.post('/notifications/stream_ticket/', {}, {
+        headers: { Authorization: token }
+      })
+      ticket = response.data.ticket
+    } catch (error) {
+      // 404: stream not enabled on this backend
+      if (generation === streamGeneration) startPolling()
+      return
+    }
+    if (generation !== streamGeneration) return  // Stopped or restarted meanwhile
+
+    eventSource = new EventSource(
+      `${axios.defaults.baseURL}/notifications/stream/?ticket=${encodeURIComponent(ticket)}`
+    )
+
+    eventSource.addEventListener('unread_count', (event) => {
+      streamFailures = 0
+      unreadCount.value = JSON.parse(event.data).count
+    })
+
+    eventSource.addEventListener('notification', (event) => {
+      const notification = JSON.parse(event.data)
+      if (!notifications.value.some(n => n.id === notification.id)) {
+        notifications.value.unshift(notification)
+      }
+    })
+
+    eventSource.onerror = () => {
+      // Tickets work once, so the browser's own reconnect would be refused:
+      // reconnect with a fresh ticket, or give up and poll if it keeps failing
+      stopStream()
+      streamFailures += 1
+      if (streamFailures >= MAX_STREAM_FAILURES) {
+        startPolling()
+        return
+      }
+      const retryGeneration = streamGeneration
+      setTimeout(() => {
+        if (retryGeneration === streamGeneration) startStream()
+      }, STREAM_RETRY_MS)
+    }
+  }
+
+  const stopStream = () => {
+    streamGeneration += 1  // Cancels a ticket request or retry still in flight
+    if (eventSource) {
+      eventSource.close()
+      eventSource = null
+    }
+    stopPolling()
+  }
+
   return {
     notifications,
     unreadCount,
@@ -137,6 +210,8 @@ export const useNotificationStore = defineStore('notifications', () => {
     markAsRead,
     markAllAsRead,
     startPolling,
-    stopPolling
+    stopPolling,
+    startStream,
+    stopStream
   }
 })
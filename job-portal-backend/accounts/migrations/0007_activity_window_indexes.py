@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_set_existing_users_verified"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="otpverification",
+            index=models.Index(
+                fields=["created_at", "user"], name="accounts_ot_created_b57d37_idx"
+            ),
+        ),
+    ]
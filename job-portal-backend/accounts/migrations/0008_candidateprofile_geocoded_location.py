@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_activity_window_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="candidateprofile",
+            name="latitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="candidateprofile",
+            name="location_normalized",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=100
+            ),
+        ),
+        migrations.AddField(
+            model_name="candidateprofile",
+            name="longitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="candidateprofile",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="accounts_ca_latitud_516afe_idx"
+            ),
+        ),
+    ]
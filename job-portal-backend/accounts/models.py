@@ -74,6 +74,11 @@ class CandidateProfile(models.Model):
     )
     phone = models.CharField(max_length=20, blank=True)
     location = models.CharField(max_length=200, blank=True)
+
+    # Geocoded from location on save by the jobs app (see jobs/signals.py)
+    location_normalized = models.CharField(max_length=100, blank=True, db_index=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     experience_years = models.IntegerField(null=True, blank=True)
     education = models.TextField(blank=True)
 
@@ -87,6 +92,11 @@ class CandidateProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['latitude', 'longitude']),  # Radius search bounding box
+        ]
+
     def __str__(self):
         return f"{self.user.email}'s Profile"
 
@@ -104,6 +114,11 @@ class OTPVerification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'user']),  # Activity windows
+        ]
+
     def is_valid(self):
         return not self.is_used and self.expires_at > timezone.now()
 
@@ -35,7 +35,7 @@ class CandidateProfileSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'user', 'user_email', 'first_name', 'last_name',
             'resume_file', 'resume_url', 'resume_text', 'skills', 'phone',
-            'location', 'experience_years', 'education', 'college_name',
+            'location', 'location_normalized', 'experience_years', 'education', 'college_name',
             'passout_year', 'linkedin_url', 'leetcode_url', 'github_url',
             'created_at', 'updated_at'
         ]
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Conversation, Message, AIAnalytics
+from .utils.prompt_cache import prompt_cache_stats
 
 
 @admin.register(Conversation)
@@ -26,12 +27,22 @@ class MessageAdmin(admin.ModelAdmin):
 @admin.register(AIAnalytics)
 class AIAnalyticsAdmin(admin.ModelAdmin):
     list_display = [
-        'user', 'action_type', 'input_tokens', 'output_tokens',
-        'response_time_ms', 'success', 'created_at'
+        'user', 'action_type', 'input_tokens', 'estimated_input_tokens',
+        'output_tokens', 'max_tokens', 'cached_input_tokens', 'response_time_ms', 'success', 'created_at'
     ]
-    list_filter = ['action_type', 'success', 'created_at']
+    list_filter = ['action_type', 'prompt_version', 'success', 'created_at']
     search_fields = ['user__email', 'action_type', 'error_message']
     readonly_fields = ['created_at']
+    actions = ['prompt_cache_report']
+
+    @admin.action(description="Show prompt cache hit rates for selected calls")
+    def prompt_cache_report(self, request, queryset):
+        for row in prompt_cache_stats(queryset):
+            self.message_user(
+                request,
+                f"{row['action_type']}: {row['cached_calls']}/{row['calls']} calls hit the cache "
+                f"({row['hit_rate']}%), {row['cached_token_share']}% of input tokens cached"
+            )
 
     def has_add_permission(self, request):
         # Analytics are auto-generated, not manually created
@@ -5,3 +5,7 @@ class AiAssistantConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_assistant'
     verbose_name = 'AI Assistant'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import ai_assistant.signals
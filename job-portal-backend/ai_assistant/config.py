@@ -60,6 +60,20 @@ TOP_P = 0.9
 # Rate Limiting
 MAX_REQUESTS_PER_MINUTE = 60
 MAX_REQUESTS_PER_DAY = 1000
+# Every AI call is recorded in AIAnalytics, including each candidate of a
+# screening or comparison batch, so an hour of active recruiting makes
+# a few hundred legitimate calls
+MAX_AI_CALLS_PER_HOUR = int(os.getenv('MAX_AI_CALLS_PER_HOUR', 300))
+
+# Suspicious Activity Detection
+# Each activity type is counted per user over its own sliding window;
+# a user is flagged once their count inside the window reaches the threshold.
+SUSPICIOUS_ACTIVITY_RULES = {
+    'applications': {'window_minutes': 24 * 60, 'threshold': 10},
+    'job_posts': {'window_minutes': 24 * 60, 'threshold': 10},
+    'otp_requests': {'window_minutes': 60, 'threshold': 5},
+    'ai_calls': {'window_minutes': 60, 'threshold': MAX_AI_CALLS_PER_HOUR},
+}
 
 # Conversation Settings
 MAX_CONVERSATION_HISTORY = 20  # Number of messages to keep in context
@@ -70,7 +84,73 @@ ENABLE_RESUME_ANALYSIS = True
 ENABLE_JOB_MATCHING = True
 ENABLE_INTERVIEW_PREP = True
 ENABLE_SKILL_RECOMMENDATIONS = True
+ENABLE_REALTIME_ABUSE_DETECTION = os.getenv('ENABLE_REALTIME_ABUSE_DETECTION', 'True') == 'True'
 
 # Analysis Thresholds
 MIN_SKILL_MATCH_SCORE = 0.6  # 60% minimum match to recommend a job
 HIGH_MATCH_THRESHOLD = 0.8    # 80% for high match
+
+# Semantic Matching (local hashed TF-IDF embeddings, no network calls)
+EMBEDDING_DIMENSIONS = int(os.getenv('EMBEDDING_DIMENSIONS', 1024))
+SEMANTIC_MATCH_THRESHOLD = 0.25  # Cosine similarity at which a job counts as related
+ANN_TABLES = 16                  # LSH hash tables
+ANN_BITS = 10                    # Hyperplanes per table (more tables, fewer bits: better recall)
+ANN_BRUTE_FORCE_LIMIT = 5000     # Below this many vectors an exact scan is faster than LSH
+
+# Two-stage matching (local scorer first, LLM only for the best pairs)
+LLM_RERANK_TOP_N = 5                    # Applications per pool sent to the LLM screener
+LOCAL_MATCH_FLOOR = 0.1                 # Below this local score a single pair skips the LLM
+MATCH_CACHE_SECONDS = 7 * 24 * 60 * 60  # LLM match results, keyed by resume hash and job version
+LLM_SCREENING_WORKERS = 4               # Screening calls in flight at once for one pool
+LLM_SCREENING_TIMEOUT = 60              # Seconds a pool waits for screenings (worker timeout is 120)
+
+# Resume compaction before AI submission (see utils/resume_compactor.py)
+CHARS_PER_TOKEN = 4  # Rough size of a token in English resume text
+RESUME_TOKEN_BUDGETS = {  # Tokens of resume text per prompt
+    'analysis': 6000,     # ATS analysis reviews the whole resume
+    'job_match': 2000,
+    'screening': 2500,
+    'summary': 1500,
+    'comparison': 400,    # Per candidate; several go into one prompt
+}
+# Share of the budget each section gets when a resume has to be cut
+RESUME_SECTION_WEIGHTS = {
+    'analysis': {'header': 1, 'summary': 2, 'experience': 5, 'education': 2, 'skills': 3, 'projects': 3, 'certifications': 1},
+    'job_match': {'header': 0.5, 'summary': 1, 'experience': 5, 'education': 1, 'skills': 4, 'projects': 2, 'certifications': 1},
+    'screening': {'header': 0.5, 'summary': 1, 'experience': 5, 'education': 1.5, 'skills': 4, 'projects': 2, 'certifications': 1},
+    'summary': {'header': 0.5, 'summary': 2, 'experience': 5, 'education': 2, 'skills': 3, 'projects': 2, 'certifications': 1},
+    'comparison': {'header': 0.5, 'summary': 1, 'experience': 4, 'education': 1, 'skills': 4, 'projects': 1, 'certifications': 0.5},
+}
+
+# Token budgets (see utils/token_budget.py)
+MODEL_CONTEXT_TOKENS = {  # Context window per provider; prompts are cut to fit
+    'gemini': 1_048_576,
+    'claude': 200_000,
+    'openai': 8_192,      # gpt-4; raise for gpt-4-turbo (128k)
+    'openrouter': 32_768,
+    'mock': 32_768,
+}
+MIN_OUTPUT_TOKENS = 256          # Smallest max_tokens ever requested
+OUTPUT_HISTORY_SIZE = 200        # Recent successful calls per task used to size max_tokens
+OUTPUT_HISTORY_MIN_SAMPLES = 20  # Below this, TASK_MAX_TOKENS (or MAX_TOKENS) is used
+OUTPUT_HEADROOM = 1.25           # max_tokens = 95th percentile of past outputs x headroom
+TASK_MAX_TOKENS = {  # Starting max_tokens per task until there is history
+    'chat': 1024,
+    'skill_extraction': 512,
+    'job_match': 1024,
+    'spam_detection': 512,
+    'moderation': 1024,
+    'candidate_summary': 1024,
+}
+
+# Prompt prefix caching (see utils/prompt_cache.py)
+# System prompts and stable prefixes (e.g. one job's requirements while screening
+# many candidates) are cached by the provider: Claude cache_control blocks, Gemini
+# cached contents, OpenAI/OpenRouter automatic prefix caching.
+PROMPT_CACHE_ENABLED = os.getenv('PROMPT_CACHE_ENABLED', 'True') == 'True'
+PROMPT_CACHE_MIN_TOKENS = {  # Providers reject or ignore shorter cached prefixes
+    'claude': 1024,
+    'gemini': 1024,
+}
+CLAUDE_CACHE_TTL = os.getenv('CLAUDE_CACHE_TTL', '5m')  # '5m' or '1h'
+GEMINI_CACHE_TTL_SECONDS = int(os.getenv('GEMINI_CACHE_TTL_SECONDS', 60 * 60))
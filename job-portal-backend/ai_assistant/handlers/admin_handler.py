@@ -5,12 +5,14 @@ import json
 from typing import Dict, List
 from django.db.models import Count, Avg, Q
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from accounts.models import User
 from jobs.models import Job, Application
 from ..models import AIAnalytics
+from ..utils.activity_monitor import suspicious_activity_detector
 from ..utils.ai_client import get_ai_client
+from ..utils.prompt_cache import prompt_cache_stats
 from ..utils.prompt_templates import get_analysis_prompt, get_system_prompt
 
 
@@ -33,50 +35,58 @@ class AdminHandler:
         """
         cutoff_date = timezone.now() - timedelta(days=days)
 
-        # User stats
-        total_users = User.objects.count()
-        new_users = User.objects.filter(date_joined__gte=cutoff_date).count()
-        candidates = User.objects.filter(role='candidate').count()
-        recruiters = User.objects.filter(role='recruiter').count()
-
-        # Job stats
-        total_jobs = Job.objects.count()
-        published_jobs = Job.objects.filter(status='published').count()
-        new_jobs = Job.objects.filter(created_at__gte=cutoff_date).count()
-
-        # Application stats
-        total_applications = Application.objects.count()
-        recent_applications = Application.objects.filter(applied_at__gte=cutoff_date).count()
-
-        # AI usage stats
-        ai_requests = AIAnalytics.objects.filter(created_at__gte=cutoff_date).count()
-        ai_success_rate = AIAnalytics.objects.filter(
-            created_at__gte=cutoff_date
-        ).aggregate(
-            success_rate=Avg('success')
-        )['success_rate']
+        # One conditional aggregate per model instead of a COUNT per statistic
+        user_stats = User.objects.aggregate(
+            total=Count('id'),
+            new=Count('id', filter=Q(date_joined__gte=cutoff_date)),
+            candidates=Count('id', filter=Q(role='candidate')),
+            recruiters=Count('id', filter=Q(role='recruiter'))
+        )
+
+        job_stats = Job.objects.aggregate(
+            total=Count('id'),
+            published=Count('id', filter=Q(status='published')),
+            new=Count('id', filter=Q(created_at__gte=cutoff_date))
+        )
+
+        application_stats = Application.objects.aggregate(
+            total=Count('id'),
+            recent=Count('id', filter=Q(applied_at__gte=cutoff_date))
+        )
+
+        recent_ai_calls = AIAnalytics.objects.filter(created_at__gte=cutoff_date)
+        ai_stats = recent_ai_calls.aggregate(
+            total=Count('id'),
+            successful=Count('id', filter=Q(success=True))
+        )
+
+        total_jobs = job_stats['total']
+        total_applications = application_stats['total']
+        ai_requests = ai_stats['total']
+        ai_success_rate = ai_stats['successful'] / ai_requests if ai_requests else None
 
         return {
             'period_days': days,
             'users': {
-                'total': total_users,
-                'new': new_users,
-                'candidates': candidates,
-                'recruiters': recruiters
+                'total': user_stats['total'],
+                'new': user_stats['new'],
+                'candidates': user_stats['candidates'],
+                'recruiters': user_stats['recruiters']
             },
             'jobs': {
                 'total': total_jobs,
-                'published': published_jobs,
-                'new': new_jobs
+                'published': job_stats['published'],
+                'new': job_stats['new']
             },
             'applications': {
                 'total': total_applications,
-                'recent': recent_applications,
+                'recent': application_stats['recent'],
                 'avg_per_job': round(total_applications / total_jobs, 2) if total_jobs > 0 else 0
             },
             'ai_usage': {
                 'total_requests': ai_requests,
-                'success_rate': round(ai_success_rate * 100, 2) if ai_success_rate else 0
+                'success_rate': round(ai_success_rate * 100, 2) if ai_success_rate else 0,
+                'prompt_cache': prompt_cache_stats(recent_ai_calls)
             }
         }
 
@@ -104,7 +114,9 @@ class AdminHandler:
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='spam_detection',
+            user=self.user
         )
 
         try:
@@ -140,59 +152,25 @@ Role: {user.role}
         except Exception:
             return ""
 
-    def get_suspicious_activities(self, threshold: int = 10) -> List[Dict]:
+    def get_suspicious_activities(self, threshold: int = None, since: datetime = None,
+                                  now: datetime = None) -> List[Dict]:
         """
         Identify suspicious user activities
 
         Args:
-            threshold: Number of actions to consider suspicious
+            threshold: Number of actions to consider suspicious, overriding
+                the per-activity thresholds in SUSPICIOUS_ACTIVITY_RULES
+            since: Only report users with new activity after this moment
+            now: End of the detection windows (defaults to now)
 
         Returns:
             List of suspicious activities
         """
-        cutoff_date = timezone.now() - timedelta(hours=24)
-
-        # Find users with too many applications in short time
-        suspicious_candidates = Application.objects.filter(
-            applied_at__gte=cutoff_date
-        ).values('candidate').annotate(
-            app_count=Count('id')
-        ).filter(
-            app_count__gte=threshold
-        )
-
-        # Find recruiters posting too many jobs
-        suspicious_recruiters = Job.objects.filter(
-            created_at__gte=cutoff_date
-        ).values('recruiter').annotate(
-            job_count=Count('id')
-        ).filter(
-            job_count__gte=threshold
-        )
+        detector = suspicious_activity_detector
+        if threshold is not None:
+            detector = detector.with_threshold(threshold)
 
-        suspicious_activities = []
-
-        for item in suspicious_candidates:
-            user = User.objects.get(id=item['candidate'])
-            suspicious_activities.append({
-                'type': 'excessive_applications',
-                'user_id': user.id,
-                'user_email': user.email,
-                'count': item['app_count'],
-                'severity': 'high' if item['app_count'] > threshold * 2 else 'medium'
-            })
-
-        for item in suspicious_recruiters:
-            user = User.objects.get(id=item['recruiter'])
-            suspicious_activities.append({
-                'type': 'excessive_job_postings',
-                'user_id': user.id,
-                'user_email': user.email,
-                'count': item['job_count'],
-                'severity': 'high' if item['job_count'] > threshold * 2 else 'medium'
-            })
-
-        return suspicious_activities
+        return detector.detect(since=since, now=now)
 
     def recommend_moderation_action(self, user_id: int, reason: str) -> Dict:
         """
@@ -256,7 +234,9 @@ Format as JSON.
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=get_system_prompt('admin')
+            system_prompt=get_system_prompt('admin'),
+            task='moderation',
+            user=self.user
         )
 
         try:
@@ -301,7 +281,9 @@ Focus on actionable insights.
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=get_system_prompt('admin')
+            system_prompt=get_system_prompt('admin'),
+            task='trend_analysis',
+            user=self.user
         )
 
         return response['content']
@@ -345,7 +327,9 @@ Focus on actionable insights.
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=get_system_prompt('admin')
+            system_prompt=get_system_prompt('admin'),
+            task='report',
+            user=self.user
         )
 
         return response['content']
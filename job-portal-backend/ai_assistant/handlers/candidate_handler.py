@@ -7,7 +7,12 @@ from django.db.models import Q
 
 from jobs.models import Job, Application
 from ..utils.ai_client import get_ai_client, get_gemini_client
-from ..utils.prompt_templates import get_analysis_prompt, get_system_prompt
+from ..utils.prompt_templates import get_analysis_prompt, get_system_prompt, prompt_version
+from ..utils.embeddings import embedding_store, text_embedder
+from ..utils.vector_index import job_vectors
+from ..utils.match_cascade import local_match_scorer, match_cache, job_version
+from ..utils.resume_compactor import resume_compactor
+from ..config import SEMANTIC_MATCH_THRESHOLD
 
 
 class CandidateHandler:
@@ -31,13 +36,15 @@ class CandidateHandler:
         system_prompt = get_analysis_prompt('resume_analysis')
 
         messages = [
-            {"role": "user", "content": resume_text}
+            {"role": "user", "content": resume_compactor.compact(resume_text, 'analysis')}
         ]
 
         # Use Gemini for ATS analysis — 1M token context handles any resume size
         response = self.gemini_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='resume_analysis',
+            user=self.user
         )
 
         # Check if response has content
@@ -169,7 +176,9 @@ class CandidateHandler:
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='skill_extraction',
+            user=self.user
         )
 
         try:
@@ -195,6 +204,11 @@ class CandidateHandler:
         """
         Suggest relevant jobs based on candidate skills
 
+        The jobs scored are the nearest ones to the skills (or to the
+        candidate's profile embedding when no skills are given), so the
+        skill overlap is computed for the most related jobs instead of
+        simply the first 50.
+
         Args:
             candidate_skills: List of candidate's skills
             limit: Maximum number of jobs to return
@@ -202,23 +216,35 @@ class CandidateHandler:
         Returns:
             List of job recommendations with match scores
         """
-        # Get published jobs
-        jobs = Job.objects.filter(status='published')
+        if candidate_skills:
+            query = text_embedder.embed(' '.join(candidate_skills))
+        else:
+            query = embedding_store.get_vectors('candidate', [self.user.id]).get(self.user.id)
+        nearest = dict(job_vectors.search(query, k=50)) if query is not None else {}
+
+        if nearest:
+            jobs_by_id = Job.objects.filter(status='published').in_bulk(list(nearest))
+            jobs = [jobs_by_id[job_id] for job_id in nearest if job_id in jobs_by_id]
+        else:
+            # No embeddings built yet
+            jobs = Job.objects.filter(status='published')[:50]
+
+        # Convert to lowercase for case-insensitive matching
+        candidate_skills_lower = [s.lower() for s in candidate_skills]
 
         recommendations = []
 
-        for job in jobs[:50]:  # Analyze top 50 jobs
+        for job in jobs:
             job_skills = [s.strip() for s in job.required_skills.split(',')]
-
-            # Convert to lowercase for case-insensitive matching
-            candidate_skills_lower = [s.lower() for s in candidate_skills]
             job_skills_lower = [s.lower() for s in job_skills]
 
             # Calculate simple match score (case-insensitive)
             matching_skills_lower = set(candidate_skills_lower) & set(job_skills_lower)
             match_score = len(matching_skills_lower) / len(job_skills_lower) if job_skills_lower else 0
+            semantic_score = nearest.get(job.id, 0)
 
-            if match_score > 0.3:  # At least 30% match
+            # At least 30% skill match, or clearly related by content
+            if match_score > 0.3 or semantic_score >= SEMANTIC_MATCH_THRESHOLD:
                 # Get the original case for display
                 matching_skills_display = [job_skills[job_skills_lower.index(s)] for s in matching_skills_lower]
                 missing_skills_display = [job_skills[i] for i, s in enumerate(job_skills_lower) if s not in candidate_skills_lower]
@@ -229,19 +255,49 @@ class CandidateHandler:
                     'company': job.company_name,
                     'location': job.location,
                     'match_score': round(match_score * 100, 2),
+                    'semantic_score': round(semantic_score * 100, 2),
                     'matching_skills': matching_skills_display,
                     'missing_skills': missing_skills_display
                 })
 
-        # Sort by match score
-        recommendations.sort(key=lambda x: x['match_score'], reverse=True)
+        # Sort by match score, related content breaking ties
+        recommendations.sort(key=lambda x: (x['match_score'], x['semantic_score']), reverse=True)
 
         return recommendations[:limit]
 
+    def recommend_jobs(self, limit: int = 10) -> List[Dict]:
+        """
+        Jobs closest to the candidate's profile, from the local vector index
+
+        No LLM call is made, so this answers in milliseconds.
+
+        Returns:
+            List of jobs with a similarity score, best first
+        """
+        query = embedding_store.get_vectors('candidate', [self.user.id]).get(self.user.id)
+        if query is None:
+            return []
+
+        nearest = job_vectors.search(query, k=limit, min_score=SEMANTIC_MATCH_THRESHOLD / 2)
+        jobs = Job.objects.filter(status='published').in_bulk([job_id for job_id, _ in nearest])
+        return [
+            {
+                'job_id': job_id,
+                'title': jobs[job_id].title,
+                'company': jobs[job_id].company_name,
+                'location': jobs[job_id].location,
+                'similarity': round(score * 100, 2),
+            }
+            for job_id, score in nearest if job_id in jobs
+        ]
+
     def analyze_job_match(self, resume_text: str, job_id: int) -> Dict:
         """
         Analyze how well a candidate matches a specific job
 
+        Pairs the local scorer finds unrelated are answered without the LLM,
+        and answers are cached per (resume, job version).
+
         Args:
             resume_text: Candidate's resume
             job_id: Job ID to match against
@@ -254,6 +310,28 @@ class CandidateHandler:
         except Job.DoesNotExist:
             return {'error': 'Job not found'}
 
+        # Same resume against the same version of the job: reuse the earlier answer
+        version = f"{job_version(job)}:{prompt_version('job_match')}"  # A reworded prompt invalidates old results
+        cached = match_cache.get('job_match', resume_text, version)
+        if cached is not None:
+            return cached
+
+        # Stage one: local score; clearly unrelated pairs never reach the LLM
+        local = local_match_scorer.score(job, resume_text)
+        if not local_match_scorer.worth_llm(local):
+            match_data = {
+                'match_score': round(local['combined_score'] * 100),
+                'matching_skills': local['matching_skills'],
+                'missing_skills': local['missing_skills'],
+                'recommendations': [
+                    f"This role asks for {', '.join(local['missing_skills'][:5]) or 'a different profile'}; "
+                    f"build experience there before applying."
+                ],
+                'screened_by': 'local',
+            }
+            match_cache.set('job_match', resume_text, version, match_data)
+            return match_data
+
         context = {
             'job_title': job.title,
             'required_skills': job.required_skills,
@@ -264,12 +342,14 @@ class CandidateHandler:
         system_prompt = get_analysis_prompt('job_match', context)
 
         messages = [
-            {"role": "user", "content": f"Resume:\n{resume_text}"}
+            {"role": "user", "content": f"Resume:\n{resume_compactor.compact(resume_text, 'job_match')}"}
         ]
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='job_match',
+            user=self.user
         )
 
         # Clean up markdown code blocks if present
@@ -296,6 +376,9 @@ class CandidateHandler:
                 'raw_response': content
             }
 
+        if response.get('success', False):
+            match_cache.set('job_match', resume_text, version, match_data)
+
         return match_data
 
     def get_resume_feedback(self, resume_text: str) -> Dict:
@@ -316,7 +399,9 @@ class CandidateHandler:
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='resume_improvement',
+            user=self.user
         )
 
         return {
@@ -370,7 +455,9 @@ Return ONLY the JSON array, no other text."""
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=get_system_prompt('candidate')
+            system_prompt=get_system_prompt('candidate'),
+            task='skill_recommendations',
+            user=self.user
         )
 
         # Check for AI client errors
@@ -2,12 +2,37 @@
 AI Handler for Recruiter-specific features
 """
 import json
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, List
-from django.db.models import Q, Count
+from django.db import connection
+from django.db.models import Q, Count, Avg
 
+from accounts.models import CandidateProfile
 from jobs.models import Job, Application
 from ..utils.ai_client import get_ai_client, get_gemini_client
-from ..utils.prompt_templates import get_analysis_prompt, get_system_prompt
+from ..utils.prompt_templates import get_analysis_prompt, get_system_prompt, prompt_version
+from ..utils.embeddings import embedding_store, text_embedder, job_text
+from ..utils.vector_index import candidate_vectors
+from ..utils.match_cascade import local_match_scorer, match_cache
+from ..utils.resume_compactor import resume_compactor
+from ..config import SEMANTIC_MATCH_THRESHOLD, LLM_RERANK_TOP_N, LLM_SCREENING_WORKERS, LLM_SCREENING_TIMEOUT
+
+
+def _status_counts(prefix: str = '') -> Dict:
+    """Conditional COUNT aggregates, one per application status"""
+    return {
+        f'status_{code}': Count(f'{prefix}id', filter=Q(**{f'{prefix}status': code}))
+        for code, _ in Application.STATUS_CHOICES
+    }
+
+
+def _status_breakdown(row: Dict) -> List[Dict]:
+    """Turn the conditional counts back into the [{status, count}] shape"""
+    return [
+        {'status': code, 'count': row[f'status_{code}']}
+        for code, _ in Application.STATUS_CHOICES
+        if row[f'status_{code}']
+    ]
 
 
 class RecruiterHandler:
@@ -51,7 +76,9 @@ Additional context: {job_data.get('additional_context', 'N/A')}
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='job_description',
+            user=self.user
         )
 
         # Check if AI response was successful
@@ -102,7 +129,9 @@ Format the response as a numbered list."""
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='interview_questions',
+            user=self.user
         )
 
         # Check if AI response was successful
@@ -131,65 +160,31 @@ Format the response as a numbered list."""
         Returns:
             Dict with screening analysis
         """
+        # The requirements text stands in for the job version here
+        version = f"{job_requirements}:{prompt_version('candidate_screening')}"  # A reworded prompt invalidates old results
+        cached = match_cache.get('screen', resume_text, version)
+        if cached is not None:
+            return cached
+
         system_prompt = """You are an expert recruiter analyzing candidate resumes.
 Evaluate the candidate's qualifications against the job requirements.
 Provide a comprehensive, well-structured analysis."""
 
-        prompt = f"""Analyze this candidate for the following position:
-
-**JOB REQUIREMENTS:**
-{job_requirements}
-
-**CANDIDATE RESUME:**
-{resume_text}
-
-Provide a detailed screening analysis with these sections:
-
-**Overall Match Assessment (Score: X/100)**
-Brief overview of how well the candidate matches the requirements
-
-**Key Strengths**
-- Strength 1
-- Strength 2
-- Strength 3
-(List 3-5 major strengths with specific examples)
-
-**Relevant Experience & Achievements**
-Detailed assessment of their experience level, key projects, and accomplishments
-
-**Skills Analysis**
-
-✅ Required Skills Met:
-- Skill 1
-- Skill 2
-- Skill 3
-
-⚠️ Skills Gaps:
-- Missing skill 1
-- Skill to develop 2
-
-**Areas of Concern**
-- Concern 1 (if any)
-- Concern 2 (if any)
-
-**Cultural Fit & Soft Skills**
-Assessment of teamwork, leadership, communication abilities
-
-**Recommendation:** [Strong Yes / Yes / Maybe / No]
-
-**Next Steps:**
-Clear recommendation on how to proceed with this candidate
-
-Use clear headers, bullet points, and emojis for visual appeal. Be thorough and specific."""
+        # Everything but the resume is the same for every candidate of this job,
+        # so it goes first and is cached by the provider between candidates
+        job_prefix = get_analysis_prompt('candidate_screening', {'job_requirements': job_requirements})
 
         messages = [
-            {"role": "user", "content": prompt}
+            {"role": "user", "content": f"**CANDIDATE RESUME:**\n{resume_compactor.compact(resume_text, 'screening')}"}
         ]
 
         # Use Gemini for candidate screening — handles large resumes with 1M token context
         response = self.gemini_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='candidate_screening',
+            user=self.user,
+            cacheable_prefix=job_prefix
         )
 
         # Check if AI response was successful
@@ -200,10 +195,91 @@ Use clear headers, bullet points, and emojis for visual appeal. Be thorough and
         if not response.get('content'):
             raise Exception("AI returned empty response")
 
-        return {
+        result = {
             'job_requirements': job_requirements,
             'analysis': response['content']
         }
+        match_cache.set('screen', resume_text, version, result)
+        return result
+
+    def _screen_in_thread(self, job_requirements: str, resume_text: str) -> Dict:
+        """screen_candidate on a pool thread, which must close its own database connection"""
+        try:
+            return self.screen_candidate(job_requirements, resume_text)
+        finally:
+            connection.close()
+
+    def screen_applications(self, job_id: int, top_n: int = LLM_RERANK_TOP_N) -> List[Dict]:
+        """
+        Screen every application of a job, spending LLM calls only on the best
+
+        All applications are ranked locally (skills found, embedding
+        similarity, BM25 over the job's skill terms). Only the top_n get the
+        full LLM screening, which is cached per (resume, job version). Up to
+        LLM_SCREENING_WORKERS screenings run at once; those not done within
+        LLM_SCREENING_TIMEOUT are returned as llm_pending and land in the
+        cache when they finish, for the next request.
+
+        Args:
+            job_id: Job ID
+            top_n: Applications sent to the LLM
+
+        Returns:
+            List of applications, best local score first
+        """
+        try:
+            job = Job.objects.get(id=job_id, recruiter=self.user)
+        except Job.DoesNotExist:
+            return []
+
+        applications = list(Application.objects.filter(job=job).select_related('candidate'))
+        ranked = local_match_scorer.rank_pool(job, [(application, application.resume_text) for application in applications])
+        job_requirements = (
+            f"{job.title}\nRequired skills: {job.required_skills}\n"
+            f"Required experience: {job.required_experience or 'Not specified'} years\n{job.requirements}"
+        )
+
+        results = []
+        for application, local in ranked:
+            results.append({
+                'application_id': application.id,
+                'candidate_email': application.candidate.email,
+                'candidate_name': f"{application.candidate.first_name} {application.candidate.last_name}",
+                'status': application.status,
+                'local_score': round(local['combined_score'] * 100, 2),
+                'skill_score': round(local['skill_score'] * 100, 2),
+                'semantic_score': round(local['semantic_score'] * 100, 2),
+                'matching_skills': local['matching_skills'],
+                'missing_skills': local['missing_skills'],
+                'llm_screened': False,
+            })
+
+        shortlist = ranked[:top_n]
+        if not shortlist:
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=min(LLM_SCREENING_WORKERS, len(shortlist)))
+        try:
+            futures = [
+                executor.submit(self._screen_in_thread, job_requirements, application.resume_text)
+                for application, _ in shortlist
+            ]
+            done, _ = wait(futures, timeout=LLM_SCREENING_TIMEOUT)
+        finally:
+            # Calls already running finish in the background; queued ones are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for entry, future in zip(results, futures):
+            if future not in done:
+                entry['llm_pending'] = True
+                continue
+            try:
+                entry['analysis'] = future.result()['analysis']
+                entry['llm_screened'] = True
+            except Exception as e:
+                entry['llm_error'] = str(e)
+
+        return results
 
     def rank_candidates(self, job_id: int) -> List[Dict]:
         """
@@ -220,13 +296,21 @@ Use clear headers, bullet points, and emojis for visual appeal. Be thorough and
         except Job.DoesNotExist:
             return []
 
-        applications = Application.objects.filter(job=job).select_related('candidate')
+        applications = list(Application.objects.filter(job=job).select_related('candidate'))
 
         job_skills = set([s.strip().lower() for s in job.required_skills.split(',')])
 
+        # Content similarity of each application's resume to the job (local embeddings, no LLM)
+        job_vector = embedding_store.get_vectors('job', [job.id]).get(job.id)
+        if job_vector is None:
+            job_vector = text_embedder.embed(job_text(job))
+        semantic_scores = candidate_vectors.similarity(
+            job_vector, [text_embedder.embed(application.resume_text) for application in applications]
+        )
+
         ranked_candidates = []
 
-        for application in applications:
+        for application, semantic_score in zip(applications, semantic_scores):
             # Extract skills from resume (simplified)
             resume_words = set(application.resume_text.lower().split())
 
@@ -244,15 +328,51 @@ Use clear headers, bullet points, and emojis for visual appeal. Be thorough and
                 'candidate_email': application.candidate.email,
                 'candidate_name': f"{application.candidate.first_name} {application.candidate.last_name}",
                 'match_score': round(match_score, 2),
+                'semantic_score': round(float(semantic_score) * 100, 2),
                 'status': application.status,
                 'applied_at': application.applied_at.isoformat()
             })
 
-        # Sort by match score
-        ranked_candidates.sort(key=lambda x: x['match_score'], reverse=True)
+        # Sort by match score, related content breaking ties
+        ranked_candidates.sort(key=lambda x: (x['match_score'], x['semantic_score']), reverse=True)
 
         return ranked_candidates
 
+    def recommend_candidates(self, job_id: int, limit: int = 10) -> List[Dict]:
+        """
+        Candidate profiles closest to one of the recruiter's jobs, from the local vector index
+
+        Returns:
+            List of candidates with a similarity score, best first
+        """
+        try:
+            job = Job.objects.get(id=job_id, recruiter=self.user)
+        except Job.DoesNotExist:
+            return []
+
+        job_vector = embedding_store.get_vectors('job', [job.id]).get(job.id)
+        if job_vector is None:
+            job_vector = text_embedder.embed(job_text(job))
+
+        applied = Application.objects.filter(job=job).values_list('candidate_id', flat=True)
+        nearest = candidate_vectors.search(job_vector, k=limit, min_score=SEMANTIC_MATCH_THRESHOLD / 2)
+        profiles = CandidateProfile.objects.select_related('user').in_bulk(
+            [user_id for user_id, _ in nearest], field_name='user_id'
+        )
+        applied = set(applied)
+        return [
+            {
+                'candidate_id': user_id,
+                'candidate_email': profiles[user_id].user.email,
+                'candidate_name': profiles[user_id].user.get_full_name(),
+                'location': profiles[user_id].location,
+                'skills': profiles[user_id].skills,
+                'similarity': round(score * 100, 2),
+                'has_applied': user_id in applied,
+            }
+            for user_id, score in nearest if user_id in profiles
+        ]
+
     def summarize_resume(self, application_id: int) -> Dict:
         """
         Generate a concise summary of a candidate's resume
@@ -274,12 +394,14 @@ Use clear headers, bullet points, and emojis for visual appeal. Be thorough and
         system_prompt = get_analysis_prompt('candidate_summary')
 
         messages = [
-            {"role": "user", "content": application.resume_text}
+            {"role": "user", "content": resume_compactor.compact(application.resume_text, 'summary')}
         ]
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task='candidate_summary',
+            user=self.user
         )
 
         summary = response['content']
@@ -296,53 +418,89 @@ Use clear headers, bullet points, and emojis for visual appeal. Be thorough and
             'job_title': application.job.title
         }
 
-    def get_hiring_insights(self, job_id: int = None) -> Dict:
+    def get_hiring_insights(self, job_id: int = None, per_job: bool = False) -> Dict:
         """
         Get hiring insights and statistics
 
         Args:
             job_id: Optional specific job ID, or all jobs if None
+            per_job: Include a breakdown for every job in the overall insights
 
         Returns:
             Dict with insights
         """
-        jobs_query = Job.objects.filter(recruiter=self.user)
-
-        if job_id:
-            jobs_query = jobs_query.filter(id=job_id)
-
-        total_jobs = jobs_query.count()
-        total_applications = Application.objects.filter(job__recruiter=self.user).count()
-
         if job_id:
-            job = jobs_query.first()
+            job = Job.objects.filter(recruiter=self.user, id=job_id).only('id', 'title').first()
             if not job:
                 return {'error': 'Job not found'}
 
-            applications = Application.objects.filter(job=job)
-
-            status_breakdown = applications.values('status').annotate(count=Count('status'))
+            stats = Application.objects.filter(job=job).aggregate(
+                total=Count('id'),
+                average_match_score=Avg('skill_match_score'),
+                **_status_counts()
+            )
 
             return {
                 'job_title': job.title,
-                'total_applications': applications.count(),
-                'status_breakdown': list(status_breakdown),
-                'average_match_score': applications.filter(
-                    skill_match_score__isnull=False
-                ).aggregate(
-                    avg_score=models.Avg('skill_match_score')
-                )['avg_score']
+                'total_applications': stats['total'],
+                'status_breakdown': _status_breakdown(stats),
+                'average_match_score': stats['average_match_score']
             }
 
-        # Overall insights
-        return {
+        # Overall insights: the applications join repeats each job row, so jobs
+        # are counted distinctly to keep everything in a single query
+        stats = Job.objects.filter(recruiter=self.user).aggregate(
+            total_jobs=Count('id', distinct=True),
+            active_jobs=Count('id', filter=Q(status='published'), distinct=True),
+            closed_jobs=Count('id', filter=Q(status='closed'), distinct=True),
+            total_applications=Count('applications')
+        )
+        total_jobs = stats['total_jobs']
+        total_applications = stats['total_applications']
+
+        insights = {
             'total_jobs_posted': total_jobs,
             'total_applications_received': total_applications,
             'average_applications_per_job': round(total_applications / total_jobs, 2) if total_jobs > 0 else 0,
-            'active_jobs': jobs_query.filter(status='published').count(),
-            'closed_jobs': jobs_query.filter(status='closed').count()
+            'active_jobs': stats['active_jobs'],
+            'closed_jobs': stats['closed_jobs']
         }
 
+        if per_job:
+            insights['jobs'] = self.get_job_breakdowns()
+
+        return insights
+
+    def get_job_breakdowns(self) -> List[Dict]:
+        """
+        Get application breakdowns for all of the recruiter's jobs
+
+        Runs a single grouped query over the recruiter's jobs, so the cost does
+        not grow with the number of jobs.
+
+        Returns:
+            List of per-job statistics, newest job first
+        """
+        rows = Job.objects.filter(recruiter=self.user).values(
+            'id', 'title', 'status'
+        ).annotate(
+            total=Count('applications'),
+            average_match_score=Avg('applications__skill_match_score'),
+            **_status_counts(prefix='applications__')
+        ).order_by('-created_at')
+
+        return [
+            {
+                'job_id': row['id'],
+                'job_title': row['title'],
+                'job_status': row['status'],
+                'total_applications': row['total'],
+                'status_breakdown': _status_breakdown(row),
+                'average_match_score': row['average_match_score']
+            }
+            for row in rows
+        ]
+
     def suggest_improvements(self, job_id: int) -> str:
         """
         Suggest improvements for a job posting
@@ -386,7 +544,9 @@ Provide specific suggestions to:
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=get_system_prompt('recruiter')
+            system_prompt=get_system_prompt('recruiter'),
+            task='job_improvement',
+            user=self.user
         )
 
         return response['content']
@@ -415,7 +575,8 @@ Provide specific suggestions to:
 Candidate {app.id}:
 Email: {app.candidate.email}
 Match Score: {app.skill_match_score or 'Not calculated'}
-Resume: {app.resume_text[:500]}...
+Resume:
+{resume_compactor.compact(app.resume_text, 'comparison')}
 """)
 
         prompt = f"""Compare these candidates and provide:
@@ -433,7 +594,9 @@ Resume: {app.resume_text[:500]}...
 
         response = self.ai_client.generate_response(
             messages=messages,
-            system_prompt=get_system_prompt('recruiter')
+            system_prompt=get_system_prompt('recruiter'),
+            task='candidate_comparison',
+            user=self.user
         )
 
         return response['content']
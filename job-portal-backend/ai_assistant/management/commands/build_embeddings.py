@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from accounts.models import CandidateProfile
+from jobs.models import Job
+from ai_assistant.utils.embeddings import embedding_store
+
+
+class Command(BaseCommand):
+    help = 'Compute semantic matching vectors for existing jobs and candidate profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=['job', 'candidate'], help='Only this kind (default: both)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows read per query')
+
+    def handle(self, *args, **options):
+        kinds = [options['kind']] if options['kind'] else ['job', 'candidate']
+        batch_size = options['batch_size']
+
+        for kind in kinds:
+            if kind == 'job':
+                queryset, embed = Job.objects.order_by('pk'), embedding_store.embed_job
+            else:
+                queryset, embed = CandidateProfile.objects.order_by('pk'), embedding_store.embed_candidate
+
+            updated, total, after = 0, 0, 0
+            while True:
+                rows = list(queryset.filter(pk__gt=after)[:batch_size])
+                if not rows:
+                    break
+                # Unchanged text is skipped, so reruns are cheap
+                updated += sum(1 for row in rows if embed(row))
+                total += len(rows)
+                after = rows[-1].pk
+
+            self.stdout.write(f"{kind}: {updated} of {total} vectors updated")
+
+        self.stdout.write(self.style.SUCCESS('Done'))
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="aianalytics",
+            index=models.Index(
+                fields=["created_at", "user"], name="ai_assistan_created_5d5314_idx"
+            ),
+        ),
+    ]
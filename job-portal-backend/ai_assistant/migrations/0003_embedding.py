@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0002_activity_window_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Embedding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("job", "Job"), ("candidate", "Candidate")],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.PositiveIntegerField(
+                        help_text="Job id or candidate user id"
+                    ),
+                ),
+                ("vector", models.BinaryField()),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="SHA-256 of the embedded text", max_length=64
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "unique_together": {("kind", "object_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0003_embedding"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aianalytics",
+            name="estimated_input_tokens",
+            field=models.IntegerField(
+                default=0, help_text="Input tokens estimated before sending"
+            ),
+        ),
+        migrations.AddField(
+            model_name="aianalytics",
+            name="max_tokens",
+            field=models.IntegerField(
+                default=0, help_text="Output token budget requested"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0004_aianalytics_token_estimates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aianalytics",
+            name="cached_input_tokens",
+            field=models.IntegerField(
+                default=0,
+                help_text="Input tokens read from the provider's prompt cache",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_assistant", "0005_aianalytics_cached_input_tokens"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aianalytics",
+            name="prompt_version",
+            field=models.CharField(
+                blank=True,
+                help_text="Prompt template used (e.g. job_match@v1)",
+                max_length=50,
+            ),
+        ),
+    ]
@@ -65,6 +65,10 @@ class AIAnalytics(models.Model):
     )
     input_tokens = models.IntegerField(default=0)
     output_tokens = models.IntegerField(default=0)
+    estimated_input_tokens = models.IntegerField(default=0, help_text="Input tokens estimated before sending")
+    max_tokens = models.IntegerField(default=0, help_text="Output token budget requested")
+    cached_input_tokens = models.IntegerField(default=0, help_text="Input tokens read from the provider's prompt cache")
+    prompt_version = models.CharField(max_length=50, blank=True, help_text="Prompt template used (e.g. job_match@v1)")
     response_time_ms = models.IntegerField(help_text="Response time in milliseconds")
     success = models.BooleanField(default=True)
     error_message = models.TextField(blank=True)
@@ -75,7 +79,29 @@ class AIAnalytics(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['action_type', '-created_at']),
+            models.Index(fields=['created_at', 'user']),  # Activity windows
         ]
 
     def __str__(self):
         return f"{self.user.email} - {self.action_type} - {self.created_at}"
+
+
+class Embedding(models.Model):
+    """Local text embedding of a job or a candidate profile (float16 bytes)"""
+
+    KIND_CHOICES = [
+        ('job', 'Job'),
+        ('candidate', 'Candidate'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField(help_text="Job id or candidate user id")
+    vector = models.BinaryField()
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 of the embedded text")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['kind', 'object_id']  # One vector per job / candidate
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} embedding"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Conversation, Message, AIAnalytics
+from .config import LLM_RERANK_TOP_N
 
 
 class MessageSerializer(serializers.ModelSerializer):
@@ -110,6 +111,18 @@ class CandidateRankingRequestSerializer(serializers.Serializer):
     job_id = serializers.IntegerField(required=True)
 
 
+class ApplicationScreeningRequestSerializer(serializers.Serializer):
+    """Serializer for two-stage screening of a job's applications"""
+    job_id = serializers.IntegerField(required=True)
+    top_n = serializers.IntegerField(required=False, default=LLM_RERANK_TOP_N, min_value=0, max_value=20)
+
+
+class CandidateRecommendationRequestSerializer(serializers.Serializer):
+    """Serializer for semantic candidate recommendation requests"""
+    job_id = serializers.IntegerField(required=True)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=100)
+
+
 class ResumeSummaryRequestSerializer(serializers.Serializer):
     """Serializer for resume summary requests"""
     application_id = serializers.IntegerField(required=True)
@@ -141,7 +154,8 @@ class AIAnalyticsSerializer(serializers.ModelSerializer):
         model = AIAnalytics
         fields = [
             'id', 'user', 'user_email', 'action_type',
-            'input_tokens', 'output_tokens', 'response_time_ms',
+            'input_tokens', 'output_tokens', 'estimated_input_tokens', 'max_tokens',
+            'cached_input_tokens', 'prompt_version', 'response_time_ms',
             'success', 'error_message', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
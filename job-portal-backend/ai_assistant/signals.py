@@ -0,0 +1,77 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from accounts.models import CandidateProfile, OTPVerification
+from jobs.models import Application, Job
+from .config import ENABLE_REALTIME_ABUSE_DETECTION
+from .models import AIAnalytics
+from .utils.activity_monitor import activity_stream
+from .utils.embeddings import embedding_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _record_activity(activity, user_id):
+    """Feed one event to the real-time detector without ever failing the save"""
+    if not ENABLE_REALTIME_ABUSE_DETECTION:
+        return
+    try:
+        activity_stream.record(activity, user_id)
+    except Exception as e:
+        logger.error(f"Error recording {activity} activity for user {user_id}: {str(e)}")
+
+
+@receiver(post_save, sender=Application)
+def track_application_activity(sender, instance, created, **kwargs):
+    """Count applications per candidate"""
+    if created:
+        _record_activity('applications', instance.candidate_id)
+
+
+@receiver(post_save, sender=Job)
+def track_job_post_activity(sender, instance, created, **kwargs):
+    """Count job postings per recruiter"""
+    if created:
+        _record_activity('job_posts', instance.recruiter_id)
+
+
+@receiver(post_save, sender=OTPVerification)
+def track_otp_activity(sender, instance, created, **kwargs):
+    """Count OTP requests per user"""
+    if created:
+        _record_activity('otp_requests', instance.user_id)
+
+
+@receiver(post_save, sender=AIAnalytics)
+def track_ai_call_activity(sender, instance, created, **kwargs):
+    """Count AI calls per user"""
+    if created:
+        _record_activity('ai_calls', instance.user_id)
+
+
+@receiver(post_save, sender=Job)
+def embed_job(sender, instance, **kwargs):
+    """Keep the job's semantic matching vector in step with its text"""
+    try:
+        embedding_store.embed_job(instance)
+    except Exception as e:
+        logger.error(f"Error embedding job {instance.id}: {str(e)}")
+
+
+@receiver(post_save, sender=CandidateProfile)
+def embed_candidate(sender, instance, **kwargs):
+    """Keep the candidate's semantic matching vector in step with their resume"""
+    try:
+        embedding_store.embed_candidate(instance)
+    except Exception as e:
+        logger.error(f"Error embedding candidate {instance.user_id}: {str(e)}")
+
+
+@receiver(post_delete, sender=Job)
+def delete_job_embedding(sender, instance, **kwargs):
+    embedding_store.delete('job', instance.id)
+
+
+@receiver(post_delete, sender=CandidateProfile)
+def delete_candidate_embedding(sender, instance, **kwargs):
+    embedding_store.delete('candidate', instance.user_id)
@@ -0,0 +1,461 @@
+import sys
+import threading
+from types import SimpleNamespace
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from jobs.models import Application, Job
+from notifications.models import Notification
+from .handlers.candidate_handler import CandidateHandler
+from .handlers.recruiter_handler import RecruiterHandler
+from .config import (
+    RESUME_TOKEN_BUDGETS, CHARS_PER_TOKEN, MAX_AI_CALLS_PER_HOUR, MAX_REQUESTS_PER_MINUTE,
+    MODEL_CONTEXT_TOKENS, TASK_MAX_TOKENS, CLAUDE_CACHE_TTL,
+)
+from .models import AIAnalytics, Embedding
+from .utils.activity_monitor import ActivityStream, SuspiciousActivityDetector
+from .utils.ai_client import AIClient
+from .utils.embeddings import embedding_store, text_embedder
+from .utils.match_cascade import local_match_scorer
+from .utils.prompt_cache import GeminiContextCache
+from .utils.prompt_templates import (
+    DEFAULT_ANALYSIS_PROMPT, PROMPT_TEMPLATES, PromptTemplate, get_analysis_prompt, prompt_version,
+)
+from .utils.resume_compactor import resume_compactor
+from .utils.token_budget import TRUNCATION_MARKER, token_budget
+from .utils.vector_index import VectorIndex
+
+
+def long_resume(headings=True):
+    bullets = '\n'.join(
+        f'- Built service {i} in Python and Django serving {i * 1000} requests per second' for i in range(80)
+    )
+    if not headings:
+        return f'Jane Doe | jane@example.com\nBackend engineer.\n{bullets}\nPython, Django, PostgreSQL'
+    return f"""Jane Doe | jane@example.com
+Curriculum Vitae
+
+Professional Summary
+Backend engineer with 6 years of experience.
+
+Work Experience
+Senior Engineer, Acme (2019 - Present)
+{bullets}
+Page 1 of 2
+
+Education
+B.Tech Computer Science, 2017
+
+Technical Skills
+Python, Django, PostgreSQL, Redis
+
+References available upon request
+"""
+
+
+class ResumeCompactorTests(SimpleTestCase):
+
+    def test_segments_sections_and_drops_boilerplate(self):
+        sections = dict(resume_compactor.segment(long_resume()))
+        self.assertEqual(set(sections), {'header', 'summary', 'experience', 'education', 'skills'})
+        text = resume_compactor.compact(long_resume(), 'analysis')
+        self.assertNotIn('Curriculum Vitae', text)
+        self.assertNotIn('Page 1 of 2', text)
+        self.assertNotIn('References available', text)
+
+    def test_short_resume_is_not_cut(self):
+        text = resume_compactor.compact('Jane\nSkills: python\n\n\n  Experience  \n* Did things', 'screening')
+        self.assertEqual(text, 'Jane\n\nSKILLS:\npython\n\nEXPERIENCE:\n- Did things')
+
+    def test_every_task_stays_within_its_budget(self):
+        for task, tokens in RESUME_TOKEN_BUDGETS.items():
+            with self.subTest(task=task):
+                text = resume_compactor.compact(long_resume() * 3, task)
+                self.assertLessEqual(len(text), tokens * CHARS_PER_TOKEN)
+
+    def test_cut_resume_keeps_every_section(self):
+        text = resume_compactor.compact(long_resume(), 'comparison')
+        for heading in ('SUMMARY:', 'EXPERIENCE:', 'EDUCATION:', 'SKILLS:'):
+            self.assertIn(heading, text)
+        self.assertIn('Python, Django, PostgreSQL, Redis', text)
+
+    def test_headingless_resume_is_not_emptied(self):
+        resume = long_resume(headings=False)
+        self.assertGreater(len(resume), RESUME_TOKEN_BUDGETS['comparison'] * CHARS_PER_TOKEN)
+        for task in RESUME_TOKEN_BUDGETS:
+            with self.subTest(task=task):
+                text = resume_compactor.compact(resume, task)
+                self.assertTrue(text.startswith('Jane Doe'))
+                self.assertLessEqual(len(text), RESUME_TOKEN_BUDGETS[task] * CHARS_PER_TOKEN)
+
+    def test_allocate_splits_evenly_without_weights(self):
+        allocation = resume_compactor._allocate({'header': 1000, 'other': 1000}, {'summary': 1}, 600)
+        self.assertEqual(allocation, {'header': 300, 'other': 300})
+
+
+class VectorIndexVersionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_index_is_rebuilt_after_writes_from_another_process(self):
+        index = VectorIndex('candidate')
+        state = index.state()
+        self.assertEqual(len(state['ids']), 0)
+        self.assertIs(index.state(), state)
+
+        # Written directly, as another process would: this process's cache is never bumped
+        Embedding.objects.create(
+            kind='candidate', object_id=7, content_hash='-',
+            vector=text_embedder.to_bytes(text_embedder.embed('python django developer'))
+        )
+        self.assertEqual(list(index.state()['ids']), [7])
+
+        Embedding.objects.filter(kind='candidate', object_id=7).delete()
+        self.assertEqual(len(index.state()['ids']), 0)
+
+    def test_unchanged_text_keeps_the_version(self):
+        self.assertTrue(embedding_store.update('candidate', 7, 'python django developer'))
+        version = embedding_store.get_version('candidate')
+        self.assertFalse(embedding_store.update('candidate', 7, 'python django developer'))
+        self.assertEqual(embedding_store.get_version('candidate'), version)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ActivityStreamTests(TestCase):
+    window_start = 600 * 1000  # Start of a 10-minute window, as a UNIX timestamp
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin@example.com', 'pw', role='admin')
+        cls.user = User.objects.create_user('cand@example.com', 'pw', role='candidate')
+
+    def setUp(self):
+        cache.clear()
+
+    def stream(self, threshold):
+        return ActivityStream({'applications': {'window_minutes': 10, 'threshold': threshold}})
+
+    def test_previous_window_is_weighted_by_its_overlap(self):
+        stream = self.stream(threshold=100)
+        counts = [stream.record('applications', self.user.id, now=self.window_start + 10) for _ in range(4)]
+        self.assertEqual(counts, [1, 2, 3, 4])
+
+        # A quarter into the next window, three quarters of the previous one still count
+        self.assertEqual(stream.record('applications', self.user.id, now=self.window_start + 750), 4)
+        # Two windows on, only the window just before is weighted (0.9 of one event)
+        self.assertEqual(stream.record('applications', self.user.id, now=self.window_start + 1260), 2)
+        self.assertIsNone(stream.record('job_posts', self.user.id, now=self.window_start))
+
+    def test_admins_are_alerted_once_when_the_threshold_is_crossed(self):
+        stream = self.stream(threshold=3)
+        for second in range(6):
+            stream.record('applications', self.user.id, now=self.window_start + second)
+
+        alerts = Notification.objects.filter(notification_type='system')
+        self.assertEqual([alert.recipient_id for alert in alerts], [self.admin.id])
+        self.assertIn('cand@example.com', alerts[0].message)
+        self.assertIsNone(alerts[0].email_sent_at)
+
+
+class AICallActivityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+
+    def calls(self, count):
+        AIAnalytics.objects.bulk_create([
+            AIAnalytics(user=self.user, action_type='screening', response_time_ms=100, success=True)
+            for _ in range(count)
+        ])
+
+    def flagged(self):
+        return [item for item in SuspiciousActivityDetector().detect() if item['activity'] == 'ai_calls']
+
+    def test_an_hour_of_batch_screening_is_not_flagged(self):
+        self.calls(MAX_REQUESTS_PER_MINUTE * 2)
+        self.assertEqual(self.flagged(), [])
+
+    def test_hourly_threshold_flags_the_user(self):
+        self.calls(MAX_AI_CALLS_PER_HOUR)
+        flagged = self.flagged()
+        self.assertEqual([item['user_id'] for item in flagged], [self.user.id])
+        self.assertEqual(flagged[0]['threshold'], MAX_AI_CALLS_PER_HOUR)
+
+
+class SuspiciousActivitiesViewTests(TestCase):
+
+    def test_impossible_since_is_a_400(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('admin@example.com', 'pw', role='admin'))
+        response = client.get('/api/ai/admin/suspicious_activities/', {'since': '2026-02-30T10:00'})
+        self.assertEqual(response.status_code, 400)
+
+
+PYTHON_RESUME = 'Senior Python engineer. Django REST framework, PostgreSQL and SQL tuning, Celery workers.'
+DESIGN_RESUME = 'Graphic designer. Photoshop, Illustrator, brand identity and print layouts.'
+
+
+def screening_pool(target):
+    """A recruiter's job with three applications, best local match second"""
+    target.recruiter = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+    target.job = Job.objects.create(
+        recruiter=target.recruiter, title='Python Developer', company_name='Acme',
+        description='Build Django APIs', requirements='Python and SQL', responsibilities='Ship features',
+        job_type='full_time', location='Delhi', required_skills='python, django, sql', status='published'
+    )
+    resumes = [DESIGN_RESUME, PYTHON_RESUME, 'Java developer with some SQL reporting.']
+    target.applications = [
+        Application.objects.create(
+            job=target.job, resume_text=resume,
+            candidate=User.objects.create_user(f'cand{i}@example.com', 'pw', role='candidate')
+        )
+        for i, resume in enumerate(resumes)
+    ]
+
+
+class ScreeningCascadeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        screening_pool(cls)
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(
+            AIClient, 'generate_response', autospec=True, side_effect=AIClient.generate_response
+        )
+        self.generate_response = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_skills_match_whole_words_only(self):
+        matching, missing = local_match_scorer.skill_overlap(['java', 'sql', 'c'], 'JavaScript and MySQL, C.')
+        self.assertEqual((matching, missing), (['c'], ['java', 'sql']))
+
+    def test_pool_is_ranked_locally_best_first(self):
+        ranked = local_match_scorer.rank_pool(self.job, [(a.id, a.resume_text) for a in self.applications])
+        self.assertEqual(ranked[0][0], self.applications[1].id)
+        self.assertEqual(ranked[-1][0], self.applications[0].id)
+        self.assertEqual(ranked[0][1]['bm25_score'], 1)
+
+    def test_reworded_screening_prompt_invalidates_cached_screenings(self):
+        handler = RecruiterHandler(self.recruiter)
+        handler.screen_candidate('Python developer', PYTHON_RESUME)
+        handler.screen_candidate('Python developer', PYTHON_RESUME)
+        self.assertEqual(self.generate_response.call_count, 1)
+
+        with mock.patch.object(PROMPT_TEMPLATES['candidate_screening'], 'tag', 'candidate_screening@v2'):
+            handler.screen_candidate('Python developer', PYTHON_RESUME)
+        self.assertEqual(self.generate_response.call_count, 2)
+
+    def test_unrelated_pair_is_answered_without_the_llm(self):
+        handler = CandidateHandler(self.applications[0].candidate)
+        result = handler.analyze_job_match(DESIGN_RESUME, self.job.id)
+        self.assertEqual(result['screened_by'], 'local')
+        self.assertEqual(result['missing_skills'], ['python', 'django', 'sql'])
+        self.assertEqual(self.generate_response.call_count, 0)
+
+    def test_job_edit_invalidates_cached_matches(self):
+        handler = CandidateHandler(self.applications[1].candidate)
+        handler.analyze_job_match(PYTHON_RESUME, self.job.id)
+        handler.analyze_job_match(PYTHON_RESUME, self.job.id)
+        self.assertEqual(self.generate_response.call_count, 1)
+
+        job = Job.objects.get(id=self.job.id)
+        job.requirements = 'Python, SQL and AWS'
+        job.save()
+        handler.analyze_job_match(PYTHON_RESUME, self.job.id)
+        self.assertEqual(self.generate_response.call_count, 2)
+
+
+class ScreenApplicationsTests(TransactionTestCase):
+    """Screenings run on pool threads, which only see committed rows"""
+
+    def setUp(self):
+        cache.clear()
+        screening_pool(self)
+        patcher = mock.patch.object(
+            AIClient, 'generate_response', autospec=True, side_effect=AIClient.generate_response
+        )
+        self.generate_response = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_only_the_top_n_reach_the_llm_and_results_are_cached(self):
+        handler = RecruiterHandler(self.recruiter)
+        screened = handler.screen_applications(self.job.id, top_n=1)
+
+        self.assertEqual(screened[0]['application_id'], self.applications[1].id)
+        self.assertEqual([entry['llm_screened'] for entry in screened], [True, False, False])
+        self.assertEqual(self.generate_response.call_count, 1)
+
+        handler.screen_applications(self.job.id, top_n=1)
+        self.assertEqual(self.generate_response.call_count, 1)
+
+    @mock.patch('ai_assistant.handlers.recruiter_handler.LLM_SCREENING_TIMEOUT', 0.2)
+    def test_screenings_past_the_timeout_are_pending(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def screen_candidate(handler, job_requirements, resume_text):
+            if resume_text != PYTHON_RESUME:
+                release.wait(5)
+            return {'job_requirements': job_requirements, 'analysis': 'Strong match'}
+
+        with mock.patch.object(RecruiterHandler, 'screen_candidate', autospec=True, side_effect=screen_candidate):
+            screened = RecruiterHandler(self.recruiter).screen_applications(self.job.id, top_n=3)
+
+        self.assertEqual(screened[0]['analysis'], 'Strong match')
+        self.assertEqual([entry.get('llm_pending', False) for entry in screened], [False, True, True])
+
+
+class TokenBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+
+    def setUp(self):
+        cache.clear()
+
+    def outputs(self, task, sizes):
+        AIAnalytics.objects.bulk_create([
+            AIAnalytics(user=self.user, action_type=task, output_tokens=size, response_time_ms=100, success=True)
+            for size in sizes
+        ])
+
+    def test_long_prompt_is_cut_to_fit_the_context_window(self):
+        messages = [{'role': 'user', 'content': 'Summarise this log.'}, {'role': 'user', 'content': 'event\n' * 20000}]
+        planned, max_tokens, estimate = token_budget.plan('openai', messages, 'You are helpful.', max_tokens=1000)
+
+        # The cut is estimated, so the output budget may give up a few tokens to stay inside the window
+        self.assertAlmostEqual(max_tokens, 1000, delta=50)
+        self.assertLessEqual(estimate + max_tokens, MODEL_CONTEXT_TOKENS['openai'])
+        self.assertTrue(planned[1]['content'].endswith(TRUNCATION_MARKER))
+        self.assertEqual(planned[0], messages[0])
+        self.assertEqual(messages[1]['content'], 'event\n' * 20000)  # The caller's messages are not modified
+
+    def test_short_prompt_is_sent_whole(self):
+        messages = [{'role': 'user', 'content': 'Hello'}]
+        planned, max_tokens, _ = token_budget.plan('openai', messages, max_tokens=1000)
+        self.assertEqual((planned, max_tokens), (messages, 1000))
+
+    def test_max_tokens_follows_the_95th_percentile_of_past_outputs(self):
+        self.outputs('job_match', range(100, 2000, 100))  # 19 calls: not enough history yet
+        self.assertEqual(token_budget.max_tokens_for('job_match'), TASK_MAX_TOKENS['job_match'])
+
+        cache.clear()
+        self.outputs('job_match', [2000])
+        # 95th percentile of 100..2000 is 1900; x1.25 headroom, rounded up to 64
+        self.assertEqual(token_budget.max_tokens_for('job_match'), 2432)
+        self.assertEqual(token_budget.plan('mock', [], task='job_match')[1], 2432)
+
+
+class PromptCacheTests(SimpleTestCase):
+    prefix = 'Requirements: Python, Django and PostgreSQL.\n' * 200  # Well past the 1024-token minimum
+
+    def setUp(self):
+        cache.clear()
+
+    def claude_client(self):
+        client = AIClient.__new__(AIClient)  # No API key needed: only the request is inspected
+        client.provider, client.model = 'claude', 'claude-test'
+        client.client = mock.Mock()
+        client.client.messages.create.return_value = SimpleNamespace(
+            content=[SimpleNamespace(text='ok')], model='claude-test', stop_reason='end_turn',
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5, cache_read_input_tokens=1500,
+                                  cache_creation_input_tokens=0),
+        )
+        return client
+
+    def test_claude_marks_system_prompt_and_prefix_as_cacheable(self):
+        client = self.claude_client()
+        result = client._generate_claude_response(
+            [{'role': 'user', 'content': 'Resume text'}], 'You screen resumes.', 500, 0.5, prefix=self.prefix
+        )
+
+        request = client.client.messages.create.call_args.kwargs
+        cache_control = {'type': 'ephemeral', 'ttl': CLAUDE_CACHE_TTL}
+        self.assertEqual(request['system'], [{'type': 'text', 'text': 'You screen resumes.', 'cache_control': cache_control}])
+        self.assertEqual(request['messages'], [{'role': 'user', 'content': [
+            {'type': 'text', 'text': self.prefix, 'cache_control': cache_control},
+            {'type': 'text', 'text': 'Resume text'},
+        ]}])
+        self.assertEqual(result['usage']['cached_input_tokens'], 1500)
+        self.assertEqual(result['usage']['input_tokens'], 1510)
+
+    def test_claude_short_prefix_is_sent_inline(self):
+        client = self.claude_client()
+        client._generate_claude_response([{'role': 'user', 'content': 'Resume text'}], 'Be brief.', 500, 0.5, prefix='Python')
+
+        request = client.client.messages.create.call_args.kwargs
+        self.assertEqual(request['system'], 'Be brief.')
+        self.assertEqual(request['messages'], [{'role': 'user', 'content': 'Python\n\nResume text'}])
+
+    def gemini(self):
+        """A google.genai stand-in whose caches.create hands out numbered names"""
+        client = mock.Mock()
+        client.caches.create.side_effect = lambda **kwargs: SimpleNamespace(
+            name=f'cachedContents/{client.caches.create.call_count}'
+        )
+        genai = SimpleNamespace(types=mock.Mock())
+        modules = mock.patch.dict(sys.modules, {'google': SimpleNamespace(genai=genai), 'google.genai': genai})
+        modules.start()
+        self.addCleanup(modules.stop)
+        return client
+
+    def test_gemini_handle_is_created_once_and_forgotten_on_demand(self):
+        client = self.gemini()
+        handle = GeminiContextCache()
+        args = (client, 'gemini-test', 'You screen resumes.', self.prefix, 2000)
+
+        self.assertEqual(handle.handle(*args), 'cachedContents/1')
+        self.assertEqual(handle.handle(*args), 'cachedContents/1')
+        self.assertEqual(client.caches.create.call_count, 1)
+
+        handle.forget('gemini-test', 'You screen resumes.', self.prefix)
+        self.assertEqual(handle.handle(*args), 'cachedContents/2')
+
+    def test_gemini_short_or_refused_prefix_is_sent_uncached(self):
+        client = self.gemini()
+        handle = GeminiContextCache()
+        self.assertIsNone(handle.handle(client, 'gemini-test', None, 'Python', 10))
+        client.caches.create.assert_not_called()
+
+        client.caches.create.side_effect = RuntimeError('Cached content is too small')
+        args = (client, 'gemini-test', None, self.prefix, 2000)
+        self.assertIsNone(handle.handle(*args))
+        self.assertIsNone(handle.handle(*args))  # The refusal is remembered
+        self.assertEqual(client.caches.create.call_count, 1)
+
+
+class PromptTemplateTests(SimpleTestCase):
+
+    def test_placeholders_must_match_the_defaults(self):
+        with self.assertRaisesMessage(ValueError, "has fields ['role'], defaults for ['level', 'role']"):
+            PromptTemplate('bad', 'Questions for {role}', defaults={'role': 'N/A', 'level': 'N/A'})
+
+    def test_static_template_is_returned_verbatim(self):
+        template = PromptTemplate('static', 'Format as JSON: {"score": 0}')
+        self.assertEqual(template.render({'score': 5}), 'Format as JSON: {"score": 0}')
+        self.assertEqual(template.tag, 'static@v1')
+
+    def test_render_fills_defaults_and_is_memoized(self):
+        template = PromptTemplate('questions', 'Questions for a {level} {role}', version=2,
+                                  defaults={'role': 'N/A', 'level': 'mid'})
+        self.assertEqual(template.render({'role': 'Python developer'}), 'Questions for a mid Python developer')
+        self.assertEqual(template.render({'role': 'Python developer', 'other': 'ignored'}),
+                         'Questions for a mid Python developer')
+        self.assertEqual(template._format.cache_info().hits, 1)
+        self.assertEqual(template.tag, 'questions@v2')
+
+    def test_every_task_prompt_renders_with_its_defaults(self):
+        for name, template in PROMPT_TEMPLATES.items():
+            with self.subTest(template=name):
+                self.assertTrue(template.render())
+        self.assertEqual(prompt_version('job_match'), 'job_match@v1')
+        self.assertEqual(prompt_version('chat'), '')
+        self.assertEqual(get_analysis_prompt('chat'), DEFAULT_ANALYSIS_PROMPT)
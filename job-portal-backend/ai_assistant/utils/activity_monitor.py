@@ -0,0 +1,208 @@
+"""
+Sliding-window detectors for suspicious user activity
+
+SuspiciousActivityDetector is the batch detector: every activity type maps
+to a table with a user foreign key and a creation timestamp, and a single
+grouped query per type counts events per user inside the rule's window.
+
+ActivityStream is the real-time detector: it is fed one event at a time from
+post_save signals and keeps per-user counters in the cache, alerting admins
+the moment a threshold trips without scanning any table.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from accounts.models import OTPVerification
+from jobs.models import Job, Application
+from ..config import SUSPICIOUS_ACTIVITY_RULES
+from ..models import AIAnalytics
+
+logger = logging.getLogger(__name__)
+
+# activity type -> (model, user field, timestamp field, reported type)
+ACTIVITY_SOURCES = {
+    'applications': (Application, 'candidate', 'applied_at', 'excessive_applications'),
+    'job_posts': (Job, 'recruiter', 'created_at', 'excessive_job_postings'),
+    'otp_requests': (OTPVerification, 'user', 'created_at', 'excessive_otp_requests'),
+    'ai_calls': (AIAnalytics, 'user', 'created_at', 'excessive_ai_calls'),
+}
+
+
+class SuspiciousActivityDetector:
+    """
+    Flags users whose activity inside a sliding window crosses a threshold
+
+    Detection is incremental: when ``since`` is given, only users with at
+    least one event after that moment are reported. A poller passes back the
+    ``now`` of its previous run so each offender is surfaced once per burst
+    of new activity instead of on every poll.
+    """
+
+    def __init__(self, rules: Optional[Dict] = None):
+        self.rules = {
+            activity: dict(rule)
+            for activity, rule in (rules or SUSPICIOUS_ACTIVITY_RULES).items()
+        }
+
+    def with_threshold(self, threshold: int) -> 'SuspiciousActivityDetector':
+        """Return a detector that uses the same threshold for every activity"""
+        return SuspiciousActivityDetector({
+            activity: {**rule, 'threshold': threshold}
+            for activity, rule in self.rules.items()
+        })
+
+    def detect(self, since: Optional[datetime] = None, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        Run every configured rule
+
+        Args:
+            since: Only report users with activity after this moment
+            now: End of the windows (defaults to the current time)
+
+        Returns:
+            List of suspicious activities, most active users first
+        """
+        now = now or timezone.now()
+        activities = []
+
+        for activity, rule in self.rules.items():
+            if activity not in ACTIVITY_SOURCES:
+                continue
+            activities.extend(self._detect_activity(activity, rule, since, now))
+
+        activities.sort(key=lambda item: item['count'], reverse=True)
+        return activities
+
+    def _detect_activity(self, activity: str, rule: Dict, since: Optional[datetime], now: datetime) -> List[Dict]:
+        model, user_field, time_field, report_type = ACTIVITY_SOURCES[activity]
+        threshold = rule['threshold']
+        window_start = now - timedelta(minutes=rule['window_minutes'])
+
+        rows = model.objects.filter(**{
+            f'{time_field}__gte': window_start,
+            f'{time_field}__lte': now,
+        }).values(
+            user_field, f'{user_field}__email'
+        ).annotate(
+            count=Count('id'),
+            last_seen=Max(time_field)
+        ).filter(
+            count__gte=threshold
+        ).order_by()
+
+        if since:
+            rows = rows.filter(last_seen__gt=since)
+
+        return [
+            {
+                'type': report_type,
+                'activity': activity,
+                'user_id': row[user_field],
+                'user_email': row[f'{user_field}__email'],
+                'count': row['count'],
+                'threshold': threshold,
+                'window_minutes': rule['window_minutes'],
+                'last_seen': row['last_seen'].isoformat(),
+                'severity': 'high' if row['count'] > threshold * 2 else 'medium'
+            }
+            for row in rows
+        ]
+
+
+class ActivityStream:
+    """
+    Real-time per-user activity counters with threshold alerts
+
+    Uses the sliding window counter approximation: events are counted in
+    fixed windows, and the count over the last window is estimated as the
+    current window's count plus the previous window's count weighted by how
+    much of it still overlaps. Each event costs one cache increment and one
+    two-key read, whatever the window size or traffic.
+
+    Counters live in the default cache, so they are shared between workers
+    when a shared backend (REDIS_URL) is configured.
+    """
+
+    KEY_PREFIX = 'activity-stream'
+
+    def __init__(self, rules: Optional[Dict] = None):
+        self.rules = rules or SUSPICIOUS_ACTIVITY_RULES
+
+    def record(self, activity: str, user_id: int, now: Optional[float] = None) -> Optional[int]:
+        """
+        Count one event and alert admins if the user just crossed the threshold
+
+        Args:
+            activity: Activity type (key of SUSPICIOUS_ACTIVITY_RULES)
+            user_id: User who performed the action
+            now: Event time as a UNIX timestamp (defaults to the current time)
+
+        Returns:
+            Estimated number of events in the window, or None if the
+            activity has no rule
+        """
+        rule = self.rules.get(activity)
+        if not rule:
+            return None
+
+        now = time.time() if now is None else now
+        window_seconds = rule['window_minutes'] * 60
+        window = int(now // window_seconds)
+
+        current_key = self._counter_key(activity, user_id, window)
+        previous_key = self._counter_key(activity, user_id, window - 1)
+
+        # Counters expire once they can no longer be the "previous" window
+        cache.add(current_key, 0, timeout=window_seconds * 2)
+        current = cache.incr(current_key)
+        previous = cache.get(previous_key, 0)
+
+        elapsed = (now % window_seconds) / window_seconds
+        estimate = int(round(current + previous * (1 - elapsed)))
+
+        if estimate >= rule['threshold']:
+            # Alert once per user and window, whichever worker sees it first
+            alert_key = f'{self.KEY_PREFIX}:alerted:{activity}:{user_id}:{window}'
+            if cache.add(alert_key, True, timeout=window_seconds):
+                self._alert_admins(activity, user_id, estimate, rule)
+
+        return estimate
+
+    def _counter_key(self, activity: str, user_id: int, window: int) -> str:
+        return f'{self.KEY_PREFIX}:{activity}:{user_id}:{window}'
+
+    def _alert_admins(self, activity: str, user_id: int, count: int, rule: Dict):
+        """Send an in-app notification to every admin"""
+        from accounts.models import User
+        from notifications.utils.notification_service import notification_service
+
+        report_type = ACTIVITY_SOURCES[activity][3] if activity in ACTIVITY_SOURCES else activity
+        user_email = User.objects.filter(id=user_id).values_list('email', flat=True).first()
+        admins = User.objects.filter(Q(is_staff=True) | Q(role='admin'), is_active=True)
+
+        for admin in admins:
+            notification_service.create_notification(
+                recipient=admin,
+                notification_type='system',
+                title='Suspicious activity detected',
+                message=(
+                    f'{report_type.replace("_", " ").capitalize()}: {user_email or f"user {user_id}"} '
+                    f'reached {count} {activity.replace("_", " ")} in the last '
+                    f'{rule["window_minutes"]} minutes (threshold {rule["threshold"]})'
+                ),
+                link='/admin',
+                send_email=False
+            )
+
+        logger.warning(f"Suspicious activity: user {user_id} reached {count} {activity} (threshold {rule['threshold']})")
+
+
+# Global instances
+suspicious_activity_detector = SuspiciousActivityDetector()
+activity_stream = ActivityStream()
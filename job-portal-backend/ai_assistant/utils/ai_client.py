@@ -13,10 +13,12 @@ from ..config import (
     OPENROUTER_API_KEY,
     OPENROUTER_MODEL,
     DEFAULT_MODEL,
-    MAX_TOKENS,
     TEMPERATURE,
-    USE_MOCK_AI
+    USE_MOCK_AI,
+    CLAUDE_CACHE_TTL
 )
+from .token_budget import token_budget, token_counter
+from .prompt_cache import gemini_context_cache, worth_caching
 
 
 class AIClient:
@@ -127,8 +129,11 @@ class AIClient:
         self,
         messages: List[Dict[str, str]],
         system_prompt: Optional[str] = None,
-        max_tokens: int = MAX_TOKENS,
-        temperature: float = TEMPERATURE
+        max_tokens: Optional[int] = None,
+        temperature: float = TEMPERATURE,
+        task: Optional[str] = None,
+        user=None,
+        cacheable_prefix: Optional[str] = None
     ) -> Dict:
         """
         Generate AI response from messages
@@ -136,8 +141,14 @@ class AIClient:
         Args:
             messages: List of message dicts with 'role' and 'content'
             system_prompt: Optional system prompt to set context
-            max_tokens: Maximum tokens in response
+            max_tokens: Maximum tokens in response; sized from the task's
+                past outputs when None
             temperature: Sampling temperature (0-1)
+            task: Action type, for the output budget and AIAnalytics
+            user: Records the call in AIAnalytics when given
+            cacheable_prefix: Text that repeats across calls (e.g. one job's
+                requirements), sent before the messages and cached by the
+                provider together with the system prompt
 
         Returns:
             Dict with response data including:
@@ -145,7 +156,35 @@ class AIClient:
             - usage: Token usage info
             - model: Model used
             - response_time_ms: Response time in milliseconds
+            - estimated_input_tokens: Prompt size measured before sending
+            - max_tokens: Output budget requested
         """
+        # The stable prefix is counted but never cut; only the messages are fitted
+        stable_prompt = '\n\n'.join(part for part in (system_prompt, cacheable_prefix) if part)
+        messages, max_tokens, estimated_input_tokens = token_budget.plan(
+            self.provider, messages, stable_prompt, task, max_tokens
+        )
+        result = self._generate(messages, system_prompt, max_tokens, temperature, cacheable_prefix)
+        result['estimated_input_tokens'] = estimated_input_tokens
+        result['max_tokens'] = max_tokens
+
+        if user is not None:
+            try:
+                token_budget.record(user, task, result)
+            except Exception as e:
+                print(f"[WARNING] Failed to record AI usage: {e}")
+
+        return result
+
+    def _generate(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        prefix: Optional[str] = None
+    ) -> Dict:
+        """Send the request to the configured provider"""
         start_time = time.time()
 
         try:
@@ -154,24 +193,24 @@ class AIClient:
                 from .mock_ai_client import get_mock_ai_client
                 mock_client = get_mock_ai_client()
                 return mock_client.generate_response(
-                    messages, system_prompt, max_tokens, temperature
+                    self._inline_prefix(messages, prefix), system_prompt, max_tokens, temperature
                 )
 
             if self.provider == 'gemini':
                 result = self._generate_gemini_response(
-                    messages, system_prompt, max_tokens, temperature
+                    messages, system_prompt, max_tokens, temperature, prefix
                 )
             elif self.provider == 'claude':
                 result = self._generate_claude_response(
-                    messages, system_prompt, max_tokens, temperature
+                    messages, system_prompt, max_tokens, temperature, prefix
                 )
             elif self.provider == 'openai':
                 result = self._generate_openai_response(
-                    messages, system_prompt, max_tokens, temperature
+                    self._inline_prefix(messages, prefix), system_prompt, max_tokens, temperature
                 )
             elif self.provider == 'openrouter':
                 result = self._generate_openrouter_response(
-                    messages, system_prompt, max_tokens, temperature
+                    self._inline_prefix(messages, prefix), system_prompt, max_tokens, temperature
                 )
             else:
                 raise ValueError(f"Unsupported provider: {self.provider}")
@@ -191,41 +230,85 @@ class AIClient:
                 'response_time_ms': response_time_ms
             }
 
+    @staticmethod
+    def _inline_prefix(messages: List[Dict[str, str]], prefix: Optional[str]) -> List[Dict[str, str]]:
+        """Put the cacheable prefix at the start of the first user message"""
+        if not prefix:
+            return messages
+        messages = [dict(msg) for msg in messages]
+        for msg in messages:
+            if msg['role'] == 'user':
+                msg['content'] = f"{prefix}\n\n{msg['content']}"
+                return messages
+        return [{"role": "user", "content": prefix}] + messages
+
+    @staticmethod
+    def _openai_cached_tokens(usage) -> int:
+        """Prompt tokens served from OpenAI's automatic prefix cache"""
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return (getattr(details, 'cached_tokens', 0) or 0) if details else 0
+
     def _generate_gemini_response(
         self,
         messages: List[Dict[str, str]],
         system_prompt: Optional[str],
         max_tokens: int,
-        temperature: float
+        temperature: float,
+        prefix: Optional[str] = None
     ) -> Dict:
         """Generate response using Google Gemini API"""
         from google import genai
         from google.genai import types
 
-        # Build a single prompt: system + all user messages combined
-        parts = []
-        if system_prompt:
-            parts.append(system_prompt)
-        for msg in messages:
-            parts.append(msg['content'])
-        full_prompt = "\n\n".join(parts)
+        # System prompt and prefix go into a cached content when they are long enough
+        prefix_tokens = token_counter.count('\n\n'.join(part for part in (system_prompt, prefix) if part), 'gemini')
+        cache_name = gemini_context_cache.handle(self.client, self.model, system_prompt, prefix, prefix_tokens)
 
-        config = types.GenerateContentConfig(
-            max_output_tokens=max_tokens,
-            temperature=temperature
-        )
+        response = None
+        if cache_name:
+            try:
+                response = self.client.models.generate_content(
+                    model=self.model,
+                    contents="\n\n".join(msg['content'] for msg in messages),
+                    config=types.GenerateContentConfig(
+                        max_output_tokens=max_tokens,
+                        temperature=temperature,
+                        cached_content=cache_name
+                    )
+                )
+            except Exception as e:
+                # Most likely the cache expired early; send the whole prompt instead
+                print(f"[WARNING] Gemini cached content {cache_name} failed: {e}")
+                gemini_context_cache.forget(self.model, system_prompt, prefix)
+
+        if response is None:
+            # Build a single prompt: system + prefix + all user messages combined
+            parts = []
+            if system_prompt:
+                parts.append(system_prompt)
+            if prefix:
+                parts.append(prefix)
+            for msg in messages:
+                parts.append(msg['content'])
+            full_prompt = "\n\n".join(parts)
+
+            config = types.GenerateContentConfig(
+                max_output_tokens=max_tokens,
+                temperature=temperature
+            )
 
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=full_prompt,
-            config=config
-        )
+            response = self.client.models.generate_content(
+                model=self.model,
+                contents=full_prompt,
+                config=config
+            )
 
         return {
             'content': response.text,
             'usage': {
                 'input_tokens': response.usage_metadata.prompt_token_count,
-                'output_tokens': response.usage_metadata.candidates_token_count
+                'output_tokens': response.usage_metadata.candidates_token_count,
+                'cached_input_tokens': response.usage_metadata.cached_content_token_count or 0
             },
             'model': self.model,
         }
@@ -235,23 +318,49 @@ class AIClient:
         messages: List[Dict[str, str]],
         system_prompt: Optional[str],
         max_tokens: int,
-        temperature: float
+        temperature: float,
+        prefix: Optional[str] = None
     ) -> Dict:
         """Generate response using Claude API"""
+        system_prompt = system_prompt if system_prompt else "You are a helpful AI assistant."
+        prefix_tokens = token_counter.count('\n\n'.join(part for part in (system_prompt, prefix) if part), 'claude')
+
+        if worth_caching('claude', prefix_tokens):
+            # Cache breakpoints after the system prompt and after the prefix,
+            # so the system prompt is reused across jobs and the prefix within one
+            cache_control = {"type": "ephemeral", "ttl": CLAUDE_CACHE_TTL}
+            system = [{"type": "text", "text": system_prompt, "cache_control": cache_control}]
+            if prefix:
+                messages = [dict(msg) for msg in messages]
+                first_user = next((msg for msg in messages if msg['role'] == 'user'), None)
+                prefix_block = {"type": "text", "text": prefix, "cache_control": cache_control}
+                if first_user is None:
+                    messages.insert(0, {"role": "user", "content": [prefix_block]})
+                else:
+                    first_user['content'] = [prefix_block, {"type": "text", "text": first_user['content']}]
+        else:
+            system = system_prompt
+            messages = self._inline_prefix(messages, prefix)
 
         response = self.client.messages.create(
             model=self.model,
             max_tokens=max_tokens,
             temperature=temperature,
-            system=system_prompt if system_prompt else "You are a helpful AI assistant.",
+            system=system,
             messages=messages
         )
 
+        # input_tokens excludes cache reads and writes; report the whole prompt
+        cache_read = getattr(response.usage, 'cache_read_input_tokens', 0) or 0
+        cache_write = getattr(response.usage, 'cache_creation_input_tokens', 0) or 0
+
         return {
             'content': response.content[0].text,
             'usage': {
-                'input_tokens': response.usage.input_tokens,
-                'output_tokens': response.usage.output_tokens
+                'input_tokens': response.usage.input_tokens + cache_read + cache_write,
+                'output_tokens': response.usage.output_tokens,
+                'cached_input_tokens': cache_read,
+                'cache_write_tokens': cache_write
             },
             'model': response.model,
             'stop_reason': response.stop_reason
@@ -281,7 +390,8 @@ class AIClient:
             'content': response.choices[0].message.content,
             'usage': {
                 'input_tokens': response.usage.prompt_tokens,
-                'output_tokens': response.usage.completion_tokens
+                'output_tokens': response.usage.completion_tokens,
+                'cached_input_tokens': self._openai_cached_tokens(response.usage)
             },
             'model': response.model,
             'finish_reason': response.choices[0].finish_reason
@@ -317,7 +427,8 @@ class AIClient:
             'content': response.choices[0].message.content,
             'usage': {
                 'input_tokens': response.usage.prompt_tokens,
-                'output_tokens': response.usage.completion_tokens
+                'output_tokens': response.usage.completion_tokens,
+                'cached_input_tokens': self._openai_cached_tokens(response.usage)
             },
             'model': response.model,
             'finish_reason': response.choices[0].finish_reason
@@ -356,7 +467,8 @@ class AIClient:
 
         result = self.generate_response(
             messages=messages,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            task=analysis_type
         )
 
         return result.get('content', '')
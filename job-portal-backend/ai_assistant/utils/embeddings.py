@@ -0,0 +1,159 @@
+"""
+Local text embeddings for semantic job/candidate matching
+
+Text is turned into a fixed-size vector with the hashing trick: every word
+and word pair is hashed (crc32, stable across processes) into one of
+EMBEDDING_DIMENSIONS signed buckets with a log-scaled term frequency. No
+model download, no network and no fitted vocabulary, so a vector can be
+computed the moment a job or profile is saved and never goes stale. IDF
+weighting is applied later by the vector index, from the stored corpus.
+
+Vectors are stored as float16 bytes in the Embedding table (2 KB each at
+1024 dimensions). Each kind has a version the vector index rebuilds on:
+a shared-cache counter bumped on every write, or without a shared cache
+the kind's row count and latest updated_at.
+"""
+import hashlib
+import logging
+import re
+import zlib
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from ..config import EMBEDDING_DIMENSIONS
+from ..models import Embedding
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Words that carry no matching signal in job posts and resumes
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or our the their this to
+we will with you your who what which years year experience work working team strong
+good ability able must should etc including
+""".split())
+
+
+class TextEmbedder:
+    """Hashed term-frequency vectors over words and adjacent word pairs"""
+
+    def __init__(self, dimensions=EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    @staticmethod
+    def tokens(text):
+        words = [word for word in TOKEN_PATTERN.findall((text or '').lower()) if word not in STOP_WORDS]
+        return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+    def embed(self, text):
+        """
+        Embed text
+
+        Returns:
+            L2-normalised float32 vector (all zeros for empty text)
+        """
+        counts = {}
+        for token in self.tokens(text):
+            counts[token] = counts.get(token, 0) + 1
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token, count in counts.items():
+            digest = zlib.crc32(token.encode('utf-8'))
+            sign = 1.0 if digest & 0x80000000 else -1.0  # Signed hashing keeps collisions unbiased
+            vector[digest % self.dimensions] += sign * (1.0 + np.log(count))
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def to_bytes(vector):
+        return np.asarray(vector, dtype=np.float16).tobytes()
+
+    @staticmethod
+    def from_bytes(data):
+        return np.frombuffer(bytes(data), dtype=np.float16).astype(np.float32)
+
+
+def job_text(job):
+    """Text embedded for a job; title and skills repeated to weigh them above boilerplate"""
+    return '\n'.join([
+        job.title, job.title, job.required_skills, job.required_skills,
+        job.description, job.requirements,
+    ])
+
+
+def candidate_text(profile):
+    """Text embedded for a candidate profile"""
+    return '\n'.join([profile.skills, profile.skills, profile.resume_text])
+
+
+class EmbeddingStore:
+    """Write-through storage of job and candidate vectors"""
+
+    def version_key(self, kind):
+        return f'ai:embeddings:{kind}:version'
+
+    def get_version(self, kind):
+        """
+        Version of a kind's stored vectors
+
+        A per-process cache would only see this process's bumps, so without
+        a shared cache the version is read from the Embedding table.
+        """
+        if settings.SHARED_CACHE:
+            return cache.get_or_set(self.version_key(kind), 1, None)
+        state = Embedding.objects.filter(kind=kind).aggregate(count=Count('id'), latest=Max('updated_at'))
+        latest = state['latest'].timestamp() if state['latest'] else 0
+        return f"{state['count']}-{latest}"
+
+    def _bump_version(self, kind):
+        if not settings.SHARED_CACHE:
+            return
+        try:
+            cache.incr(self.version_key(kind))
+        except ValueError:
+            cache.set(self.version_key(kind), 1, None)
+
+    def update(self, kind, object_id, text):
+        """
+        Embed text and store it, unless the text has not changed
+
+        Returns:
+            True if the stored vector changed
+        """
+        content_hash = hashlib.sha256(f'{text_embedder.dimensions}:{text}'.encode('utf-8')).hexdigest()
+        if Embedding.objects.filter(kind=kind, object_id=object_id, content_hash=content_hash).exists():
+            return False
+
+        Embedding.objects.update_or_create(
+            kind=kind,
+            object_id=object_id,
+            defaults={
+                'vector': text_embedder.to_bytes(text_embedder.embed(text)),
+                'content_hash': content_hash,
+            }
+        )
+        self._bump_version(kind)
+        return True
+
+    def delete(self, kind, object_id):
+        if Embedding.objects.filter(kind=kind, object_id=object_id).delete()[0]:
+            self._bump_version(kind)
+
+    def embed_job(self, job):
+        return self.update('job', job.id, job_text(job))
+
+    def embed_candidate(self, profile):
+        return self.update('candidate', profile.user_id, candidate_text(profile))
+
+    def get_vectors(self, kind, object_ids):
+        """Stored vectors for object_ids, as {object_id: vector}"""
+        rows = Embedding.objects.filter(kind=kind, object_id__in=object_ids).values_list('object_id', 'vector')
+        return {object_id: text_embedder.from_bytes(vector) for object_id, vector in rows}
+
+
+# Global instances
+text_embedder = TextEmbedder()
+embedding_store = EmbeddingStore()
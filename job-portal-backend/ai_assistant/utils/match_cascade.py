@@ -0,0 +1,155 @@
+"""
+Two-stage candidate/job matching
+
+Stage one is a local scorer that costs no tokens: required skills found in
+the resume, embedding similarity and, across a pool of resumes, BM25 over
+the job's skill terms. Stage two, the LLM, only sees pairs that stage one
+ranks in the top N (or, for a single pair, that clear a minimum score).
+LLM results are cached per (resume hash, job version), so re-opening the
+same match or re-screening an unchanged pool costs nothing.
+"""
+import hashlib
+import math
+import re
+from collections import Counter
+from django.core.cache import cache
+from ..config import LOCAL_MATCH_FLOOR, MATCH_CACHE_SECONDS
+from .embeddings import text_embedder, job_text, TOKEN_PATTERN
+from .vector_index import candidate_vectors
+
+# Weights of the local signals in combined_score
+SKILL_WEIGHT = 0.6
+SEMANTIC_WEIGHT = 0.4
+POOL_WEIGHTS = {'skill': 0.5, 'semantic': 0.3, 'bm25': 0.2}
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def text_hash(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def job_version(job):
+    """Changes whenever the job is edited (updated_at is auto_now)"""
+    return f'{job.id}:{job.updated_at.timestamp()}'
+
+
+def job_skills(job):
+    return [skill.strip() for skill in job.required_skills.split(',') if skill.strip()]
+
+
+class LocalMatchScorer:
+    """Token-free relevance of resumes to a job"""
+
+    @staticmethod
+    def skill_overlap(skills, resume_text):
+        """
+        Required skills mentioned in the resume (whole words, case-insensitive)
+
+        Returns:
+            (matching skills, missing skills)
+        """
+        resume = (resume_text or '').lower()
+        matching, missing = [], []
+        for skill in skills:
+            pattern = r'(?<![a-z0-9])' + re.escape(skill.lower()) + r'(?![a-z0-9])'
+            (matching if re.search(pattern, resume) else missing).append(skill)
+        return matching, missing
+
+    def score(self, job, resume_text, job_vector=None):
+        """
+        Local match of one resume to a job
+
+        Returns:
+            Dict with skill_score, semantic_score and combined_score (0-1),
+            plus matching_skills and missing_skills
+        """
+        skills = job_skills(job)
+        matching, missing = self.skill_overlap(skills, resume_text)
+        skill_score = len(matching) / len(skills) if skills else 0.0
+
+        if job_vector is None:
+            job_vector = text_embedder.embed(job_text(job))
+        semantic_score = max(float(candidate_vectors.similarity(job_vector, [text_embedder.embed(resume_text)])[0]), 0.0)
+
+        return {
+            'skill_score': skill_score,
+            'semantic_score': semantic_score,
+            'combined_score': SKILL_WEIGHT * skill_score + SEMANTIC_WEIGHT * semantic_score,
+            'matching_skills': matching,
+            'missing_skills': missing,
+        }
+
+    @staticmethod
+    def bm25(query_terms, documents):
+        """BM25 of each document for the query terms, within this pool of documents"""
+        tokenized = [TOKEN_PATTERN.findall((document or '').lower()) for document in documents]
+        if not tokenized:
+            return []
+        average_length = (sum(len(tokens) for tokens in tokenized) / len(tokenized)) or 1
+        frequencies = [Counter(tokens) for tokens in tokenized]
+        document_frequency = Counter(term for counts in frequencies for term in set(counts) & set(query_terms))
+
+        scores = []
+        for tokens, counts in zip(tokenized, frequencies):
+            score = 0.0
+            for term in query_terms:
+                if not counts[term]:
+                    continue
+                idf = math.log(1 + (len(tokenized) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                tf = counts[term]
+                score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / average_length))
+            scores.append(score)
+        return scores
+
+    def rank_pool(self, job, resumes):
+        """
+        Score a pool of resumes for one job, best first
+
+        Args:
+            job: Job instance
+            resumes: List of (key, resume_text)
+
+        Returns:
+            List of (key, local score dict) with a pool-relative combined_score
+        """
+        job_vector = text_embedder.embed(job_text(job))
+        scored = [(key, self.score(job, text, job_vector)) for key, text in resumes]
+
+        query_terms = sorted({term for skill in job_skills(job) for term in TOKEN_PATTERN.findall(skill.lower())})
+        bm25 = self.bm25(query_terms, [text for _, text in resumes])
+        top_bm25 = max(bm25, default=0) or 1
+        for (_, local), raw in zip(scored, bm25):
+            local['bm25_score'] = raw / top_bm25
+            local['combined_score'] = (
+                POOL_WEIGHTS['skill'] * local['skill_score'] +
+                POOL_WEIGHTS['semantic'] * local['semantic_score'] +
+                POOL_WEIGHTS['bm25'] * local['bm25_score']
+            )
+
+        scored.sort(key=lambda item: item[1]['combined_score'], reverse=True)
+        return scored
+
+    @staticmethod
+    def worth_llm(local):
+        """Whether a single pair is related enough to spend an LLM call on"""
+        return local['combined_score'] >= LOCAL_MATCH_FLOOR
+
+
+class MatchCache:
+    """LLM match/screening results keyed by resume hash and job version"""
+
+    def key(self, kind, resume_text, version):
+        return f'ai:match:{kind}:{text_hash(resume_text)}:{text_hash(version)}'
+
+    def get(self, kind, resume_text, version):
+        return cache.get(self.key(kind, resume_text, version))
+
+    def set(self, kind, resume_text, version, result):
+        cache.set(self.key(kind, resume_text, version), result, MATCH_CACHE_SECONDS)
+
+
+# Global instances
+local_match_scorer = LocalMatchScorer()
+match_cache = MatchCache()
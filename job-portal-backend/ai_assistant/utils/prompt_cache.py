@@ -0,0 +1,127 @@
+"""
+Provider prompt caching
+
+Many calls repeat a long prefix: the task's system prompt, and for
+screening one job's requirements before each candidate's resume. That
+prefix (the system prompt plus an optional cacheable_prefix passed to
+AIClient.generate_response) is cached the way each provider supports:
+
+- Claude: the system prompt and prefix are sent as text blocks marked with
+  cache_control, kept by Anthropic for CLAUDE_CACHE_TTL.
+- Gemini: the prefix is uploaded once as cached content and referenced by
+  name. Handles are shared between workers through the Django cache and
+  dropped a minute before the provider expires them.
+- OpenAI / OpenRouter: prefixes of 1024+ tokens are cached automatically
+  when they come first, so the prefix is put at the start of the prompt.
+
+Cached input tokens are recorded in AIAnalytics.cached_input_tokens and
+summarised by prompt_cache_stats.
+"""
+import hashlib
+import logging
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from ..config import PROMPT_CACHE_ENABLED, PROMPT_CACHE_MIN_TOKENS, GEMINI_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def prefix_hash(*parts):
+    return hashlib.sha256('\x00'.join(part or '' for part in parts).encode('utf-8')).hexdigest()
+
+
+def worth_caching(provider, prefix_tokens):
+    """Whether a prefix is long enough for the provider to cache"""
+    return PROMPT_CACHE_ENABLED and prefix_tokens >= PROMPT_CACHE_MIN_TOKENS.get(provider, 0)
+
+
+class GeminiContextCache:
+    """Gemini cached-content handles, one per (model, system prompt, prefix)"""
+
+    def key(self, model, system_prompt, prefix):
+        return f'ai:prompt_cache:gemini:{prefix_hash(model, system_prompt, prefix)}'
+
+    def handle(self, client, model, system_prompt, prefix, prefix_tokens):
+        """
+        Name of the cached content holding this prefix, creating it if needed
+
+        Args:
+            client: google.genai Client
+            model: Gemini model name
+            system_prompt: System instruction to cache
+            prefix: Stable text sent before the per-call messages
+            prefix_tokens: Estimated tokens of system_prompt + prefix
+
+        Returns:
+            Cached content name, or None to send the prompt uncached
+        """
+        if not worth_caching('gemini', prefix_tokens):
+            return None
+
+        key = self.key(model, system_prompt, prefix)
+        name = cache.get(key)
+        if name is not None:
+            return name or None  # '' remembers that the provider refused this prefix
+
+        try:
+            from google.genai import types
+            created = client.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=system_prompt or None,
+                    contents=[prefix] if prefix else None,
+                    ttl=f'{GEMINI_CACHE_TTL_SECONDS}s',
+                )
+            )
+            name = created.name
+            logger.info(f"Created Gemini context cache {name} ({prefix_tokens} tokens)")
+        except Exception as e:
+            logger.warning(f"Gemini context cache not created: {str(e)}")
+            name = ''
+
+        cache.set(key, name, max(GEMINI_CACHE_TTL_SECONDS - 60, 60))
+        return name or None
+
+    def forget(self, model, system_prompt, prefix):
+        """Drop a handle the provider no longer knows (expired or deleted)"""
+        cache.delete(self.key(model, system_prompt, prefix))
+
+
+def prompt_cache_stats(queryset):
+    """
+    Prompt cache hit rates per action type
+
+    Args:
+        queryset: AIAnalytics rows to summarise
+
+    Returns:
+        List of dicts with calls, cached_calls, hit_rate (% of calls that
+        read from the cache) and cached_token_share (% of input tokens
+        served from the cache)
+    """
+    rows = (
+        queryset.values('action_type')
+        .annotate(
+            calls=Count('id'),
+            cached_calls=Count('id', filter=Q(cached_input_tokens__gt=0)),
+            total_input_tokens=Sum('input_tokens'),
+            total_cached_tokens=Sum('cached_input_tokens'),
+        )
+        .order_by('action_type')
+    )
+    return [
+        {
+            'action_type': row['action_type'],
+            'calls': row['calls'],
+            'cached_calls': row['cached_calls'],
+            'hit_rate': round(row['cached_calls'] / row['calls'] * 100, 2) if row['calls'] else 0,
+            'cached_token_share': round(
+                (row['total_cached_tokens'] or 0) / row['total_input_tokens'] * 100, 2
+            ) if row['total_input_tokens'] else 0,
+        }
+        for row in rows
+    ]
+
+
+# Global instance
+gemini_context_cache = GeminiContextCache()
@@ -1,6 +1,14 @@
 """
 Prompt templates for different AI assistant tasks
+
+Analysis prompts are compiled once at import into PROMPT_TEMPLATES, and a
+call renders only the template it asks for.
 """
+from functools import lru_cache
+from string import Formatter
+
+# Distinct renders kept per template (e.g. one job_match prompt per job)
+PROMPT_RENDER_CACHE_SIZE = 256
 
 # System prompts for different user roles
 CANDIDATE_SYSTEM_PROMPT = """You are an AI career assistant helping job candidates. Your capabilities include:
@@ -30,22 +38,67 @@ ADMIN_SYSTEM_PROMPT = """You are an AI admin assistant for a job portal platform
 Be analytical, security-conscious, and precise. Focus on platform health and safety."""
 
 
+SYSTEM_PROMPTS = {
+    'candidate': CANDIDATE_SYSTEM_PROMPT,
+    'recruiter': RECRUITER_SYSTEM_PROMPT,
+    'admin': ADMIN_SYSTEM_PROMPT
+}
+
+DEFAULT_ANALYSIS_PROMPT = "Analyze the provided content and respond professionally."
+
+
 def get_system_prompt(user_role: str) -> str:
     """Get system prompt based on user role"""
-    prompts = {
-        'candidate': CANDIDATE_SYSTEM_PROMPT,
-        'recruiter': RECRUITER_SYSTEM_PROMPT,
-        'admin': ADMIN_SYSTEM_PROMPT
-    }
-    return prompts.get(user_role, CANDIDATE_SYSTEM_PROMPT)
+    return SYSTEM_PROMPTS.get(user_role, CANDIDATE_SYSTEM_PROMPT)
 
 
-def get_analysis_prompt(analysis_type: str, context: dict = None) -> str:
-    """Get prompt for specific analysis tasks"""
-    context = context or {}
+class PromptTemplate:
+    """
+    One analysis prompt, compiled at import
+
+    Templates without defaults are static and returned verbatim, so they may
+    contain literal braces (JSON examples). Templates with defaults are
+    str.format templates whose placeholders must be exactly the keys of
+    defaults; literal braces in them must be doubled. Renders are memoized
+    per distinct set of values, so the same job's prompt for many candidates
+    is formatted once.
+
+    Bump version whenever the wording changes: it is part of match cache
+    keys and of AIAnalytics.prompt_version.
+    """
 
-    prompts = {
-        'resume_analysis': """Analyze the provided resume and provide comprehensive feedback.
+    def __init__(self, name: str, text: str, version: int = 1, defaults: dict = None):
+        self.name = name
+        self.text = text
+        self.version = version
+        self.defaults = defaults
+        self.tag = f'{name}@v{version}'
+
+        if defaults is not None:
+            fields = {field for _, field, _, _ in Formatter().parse(text) if field is not None}
+            if fields != set(defaults):
+                raise ValueError(f"Prompt template {name} has fields {sorted(fields)}, defaults for {sorted(defaults)}")
+            self._fields = tuple(defaults)
+            self._format = lru_cache(maxsize=PROMPT_RENDER_CACHE_SIZE)(self._format_values)
+
+    def _format_values(self, values: tuple) -> str:
+        return self.text.format_map(dict(zip(self._fields, values)))
+
+    def render(self, context: dict = None) -> str:
+        """Fill the template's placeholders from context, falling back to its defaults"""
+        if self.defaults is None:
+            return self.text
+        context = context or {}
+        return self._format(tuple(str(context.get(field, self.defaults[field])) for field in self._fields))
+
+
+def _compile(*templates: PromptTemplate) -> dict:
+    return {template.name: template for template in templates}
+
+
+# Analysis prompts by task; the task name is also the AIAnalytics action_type
+PROMPT_TEMPLATES = _compile(
+    PromptTemplate('resume_analysis', """Analyze the provided resume and provide comprehensive feedback.
 
 Extract and analyze:
 1. Key skills (technical and soft skills)
@@ -76,16 +129,14 @@ Format your response as structured JSON with fields:
 - areas_for_improvement: array with detailed explanations
 - recommendation_summary: string (2-3 sentences)
 
-Be specific and actionable with all feedback.""",
-
-        'skill_extraction': """Extract all technical and professional skills from the resume.
-Return a JSON array of skills with categories (e.g., programming, tools, soft skills).""",
-
-        'job_match': f"""Compare this candidate's profile with the following job requirements:
+Be specific and actionable with all feedback."""),
+    PromptTemplate('skill_extraction', """Extract all technical and professional skills from the resume.
+Return a JSON array of skills with categories (e.g., programming, tools, soft skills)."""),
+    PromptTemplate('job_match', """Compare this candidate's profile with the following job requirements:
 
-Job Title: {context.get('job_title', 'N/A')}
-Required Skills: {context.get('required_skills', 'N/A')}
-Job Description: {context.get('job_description', 'N/A')}
+Job Title: {job_title}
+Required Skills: {required_skills}
+Job Description: {job_description}
 
 Calculate a match score (0-100) and explain:
 1. Matching skills
@@ -93,21 +144,20 @@ Calculate a match score (0-100) and explain:
 3. Recommendations for the candidate
 
 Format as JSON with: match_score, matching_skills, missing_skills, recommendations.""",
-
-        'resume_improvement': """Review this resume and provide ATS-optimization feedback:
+    defaults={'job_title': 'N/A', 'required_skills': 'N/A', 'job_description': 'N/A'}),
+    PromptTemplate('resume_improvement', """Review this resume and provide ATS-optimization feedback:
 1. Formatting issues
 2. Missing keywords
 3. Weak action verbs to strengthen
 4. Sections to add or improve
 5. Overall ATS compatibility score (0-100)
 
-Be specific and actionable.""",
-
-        'job_description': f"""Generate a compelling job description for:
+Be specific and actionable."""),
+    PromptTemplate('job_description', """Generate a compelling job description for:
 
-Position: {context.get('position', 'N/A')}
-Company: {context.get('company', 'N/A')}
-Requirements: {context.get('requirements', 'N/A')}
+Position: {position}
+Company: {company}
+Requirements: {requirements}
 
 Include:
 1. Engaging overview
@@ -117,12 +167,12 @@ Include:
 5. Company culture highlights
 
 Keep it concise and ATS-friendly.""",
+    defaults={'position': 'N/A', 'company': 'N/A', 'requirements': 'N/A'}),
+    PromptTemplate('interview_questions', """Generate 5-7 interview questions for:
 
-        'interview_questions': f"""Generate 5-7 interview questions for:
-
-Role: {context.get('role', 'N/A')}
-Level: {context.get('level', 'Entry/Mid/Senior')}
-Key Skills: {context.get('skills', 'N/A')}
+Role: {role}
+Level: {level}
+Key Skills: {skills}
 
 Include:
 1. Technical questions (if applicable)
@@ -130,25 +180,85 @@ Include:
 3. Situational questions
 
 Provide both questions and what to look for in answers.""",
-
-        'candidate_summary': """Summarize this candidate's profile in 3-5 bullet points:
+    defaults={'role': 'N/A', 'level': 'Entry/Mid/Senior', 'skills': 'N/A'}),
+    PromptTemplate('candidate_summary', """Summarize this candidate's profile in 3-5 bullet points:
 - Key strengths
 - Relevant experience
 - Notable achievements
 - Fit for typical roles
 
-Keep it concise and highlight standout qualities.""",
+Keep it concise and highlight standout qualities."""),
+    PromptTemplate('candidate_screening', """Analyze the candidate below for the following position:
+
+**JOB REQUIREMENTS:**
+{job_requirements}
+
+Provide a detailed screening analysis with these sections:
+
+**Overall Match Assessment (Score: X/100)**
+Brief overview of how well the candidate matches the requirements
+
+**Key Strengths**
+- Strength 1
+- Strength 2
+- Strength 3
+(List 3-5 major strengths with specific examples)
+
+**Relevant Experience & Achievements**
+Detailed assessment of their experience level, key projects, and accomplishments
+
+**Skills Analysis**
+
+✅ Required Skills Met:
+- Skill 1
+- Skill 2
+- Skill 3
+
+⚠️ Skills Gaps:
+- Missing skill 1
+- Skill to develop 2
+
+**Areas of Concern**
+- Concern 1 (if any)
+- Concern 2 (if any)
 
-        'spam_detection': """Analyze this content for spam or suspicious activity:
+**Cultural Fit & Soft Skills**
+Assessment of teamwork, leadership, communication abilities
+
+**Recommendation:** [Strong Yes / Yes / Maybe / No]
+
+**Next Steps:**
+Clear recommendation on how to proceed with this candidate
+
+Use clear headers, bullet points, and emojis for visual appeal. Be thorough and specific.""",
+    defaults={'job_requirements': 'N/A'}),
+    PromptTemplate('spam_detection', """Analyze this content for spam or suspicious activity:
 1. Is it likely spam? (Yes/No)
 2. Confidence level (0-100)
 3. Red flags identified
 4. Recommended action (approve/flag/block)
 
-Format as JSON."""
-    }
+Format as JSON."""),
+)
+
+
+def get_prompt_template(analysis_type: str):
+    """Compiled template for a task, or None for tasks without one"""
+    return PROMPT_TEMPLATES.get(analysis_type)
 
-    return prompts.get(analysis_type, "Analyze the provided content and respond professionally.")
+
+def prompt_version(analysis_type: str) -> str:
+    """Version tag of a task's prompt (e.g. 'job_match@v1'), '' for tasks without a template"""
+    template = PROMPT_TEMPLATES.get(analysis_type)
+    return template.tag if template else ''
+
+
+def get_analysis_prompt(analysis_type: str, context: dict = None) -> str:
+    """Get prompt for specific analysis tasks"""
+    template = PROMPT_TEMPLATES.get(analysis_type)
+    if template is None:
+        return DEFAULT_ANALYSIS_PROMPT
+    return template.render(context)
 
 
 def format_conversation_history(messages: list, max_history: int = 10) -> list:
@@ -0,0 +1,225 @@
+"""
+Resume preprocessing before AI submission
+
+Resumes arrive as pasted text or extracted from PDF/DOCX, full of repeated
+page headers, "References available upon request", ragged whitespace and
+blank lines. Before a resume goes into a prompt it is:
+
+1. normalised (control characters, runs of spaces, bullets, blank lines),
+2. cleaned of boilerplate and of lines repeated verbatim (page headers),
+3. segmented into sections (summary, experience, education, skills,
+   projects, certifications) by their headings,
+4. fitted to the task's token budget: each section gets a share of the
+   budget by the task's weights, unused share flows to sections that need
+   more, and sections are cut on line boundaries.
+
+A resume that already fits is only normalised and cleaned, never cut.
+"""
+import logging
+import re
+from ..config import RESUME_TOKEN_BUDGETS, RESUME_SECTION_WEIGHTS, CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+# Section -> headings that open it (compared lowercased, without punctuation)
+SECTION_HEADINGS = {
+    'summary': [
+        'summary', 'professional summary', 'profile', 'professional profile', 'about me',
+        'objective', 'career objective', 'career summary', 'overview',
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history', 'internships', 'internship',
+    ],
+    'education': [
+        'education', 'academic background', 'academics', 'qualifications',
+        'educational qualifications', 'academic qualifications',
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'core competencies',
+        'competencies', 'technologies', 'tech stack', 'tools', 'tools and technologies',
+    ],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects', 'side projects'],
+    'certifications': [
+        'certifications', 'certificates', 'licenses and certifications', 'courses',
+        'achievements', 'awards', 'awards and achievements', 'publications',
+    ],
+}
+HEADING_SECTIONS = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Text before the first heading (name, contact details)
+HEADER_SECTION = 'header'
+
+# Repeated lines shorter than this (dates, cities, single skills) are kept
+MIN_DEDUPE_CHARS = 20
+
+# Lines that carry nothing for any task
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'^references?( are)?( available)?( up)?on request\.?$',
+        r'^references?:?\s*(available )?(up)?on request\.?$',
+        r'^page \d+( of \d+)?$',
+        r'^-?\s*\d{1,3}\s*-?$',
+        r'^(curriculum vitae|resume|résumé|cv)$',
+        r'^i hereby declare\b.*',
+        r'^declaration:?$',
+    )
+]
+
+BULLET_PATTERN = re.compile(r'^[•▪●◦‣⁃➢►✓✔·*–—-]+\s*')
+CONTROL_PATTERN = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\u200b\ufeff]')
+
+
+class ResumeCompactor:
+    """Token-budgeted, section-aware resume text for prompts"""
+
+    @staticmethod
+    def normalize_lines(text):
+        """Clean lines of the resume: no control characters, single spaces, '- ' bullets, no blanks"""
+        text = CONTROL_PATTERN.sub('', (text or '').replace('\r\n', '\n').replace('\r', '\n'))
+        lines = []
+        for line in text.split('\n'):
+            line = ' '.join(line.split())
+            if not line:
+                continue
+            if BULLET_PATTERN.match(line) and len(line) > 2:
+                line = '- ' + BULLET_PATTERN.sub('', line)
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def is_boilerplate(line):
+        return any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)
+
+    @staticmethod
+    def heading_section(line):
+        """Section a line opens, or None if it is not a heading"""
+        if len(line) > 40:
+            return None
+        key = ' '.join(re.sub(r'[^a-z ]', ' ', line.lower().replace('&', ' and ')).split())
+        return HEADING_SECTIONS.get(key)
+
+    def segment(self, text):
+        """
+        Split a resume into sections
+
+        Boilerplate and repeated lines of MIN_DEDUPE_CHARS or more (compared
+        case- and punctuation-insensitively) are dropped on the way.
+
+        Returns:
+            List of (section, lines) in document order; a section heading
+            that appears twice is merged into its first occurrence
+        """
+        sections = {HEADER_SECTION: []}
+        seen = set()
+        current = HEADER_SECTION
+        for line in self.normalize_lines(text):
+            section = self.heading_section(line)
+            if section is None and ':' in line:
+                # Inline heading: "Skills: Python, Django"
+                heading, rest = line.split(':', 1)
+                section = self.heading_section(heading)
+                line = rest.strip() if section else line
+            if section:
+                current = section
+                sections.setdefault(current, [])
+                if not line or self.heading_section(line):
+                    continue
+            if self.is_boilerplate(line):
+                continue
+            key = re.sub(r'\W+', '', line.lower())
+            if len(key) >= MIN_DEDUPE_CHARS:
+                if key in seen:
+                    continue
+                seen.add(key)
+            sections[current].append(line)
+        return [(section, lines) for section, lines in sections.items() if lines]
+
+    @staticmethod
+    def _allocate(sizes, weights, budget):
+        """
+        Split budget characters between sections by weight
+
+        A section never gets more than it needs; what it leaves over is
+        shared again between the sections that still need more. When no
+        section present has a weight (e.g. a resume without recognised
+        headings), the budget is split evenly instead of dropping everything.
+        """
+        allocation = {section: 0 for section in sizes}
+        if not any(weights.get(section, 0) > 0 for section in sizes):
+            weights = {section: 1 for section in sizes}
+        open_sections = [section for section in sizes if weights.get(section, 0) > 0]
+        remaining = budget
+        while open_sections and remaining > 0:
+            total_weight = sum(weights[section] for section in open_sections)
+            satisfied = []
+            spent = 0
+            for section in open_sections:
+                share = remaining * weights[section] / total_weight
+                wanted = sizes[section] - allocation[section]
+                grant = min(share, wanted)
+                allocation[section] += grant
+                spent += grant
+                if allocation[section] >= sizes[section]:
+                    satisfied.append(section)
+            remaining -= spent
+            if not satisfied:
+                break  # Every open section took its full share; budget used up
+            open_sections = [section for section in open_sections if section not in satisfied]
+        return {section: int(chars) for section, chars in allocation.items()}
+
+    @staticmethod
+    def _fit_lines(lines, chars):
+        """Leading lines of a section that fit in chars; a first line that does not fit is cut on a word"""
+        kept, used = [], 0
+        for line in lines:
+            if used + len(line) + 1 > chars:
+                if not kept and chars > 20:
+                    kept.append(line[:chars].rsplit(' ', 1)[0] + ' ...')
+                break
+            kept.append(line)
+            used += len(line) + 1
+        return kept
+
+    def compact(self, text, task='analysis', max_tokens=None):
+        """
+        Resume text for a prompt, fitted to the task's token budget
+
+        Args:
+            text: Raw resume text
+            task: Key of RESUME_TOKEN_BUDGETS / RESUME_SECTION_WEIGHTS
+                (analysis, job_match, screening, summary, comparison)
+            max_tokens: Override the task's budget
+
+        Returns:
+            Compact resume text, sections under upper-case headings
+        """
+        sections = self.segment(text)
+        budget = (max_tokens or RESUME_TOKEN_BUDGETS[task]) * CHARS_PER_TOKEN
+        weights = RESUME_SECTION_WEIGHTS[task]
+
+        def render(parts):
+            blocks = []
+            for section, lines in parts:
+                if not lines:
+                    continue
+                heading = '' if section == HEADER_SECTION else f'{section.upper()}:\n'
+                blocks.append(heading + '\n'.join(lines))
+            return '\n\n'.join(blocks)
+
+        compacted = render(sections)
+        if len(compacted) <= budget:
+            return compacted
+
+        # Section headings and separators come out of the budget first
+        overhead = sum(len(section) + 4 for section, _ in sections)
+        sizes = {section: sum(len(line) + 1 for line in lines) for section, lines in sections}
+        allocation = self._allocate(sizes, weights, max(budget - overhead, 0))
+        fitted = render([(section, self._fit_lines(lines, allocation[section])) for section, lines in sections])
+
+        logger.debug(f"Compacted resume for {task}: {len(text or '')} -> {len(fitted)} chars")
+        return fitted
+
+
+# Global instance
+resume_compactor = ResumeCompactor()
@@ -0,0 +1,178 @@
+"""
+Token counting and prompt budgets
+
+Every AI call goes through TokenBudget.plan before it is sent:
+
+- The prompt is measured with an offline, per-provider approximation of
+  the provider's tokenizer (no tokenizer downloads, no network).
+- max_tokens is chosen per task from the output sizes of recent
+  successful calls in AIAnalytics (95th percentile plus headroom), and
+  from TASK_MAX_TOKENS until a task has enough history. A task whose
+  outputs keep hitting the limit sees its 95th percentile at the limit,
+  so the next limit is OUTPUT_HEADROOM higher.
+- If prompt plus output would overflow the model's context window, the
+  longest message is cut on a line boundary.
+
+The estimate and the granted max_tokens are stored next to the provider's
+actual usage in AIAnalytics, so the approximation can be checked.
+"""
+import copy
+import logging
+import math
+import re
+from django.core.cache import cache
+from ..config import (
+    MAX_TOKENS,
+    MIN_OUTPUT_TOKENS,
+    MODEL_CONTEXT_TOKENS,
+    OUTPUT_HEADROOM,
+    OUTPUT_HISTORY_MIN_SAMPLES,
+    OUTPUT_HISTORY_SIZE,
+    TASK_MAX_TOKENS,
+)
+from ..models import AIAnalytics
+from .prompt_templates import prompt_version
+
+logger = logging.getLogger(__name__)
+
+# Pieces a tokenizer sees: words, digit runs, other visible characters, line breaks
+PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]|\n+")
+
+# How each provider's tokenizer treats the pieces above
+#   short_word: letters a common word can have and still be one token
+#   word_chars: letters per extra token beyond that
+#   digits: digits per token (sentencepiece models split every digit)
+#   message: tokens of framing per message
+PROVIDER_PROFILES = {
+    'openai': {'short_word': 8, 'word_chars': 4.0, 'digits': 3, 'message': 4},      # cl100k BPE
+    'openrouter': {'short_word': 8, 'word_chars': 3.6, 'digits': 1, 'message': 4},  # Gemma sentencepiece by default
+    'claude': {'short_word': 7, 'word_chars': 3.5, 'digits': 3, 'message': 5},
+    'gemini': {'short_word': 8, 'word_chars': 3.8, 'digits': 1, 'message': 0},      # Prompt is sent as one string
+    'mock': {'short_word': 8, 'word_chars': 4.0, 'digits': 3, 'message': 4},
+}
+
+# Cached max_tokens per task
+MAX_TOKENS_CACHE_SECONDS = 60 * 60
+
+TRUNCATION_MARKER = '\n[...truncated to fit the model context]'
+
+
+class TokenCounter:
+    """Offline token estimates, tuned per provider"""
+
+    def count(self, text, provider='openai'):
+        profile = PROVIDER_PROFILES.get(provider, PROVIDER_PROFILES['openai'])
+        tokens = 0
+        for piece in PIECE_PATTERN.findall(text or ''):
+            if piece[0].isalpha() and piece.isascii():
+                tokens += 1 + max(0, math.ceil((len(piece) - profile['short_word']) / profile['word_chars']))
+            elif piece[0].isdigit():
+                tokens += math.ceil(len(piece) / profile['digits'])
+            elif piece[0] == '\n':
+                tokens += 1
+            else:
+                tokens += 1 if piece.isascii() else 2  # Non-ASCII usually costs more than one byte-level token
+        return tokens
+
+    def count_messages(self, messages, system_prompt=None, provider='openai'):
+        """Prompt tokens of a chat request, including per-message framing"""
+        profile = PROVIDER_PROFILES.get(provider, PROVIDER_PROFILES['openai'])
+        contents = ([system_prompt] if system_prompt else []) + [message.get('content', '') for message in messages]
+        return sum(self.count(content, provider) + profile['message'] for content in contents)
+
+
+class TokenBudget:
+    """Measures prompts and sizes max_tokens before each AI call"""
+
+    def __init__(self, counter):
+        self.counter = counter
+
+    def max_tokens_for(self, task):
+        """
+        Output budget for a task
+
+        Returns:
+            95th percentile of the task's recent output_tokens x OUTPUT_HEADROOM,
+            between MIN_OUTPUT_TOKENS and MAX_TOKENS
+        """
+        default = TASK_MAX_TOKENS.get(task, MAX_TOKENS)
+        if not task:
+            return default
+
+        def compute():
+            outputs = sorted(
+                AIAnalytics.objects.filter(action_type=task, success=True, output_tokens__gt=0)
+                .order_by('-created_at')
+                .values_list('output_tokens', flat=True)[:OUTPUT_HISTORY_SIZE]
+            )
+            if len(outputs) < OUTPUT_HISTORY_MIN_SAMPLES:
+                return default
+            p95 = outputs[min(len(outputs) - 1, math.ceil(len(outputs) * 0.95) - 1)]
+            return max(MIN_OUTPUT_TOKENS, min(MAX_TOKENS, math.ceil(p95 * OUTPUT_HEADROOM / 64) * 64))
+
+        return cache.get_or_set(f'ai:max_tokens:{task}', compute, MAX_TOKENS_CACHE_SECONDS)
+
+    def _truncate(self, text, tokens, provider):
+        """Leading lines of text within roughly tokens tokens"""
+        if tokens <= 0:
+            return TRUNCATION_MARKER.strip()
+        ratio = len(text) / max(self.counter.count(text, provider), 1)
+        cut = text[:int(tokens * ratio)]
+        if '\n' in cut:
+            cut = cut.rsplit('\n', 1)[0]
+        return cut + TRUNCATION_MARKER
+
+    def plan(self, provider, messages, system_prompt=None, task=None, max_tokens=None):
+        """
+        Fit a request to the provider's context window
+
+        Args:
+            provider: AIClient provider name
+            messages: Chat messages (not modified)
+            system_prompt: Optional system prompt
+            task: Action type the output budget is learnt for
+            max_tokens: Explicit output budget; chosen per task when None
+
+        Returns:
+            (messages, max_tokens, estimated_input_tokens)
+        """
+        if max_tokens is None:
+            max_tokens = self.max_tokens_for(task)
+        context = MODEL_CONTEXT_TOKENS.get(provider, MODEL_CONTEXT_TOKENS['mock'])
+        estimate = self.counter.count_messages(messages, system_prompt, provider)
+
+        overflow = estimate + max_tokens - context
+        if overflow > 0 and messages:
+            messages = copy.deepcopy(messages)
+            longest = max(messages, key=lambda message: len(message.get('content', '')))
+            content = longest.get('content', '')
+            keep = self.counter.count(content, provider) - overflow
+            longest['content'] = self._truncate(content, keep, provider)
+            estimate = self.counter.count_messages(messages, system_prompt, provider)
+            logger.warning(f"Prompt for {task or 'AI call'} cut by ~{overflow} tokens to fit {provider} context")
+
+        # A system prompt alone can still leave too little room for the output
+        max_tokens = max(MIN_OUTPUT_TOKENS, min(max_tokens, context - estimate))
+        return messages, max_tokens, estimate
+
+    def record(self, user, task, result):
+        """Store an AI call's estimated and actual token usage in AIAnalytics"""
+        usage = result.get('usage', {})
+        AIAnalytics.objects.create(
+            user=user,
+            action_type=task or 'chat',
+            prompt_version=prompt_version(task),
+            input_tokens=usage.get('input_tokens', 0) or 0,
+            output_tokens=usage.get('output_tokens', 0) or 0,
+            cached_input_tokens=usage.get('cached_input_tokens', 0) or 0,
+            estimated_input_tokens=result.get('estimated_input_tokens', 0),
+            max_tokens=result.get('max_tokens', 0),
+            response_time_ms=result.get('response_time_ms', 0),
+            success=result.get('success', False),
+            error_message=result.get('error', ''),
+        )
+
+
+# Global instances
+token_counter = TokenCounter()
+token_budget = TokenBudget(token_counter)
@@ -0,0 +1,167 @@
+"""
+Approximate nearest-neighbour search over stored embeddings
+
+Each worker loads the vectors of one kind into a float32 matrix, applies IDF
+weights learnt from that matrix (a bucket used by every document tells
+little) and re-normalises, so a dot product is a TF-IDF cosine. Above
+ANN_BRUTE_FORCE_LIMIT vectors, random-hyperplane LSH picks candidate rows
+(ANN_TABLES tables of ANN_BITS bits, probing the exact bucket and every
+bucket one bit away) and only those are scored exactly. The matrix is
+rebuilt when the embedding version of its kind (or the jobs version, for
+jobs) has moved. Both come from the database when the cache is not shared,
+so every worker sees writes made by any other process.
+"""
+import logging
+import threading
+import numpy as np
+from jobs.models import Job
+from jobs.utils.job_facets import job_facets
+from ..config import ANN_TABLES, ANN_BITS, ANN_BRUTE_FORCE_LIMIT
+from ..models import Embedding
+from .embeddings import embedding_store, text_embedder
+
+logger = logging.getLogger(__name__)
+
+
+class LSHTables:
+    """Random-hyperplane hash tables over the rows of a matrix"""
+
+    def __init__(self, matrix, tables=ANN_TABLES, bits=ANN_BITS, seed=42):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((tables, bits, matrix.shape[1])).astype(np.float32)
+        self.powers = 1 << np.arange(bits)
+        self.buckets = []
+        for table in range(tables):
+            codes = self._codes(matrix, table)
+            order = np.argsort(codes, kind='stable')
+            keys, starts = np.unique(codes[order], return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self.buckets.append({
+                int(key): order[start:end] for key, start, end in zip(keys, starts, ends)
+            })
+
+    def _codes(self, matrix, table):
+        return ((matrix @ self.planes[table].T) > 0).astype(np.int64) @ self.powers
+
+    def candidates(self, vector):
+        """Row indices sharing a bucket (or a bucket one bit away) with vector in any table"""
+        rows = []
+        for table, buckets in enumerate(self.buckets):
+            code = int(self._codes(vector[np.newaxis, :], table)[0])
+            for probe in [code] + [code ^ int(power) for power in self.powers]:
+                if probe in buckets:
+                    rows.append(buckets[probe])
+        return np.unique(np.concatenate(rows)) if rows else np.array([], dtype=np.int64)
+
+
+class VectorIndex:
+    """Per-worker top-K search over the embeddings of one kind"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _version(self):
+        version = embedding_store.get_version(self.kind)
+        if self.kind == 'job':
+            return version, job_facets.get_version()  # Publishing/closing a job changes the candidate set
+        return version, None
+
+    def _allowed(self):
+        """Object ids that may be returned"""
+        if self.kind == 'job':
+            return Embedding.objects.filter(
+                kind='job', object_id__in=Job.objects.filter(status='published').values('id')
+            )
+        return Embedding.objects.filter(kind=self.kind)
+
+    def _build(self, version):
+        rows = list(self._allowed().values_list('object_id', 'vector'))
+        ids = np.array([object_id for object_id, _ in rows], dtype=np.int64)
+        if not rows:
+            return {'version': version, 'ids': ids, 'matrix': None, 'idf': None, 'lsh': None}
+
+        matrix = np.vstack([text_embedder.from_bytes(vector) for _, vector in rows])
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        idf = (np.log((1 + len(rows)) / (1 + document_frequency)) + 1).astype(np.float32)
+        matrix = self._normalise(matrix * idf)
+
+        lsh = LSHTables(matrix) if len(rows) > ANN_BRUTE_FORCE_LIMIT else None
+        logger.info(f"Built {self.kind} vector index: {len(rows)} vectors, LSH {'on' if lsh else 'off'}")
+        return {'version': version, 'ids': ids, 'matrix': matrix, 'idf': idf, 'lsh': lsh}
+
+    @staticmethod
+    def _normalise(matrix):
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def state(self):
+        version = self._version()
+        state = self._state
+        if state is not None and state['version'] == version:
+            return state
+        with self._lock:
+            if self._state is None or self._state['version'] != version:
+                self._state = self._build(version)
+            return self._state
+
+    def weigh(self, vector, state=None):
+        """Apply this index's IDF weights to a raw embedding"""
+        state = state or self.state()
+        if state['idf'] is None:
+            return vector
+        return self._normalise(vector * state['idf'])
+
+    def search(self, vector, k=10, exclude=(), min_score=None):
+        """
+        Nearest stored objects to a raw embedding
+
+        Args:
+            vector: Output of TextEmbedder.embed
+            k: Number of results
+            exclude: Object ids to leave out
+            min_score: Drop results below this cosine similarity
+
+        Returns:
+            List of (object_id, score), best first
+        """
+        state = self.state()
+        if state['matrix'] is None or not np.any(vector):
+            return []
+
+        query = self.weigh(vector, state)
+        rows = state['lsh'].candidates(query) if state['lsh'] is not None else None
+        if rows is not None and len(rows) < k * 4:
+            rows = None  # Too few LSH hits to trust; scan everything
+
+        matrix = state['matrix'] if rows is None else state['matrix'][rows]
+        ids = state['ids'] if rows is None else state['ids'][rows]
+        scores = matrix @ query
+
+        excluded = set(exclude)
+        wanted = min(len(scores), k + len(excluded))
+        top = np.argpartition(-scores, wanted - 1)[:wanted] if wanted < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for row in top:
+            object_id, score = int(ids[row]), float(scores[row])
+            if object_id in excluded or (min_score is not None and score < min_score):
+                continue
+            results.append((object_id, score))
+            if len(results) == k:
+                break
+        return results
+
+    def similarity(self, vector, others):
+        """Cosine similarity of one raw embedding to each of a list, with this index's IDF"""
+        if not others:
+            return []
+        state = self.state()
+        return list(self.weigh(np.vstack(others), state) @ self.weigh(vector, state))
+
+
+# Global instances
+job_vectors = VectorIndex('job')
+candidate_vectors = VectorIndex('candidate')
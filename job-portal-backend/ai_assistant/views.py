@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from .models import Conversation, Message, AIAnalytics
 from .serializers import (
@@ -17,6 +18,8 @@ from .serializers import (
     InterviewQuestionsRequestSerializer,
     CandidateScreeningRequestSerializer,
     CandidateRankingRequestSerializer,
+    CandidateRecommendationRequestSerializer,
+    ApplicationScreeningRequestSerializer,
     ResumeSummaryRequestSerializer,
     SpamDetectionRequestSerializer,
     ModerationRequestSerializer,
@@ -74,9 +77,12 @@ class ConversationViewSet(viewsets.ModelViewSet):
         ai_client = get_ai_client()
 
         try:
+            # Recorded in AIAnalytics by the client, with estimated and actual tokens
             response = ai_client.generate_response(
                 messages=formatted_messages,
-                system_prompt=get_system_prompt(request.user.role)
+                system_prompt=get_system_prompt(request.user.role),
+                task='chat',
+                user=request.user
             )
 
             assistant_content = response.get('content', '')
@@ -90,17 +96,6 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 metadata={'usage': usage}
             )
 
-            # Track analytics
-            response_time = int((timezone.now() - start_time).total_seconds() * 1000)
-            AIAnalytics.objects.create(
-                user=request.user,
-                action_type='chat',
-                input_tokens=usage.get('input_tokens', 0),
-                output_tokens=usage.get('output_tokens', 0),
-                response_time_ms=response_time,
-                success=True
-            )
-
             return Response({
                 'message': assistant_content,
                 'conversation_id': conversation.id,
@@ -190,16 +185,6 @@ class CandidateAIViewSet(viewsets.ViewSet):
 
             result = handler.analyze_resume(resume_text)
 
-            # Track analytics
-            AIAnalytics.objects.create(
-                user=request.user,
-                action_type='resume_analysis',
-                input_tokens=result.get('usage', {}).get('input_tokens', 0),
-                output_tokens=result.get('usage', {}).get('output_tokens', 0),
-                response_time_ms=result.get('response_time_ms', 0),
-                success=True
-            )
-
             return Response(result)
 
         except Exception as e:
@@ -306,6 +291,25 @@ class CandidateAIViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['get'])
+    def recommended_jobs(self, request):
+        """Jobs closest to the candidate's profile (local embeddings, no LLM call)"""
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), 50)
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+        handler = CandidateHandler(request.user)
+
+        try:
+            return Response({'recommendations': handler.recommend_jobs(limit=limit)})
+
+        except Exception as e:
+            return Response(
+                {'error': 'Failed to recommend jobs', 'detail': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @action(detail=False, methods=['get'])
     def application_status(self, request):
         """Get application status information"""
@@ -411,6 +415,28 @@ class RecruiterAIViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['post'])
+    def screen_applications(self, request):
+        """Rank all applications of a job locally and LLM-screen only the top ones"""
+        serializer = ApplicationScreeningRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        handler = RecruiterHandler(request.user)
+
+        try:
+            result = handler.screen_applications(
+                serializer.validated_data['job_id'],
+                top_n=serializer.validated_data['top_n']
+            )
+            return Response({'screened_applications': result})
+
+        except Exception as e:
+            return Response(
+                {'error': 'Failed to screen applications', 'detail': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @action(detail=False, methods=['post'])
     def rank_candidates(self, request):
         """Rank candidates for a job"""
@@ -430,6 +456,28 @@ class RecruiterAIViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['post'])
+    def recommended_candidates(self, request):
+        """Candidate profiles closest to a job (local embeddings, no LLM call)"""
+        serializer = CandidateRecommendationRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        handler = RecruiterHandler(request.user)
+
+        try:
+            result = handler.recommend_candidates(
+                serializer.validated_data['job_id'],
+                limit=serializer.validated_data['limit']
+            )
+            return Response({'recommended_candidates': result})
+
+        except Exception as e:
+            return Response(
+                {'error': 'Failed to recommend candidates', 'detail': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @action(detail=False, methods=['post'])
     def summarize_resume(self, request):
         """Summarize a candidate's resume"""
@@ -453,11 +501,15 @@ class RecruiterAIViewSet(viewsets.ViewSet):
     def hiring_insights(self, request):
         """Get hiring insights"""
         job_id = request.query_params.get('job_id')
+        per_job = request.query_params.get('per_job', 'false').lower() == 'true'
 
         handler = RecruiterHandler(request.user)
 
         try:
-            result = handler.get_hiring_insights(job_id=int(job_id) if job_id else None)
+            result = handler.get_hiring_insights(
+                job_id=int(job_id) if job_id else None,
+                per_job=per_job
+            )
             return Response(result)
 
         except Exception as e:
@@ -514,14 +566,38 @@ class AdminAIViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=['get'])
     def suspicious_activities(self, request):
-        """Get suspicious user activities"""
-        threshold = int(request.query_params.get('threshold', 10))
+        """
+        Get suspicious user activities
+
+        Pass the previous response's polled_at as ``since`` to only receive
+        users with new activity since the last poll.
+        """
+        threshold = request.query_params.get('threshold')
+        since = request.query_params.get('since')
+
+        if since:
+            try:
+                since = parse_datetime(since)
+            except ValueError:  # Well-formed but impossible, e.g. 2026-02-30T10:00
+                since = None
+            if since is None:
+                return Response(
+                    {'error': 'since must be an ISO 8601 datetime'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
 
         handler = AdminHandler(request.user)
+        polled_at = timezone.now()
 
         try:
-            result = handler.get_suspicious_activities(threshold=threshold)
-            return Response({'activities': result})
+            result = handler.get_suspicious_activities(
+                threshold=int(threshold) if threshold else None,
+                since=since,
+                now=polled_at
+            )
+            return Response({'activities': result, 'polled_at': polled_at.isoformat()})
 
         except Exception as e:
             return Response(
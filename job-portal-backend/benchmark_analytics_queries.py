@@ -0,0 +1,52 @@
+import os
+import time
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from ai_assistant.handlers.admin_handler import AdminHandler
+from ai_assistant.handlers.recruiter_handler import RecruiterHandler
+
+# Counts the SQL queries issued by the analytics/insights methods.
+# Each method should stay at a fixed number of queries no matter how many
+# users, jobs or applications are in the database.
+
+
+def measure(label, func):
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        func()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{label:<45} {len(ctx.captured_queries):>3} queries  {elapsed_ms:8.2f} ms")
+
+
+print("\n" + "="*80)
+print("ANALYTICS QUERY-COUNT BENCHMARK")
+print("="*80 + "\n")
+
+admin = User.objects.filter(is_staff=True).first() or User.objects.first()
+if not admin:
+    print("[ERROR] No users found in database")
+    exit(1)
+
+admin_handler = AdminHandler(admin)
+measure("AdminHandler.get_platform_analytics", lambda: admin_handler.get_platform_analytics(days=30))
+
+recruiter = User.objects.filter(role='recruiter').first()
+if recruiter:
+    recruiter_handler = RecruiterHandler(recruiter)
+    job = recruiter.jobs_posted.first()
+    measure("RecruiterHandler.get_hiring_insights()", lambda: recruiter_handler.get_hiring_insights())
+    measure("RecruiterHandler.get_hiring_insights(per_job)", lambda: recruiter_handler.get_hiring_insights(per_job=True))
+    if job:
+        measure(f"RecruiterHandler.get_hiring_insights({job.id})", lambda: recruiter_handler.get_hiring_insights(job_id=job.id))
+    print(f"\nRecruiter {recruiter.email} has {recruiter.jobs_posted.count()} jobs")
+else:
+    print("[WARNING] No recruiter found, skipping hiring insights")
+
+print("\n" + "="*80 + "\n")
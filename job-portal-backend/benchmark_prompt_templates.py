@@ -0,0 +1,50 @@
+import timeit
+
+from ai_assistant.utils.prompt_templates import PROMPT_TEMPLATES, get_analysis_prompt
+
+# Per-call overhead of building an analysis prompt.
+# "render all" is what get_analysis_prompt used to do on every call (format
+# every template, then pick one); a call now renders only the requested
+# template, and repeated contexts are served from the per-template memo.
+
+CALLS = 100_000
+
+context = {
+    'job_title': 'Senior Python Developer',
+    'required_skills': 'Python, Django, PostgreSQL, Redis, Docker',
+    'job_description': 'Build and run the APIs behind our hiring platform. ' * 20,
+    'position': 'Senior Python Developer',
+    'company': 'Tech Corp',
+    'requirements': '5+ years of Python',
+    'role': 'Backend Engineer',
+    'skills': 'Python, Django',
+}
+
+
+def measure(label, func, calls=CALLS):
+    seconds = timeit.timeit(func, number=calls)
+    print(f"{label:<45} {seconds / calls * 1e6:8.2f} us/call")
+
+
+print("\n" + "="*80)
+print("PROMPT TEMPLATE RENDERING BENCHMARK")
+print("="*80 + "\n")
+
+def format_uncached(template):
+    if template.defaults is None:
+        return template.text
+    return template.text.format_map({field: context.get(field, default) for field, default in template.defaults.items()})
+
+
+measure("format every template (previous behaviour)",
+        lambda: {name: format_uncached(template) for name, template in PROMPT_TEMPLATES.items()}['job_match'])
+
+for name, template in PROMPT_TEMPLATES.items():
+    measure(f"get_analysis_prompt('{name}')", lambda name=name: get_analysis_prompt(name, context))
+
+counter = iter(range(10**9))
+measure("job_match, new context every call (no memo)",
+        lambda: get_analysis_prompt('job_match', {**context, 'job_title': f'Job {next(counter)}'}))
+
+print(f"\n{len(PROMPT_TEMPLATES)} templates: " + ", ".join(template.tag for template in PROMPT_TEMPLATES.values()))
+print("\n" + "="*80 + "\n")
@@ -139,6 +139,54 @@ EMAIL_FROM_NAME = os.getenv('EMAIL_FROM_NAME', 'TalentBridge AI')
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:5173')
 RESEND_API_KEY = os.getenv('RESEND_API_KEY', '')
 
+# ✅ Email outbox (drained by `python manage.py send_pending_emails --loop`)
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.getenv('EMAIL_OUTBOX_BACKOFF_SECONDS', 60))  # Doubles on every retry
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', 300))  # How long a claimed row stays hidden
+EMAIL_DELIVERY_BACKEND = os.getenv('EMAIL_DELIVERY_BACKEND', 'resend')  # 'resend' (batch API) or 'smtp'
+# High-frequency notification types rolled into one digest email per recipient and window
+EMAIL_DIGEST_MINUTES = {
+    'new_application': int(os.getenv('NEW_APPLICATION_DIGEST_MINUTES', 30)),
+}
+
+# ✅ Job view counter (views are buffered per worker and written as one UPDATE per flush)
+JOB_VIEW_FLUSH_SECONDS = int(os.getenv('JOB_VIEW_FLUSH_SECONDS', 10))  # Longest a view is buffered; 0 writes straight through
+JOB_VIEW_FLUSH_THRESHOLD = int(os.getenv('JOB_VIEW_FLUSH_THRESHOLD', 1000))  # Flush early after this many views
+
+# ✅ Job bitmap index (per-worker in-memory filters for the candidate job board)
+JOB_BITMAP_INDEX = os.getenv('JOB_BITMAP_INDEX', 'False') == 'True'
+
+# ✅ Interview reminders (`python manage.py send_interview_reminders`)
+INTERVIEW_REMINDER_HOURS = int(os.getenv('INTERVIEW_REMINDER_HOURS', 24))  # Remind this long before the interview
+
+# ✅ Notification retention (`python manage.py archive_notifications`)
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', 90))  # Read notifications kept hot
+
+# ✅ Notification stream (server-sent events at /api/notifications/stream/, needs the ASGI server and REDIS_URL)
+NOTIFICATION_STREAM_POLL_SECONDS = float(os.getenv('NOTIFICATION_STREAM_POLL_SECONDS', 2))  # Cache check interval
+NOTIFICATION_STREAM_MAX_SECONDS = int(os.getenv('NOTIFICATION_STREAM_MAX_SECONDS', 300))  # Client reconnects after this
+
+# ✅ Cache
+# Shared counters (e.g. real-time abuse detection) must be visible to every worker.
+# Set REDIS_URL in production; without it each process keeps its own in-memory cache.
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+# Cache-held counters and versions are trusted only when every process shares the cache;
+# otherwise they are read from the database and the notification stream is disabled.
+SHARED_CACHE = bool(REDIS_URL)
+
 # ✅ Logging
 LOGGING = {
     'version': 1,
@@ -5,8 +5,11 @@ import multiprocessing
 bind = "0.0.0.0:10000"
 
 # Worker configuration
+# Uvicorn workers serve config.asgi:application, so the notification stream
+# (server-sent events, enabled with REDIS_URL) can hold many idle connections
+# per worker; the rest of the API runs as before
 workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+worker_class = "uvicorn.workers.UvicornWorker"
 
 # Timeout configuration - IMPORTANT for AI API calls
 # Default is 30s, but AI responses can take 60-90s
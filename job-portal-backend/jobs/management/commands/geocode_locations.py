@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from accounts.models import CandidateProfile
+from jobs.models import Job
+from jobs.utils.geo import GEO_FIELDS, geocode_instance
+from jobs.utils.job_facets import job_facets
+
+
+class Command(BaseCommand):
+    help = 'Geocode Job and CandidateProfile locations against the bundled gazetteer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows updated per query')
+        parser.add_argument('--missing', action='store_true', help='Only rows not matched to a place yet')
+
+    def handle(self, *args, **options):
+        jobs = self.geocode(Job, options['batch_size'], options['missing'])
+        profiles = self.geocode(CandidateProfile, options['batch_size'], options['missing'])
+        if jobs:
+            # bulk_update skips the Job signals. The jobs version already moved with
+            # updated_at; the shared-cache counter (if any) is bumped here as well.
+            # A per-process cache cannot be invalidated from this command.
+            job_facets.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {jobs} jobs and {profiles} candidate profiles updated"
+        ))
+
+    @staticmethod
+    def geocode(model, batch_size, missing):
+        """
+        Walk the table in primary key order and write back changed rows only
+
+        Changed rows get a fresh updated_at, so web workers without a shared
+        cache see the Job table version move and rebuild facets and indexes.
+        """
+        queryset = model.objects.order_by('pk').only('pk', 'location', *GEO_FIELDS)
+        if missing:
+            queryset = queryset.filter(location_normalized='')
+
+        updated, after = 0, None
+        while True:
+            batch = queryset.filter(pk__gt=after) if after is not None else queryset
+            rows = list(batch[:batch_size])
+            if not rows:
+                return updated
+
+            changed = []
+            for row in rows:
+                before = tuple(getattr(row, field) for field in GEO_FIELDS)
+                geocode_instance(row)
+                if tuple(getattr(row, field) for field in GEO_FIELDS) != before:
+                    changed.append(row)
+            now = timezone.now()
+            for row in changed:
+                row.updated_at = now
+            model.objects.bulk_update(changed, [*GEO_FIELDS, 'updated_at'])
+            updated += len(changed)
+            after = rows[-1].pk
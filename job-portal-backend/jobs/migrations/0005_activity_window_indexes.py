@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0004_interview"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["applied_at", "candidate"],
+                name="jobs_applic_applied_361a91_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["created_at", "recruiter"], name="jobs_job_created_9190fe_idx"
+            ),
+        ),
+    ]
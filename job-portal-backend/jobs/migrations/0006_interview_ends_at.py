@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:23
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_ends_at(apps, schema_editor):
+    Interview = apps.get_model("jobs", "Interview")
+    batch = []
+    for interview in Interview.objects.only("id", "scheduled_datetime", "duration_minutes").iterator():
+        interview.ends_at = interview.scheduled_datetime + timedelta(minutes=interview.duration_minutes)
+        batch.append(interview)
+        if len(batch) >= 1000:
+            Interview.objects.bulk_update(batch, ["ends_at"])
+            batch = []
+    Interview.objects.bulk_update(batch, ["ends_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_activity_window_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interview",
+            name="ends_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="interview",
+            index=models.Index(
+                fields=["ends_at", "scheduled_datetime"],
+                name="jobs_interv_ends_at_c2f6bd_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_ends_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0006_interview_ends_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="latitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="location_normalized",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=100
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="longitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="jobs_job_latitud_d115f8_idx"
+            ),
+        ),
+    ]
@@ -1,5 +1,8 @@
+from datetime import timedelta
 from django.db import models
 from django.conf import settings
+from .utils.change_tracking import ChangeTrackingMixin
+from .utils.geo import GEO_FIELDS, geocode_instance
 
 
 class Job(models.Model):
@@ -29,6 +32,11 @@ class Job(models.Model):
     job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES)
     location = models.CharField(max_length=200)
     is_remote = models.BooleanField(default=False)
+
+    # Geocoded from location on save (see jobs/utils/geo.py)
+    location_normalized = models.CharField(max_length=100, blank=True, db_index=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
@@ -60,13 +68,23 @@ class Job(models.Model):
         indexes = [
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['job_type']),
+            models.Index(fields=['created_at', 'recruiter']),  # Activity windows
+            models.Index(fields=['latitude', 'longitude']),  # Radius search bounding box
         ]
 
     def __str__(self):
         return f"{self.title} at {self.company_name}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'location' in update_fields:
+            geocode_instance(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(GEO_FIELDS)
+        super().save(*args, **kwargs)
+
 
-class Application(models.Model):
+class Application(ChangeTrackingMixin, models.Model):
     """Job Application model"""
 
     STATUS_CHOICES = [
@@ -81,6 +99,9 @@ class Application(models.Model):
         ('accepted', 'Accepted'),
     ]
 
+    # Compared in memory by the notification signals (see ChangeTrackingMixin)
+    tracked_fields = ('status',)
+
     # Relations
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     candidate = models.ForeignKey(
@@ -119,6 +140,7 @@ class Application(models.Model):
         indexes = [
             models.Index(fields=['status', '-applied_at']),
             models.Index(fields=['candidate', '-applied_at']),
+            models.Index(fields=['applied_at', 'candidate']),  # Activity windows
         ]
 
     def __str__(self):
@@ -156,7 +178,7 @@ class SavedJob(models.Model):
         return f"{self.user.email} saved {self.job.title}"
 
 
-class Interview(models.Model):
+class Interview(ChangeTrackingMixin, models.Model):
     """Interview scheduling for job applications"""
 
     INTERVIEW_TYPE_CHOICES = [
@@ -172,6 +194,8 @@ class Interview(models.Model):
         ('rescheduled', 'Rescheduled'),
     ]
 
+    tracked_fields = ('status',)
+
     application = models.ForeignKey(
         Application,
         on_delete=models.CASCADE,
@@ -202,6 +226,8 @@ class Interview(models.Model):
         help_text="Additional notes or instructions for the candidate"
     )
     reminder_sent = models.BooleanField(default=False)
+    # scheduled_datetime + duration_minutes, kept by save() for overlap queries
+    ends_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -210,11 +236,19 @@ class Interview(models.Model):
         indexes = [
             models.Index(fields=['scheduled_datetime', 'status']),
             models.Index(fields=['application', 'status']),
+            models.Index(fields=['ends_at', 'scheduled_datetime']),  # Interval overlap
         ]
 
     def __str__(self):
         return f"Interview for {self.application.candidate.email} - {self.application.job.title} on {self.scheduled_datetime}"
 
+    def save(self, *args, **kwargs):
+        self.ends_at = self.scheduled_datetime + timedelta(minutes=self.duration_minutes)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'scheduled_datetime', 'duration_minutes'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'ends_at'}
+        super().save(*args, **kwargs)
+
     @property
     def recruiter(self):
         """Get the recruiter who posted the job"""
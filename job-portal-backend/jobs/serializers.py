@@ -13,8 +13,8 @@ class JobSerializer(serializers.ModelSerializer):
         model = Job
         fields = [
             'id', 'title', 'company_name', 'description', 'requirements',
-            'responsibilities', 'job_type', 'location', 'is_remote',
-            'salary_min', 'salary_max', 'required_skills', 'status',
+            'responsibilities', 'job_type', 'location', 'location_normalized',
+            'latitude', 'longitude', 'is_remote', 'salary_min', 'salary_max', 'required_skills', 'status',
             'views_count', 'deadline', 'created_at', 'updated_at',
             'recruiter', 'recruiter_email', 'applications_count', 'is_saved'
         ]
@@ -36,13 +36,14 @@ class JobListSerializer(serializers.ModelSerializer):
     recruiter_email = serializers.EmailField(source='recruiter.email', read_only=True)
     applications_count = serializers.SerializerMethodField()
     is_saved = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = Job
         fields = [
-            'id', 'title', 'company_name', 'job_type', 'location',
+            'id', 'title', 'company_name', 'job_type', 'location', 'location_normalized',
             'is_remote', 'salary_min', 'salary_max', 'status',
-            'created_at', 'recruiter_email', 'applications_count', 'is_saved'
+            'created_at', 'recruiter_email', 'applications_count', 'is_saved', 'distance_km'
         ]
 
     def get_applications_count(self, obj):
@@ -55,6 +56,11 @@ class JobListSerializer(serializers.ModelSerializer):
             return SavedJob.objects.filter(user=request.user, job=obj).exists()
         return False
 
+    def get_distance_km(self, obj):
+        """Distance from the search centre, only present on radius searches"""
+        distance = getattr(obj, 'distance_km', None)
+        return round(distance, 1) if distance is not None else None
+
 
 class ApplicationSerializer(serializers.ModelSerializer):
     """Serializer for Application model"""
@@ -207,12 +213,12 @@ class InterviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Interview
         fields = [
-            'id', 'application', 'scheduled_datetime', 'duration_minutes',
+            'id', 'application', 'scheduled_datetime', 'duration_minutes', 'ends_at',
             'interview_type', 'location', 'status', 'notes', 'reminder_sent',
             'candidate_email', 'candidate_name', 'job_title', 'company_name',
             'recruiter_email', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'reminder_sent', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'reminder_sent', 'ends_at', 'created_at', 'updated_at']
 
     def get_candidate_name(self, obj):
         """Get candidate's full name"""
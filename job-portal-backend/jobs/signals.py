@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from accounts.models import CandidateProfile
+from .models import Job
+from .utils.geo import GEO_FIELDS, geocode_instance
+from .utils.job_facets import job_facets
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_facets(sender, instance, **kwargs):
+    """Drop cached filter facets and bitmap indexes once the job change is committed"""
+    transaction.on_commit(job_facets.invalidate)
+
+
+@receiver(pre_save, sender=CandidateProfile)
+def geocode_candidate_profile(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Geocode the profile location, keeping the gazetteer out of the accounts app"""
+    if raw or (update_fields is not None and 'location' not in update_fields):
+        return
+    geocode_instance(instance)
+    if update_fields is not None:
+        # A receiver cannot widen update_fields, so the derived fields are written here
+        sender.objects.filter(pk=instance.pk).update(**{field: getattr(instance, field) for field in GEO_FIELDS})
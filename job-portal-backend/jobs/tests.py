@@ -0,0 +1,419 @@
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import CandidateProfile, User
+from notifications.models import Notification
+from .models import Application, Interview, Job
+from .utils.geo import geocode
+from .utils.job_facets import SALARY_BUCKETS, job_facets
+from .utils.job_filters import location_q, salary_q
+from .utils.interview_scheduling import interview_scheduler
+from .utils.job_index import IndexSnapshot, JobBitmapIndex
+from .utils.view_counter import JobViewCounter
+
+
+def make_job(recruiter, **fields):
+    defaults = {
+        'title': 'Python Developer',
+        'company_name': 'Acme',
+        'description': 'Build APIs',
+        'requirements': 'Python',
+        'responsibilities': 'Ship features',
+        'job_type': 'full_time',
+        'location': 'Bangalore',
+        'required_skills': 'python, django',
+        'status': 'published',
+    }
+    defaults.update(fields)
+    return Job.objects.create(recruiter=recruiter, **defaults)
+
+
+class GeocodeTests(SimpleTestCase):
+
+    def assertPlace(self, location, name):
+        place = geocode(location)
+        self.assertEqual(place and place.name, name, location)
+
+    def test_short_aliases_only_match_a_whole_part(self):
+        self.assertPlace('LA', 'Los Angeles')
+        self.assertPlace('Remote / SF', 'San Francisco')
+        self.assertPlace('KL, Malaysia', 'Kuala Lumpur')
+        self.assertPlace('La Jolla', None)
+        self.assertPlace('DC Ranch, Scottsdale', None)
+        self.assertPlace('Sf Express office', None)
+
+    def test_region_in_another_part_must_agree(self):
+        self.assertPlace('London, UK', 'London')
+        self.assertPlace('Bengaluru, KA', 'Bengaluru')
+        self.assertPlace('Toronto, CA', 'Toronto')
+        self.assertPlace('London, Ontario', None)
+        self.assertPlace('Vancouver, WA', None)
+        self.assertPlace('New Orleans, LA', None)
+
+    def test_places_in_other_countries_are_a_list(self):
+        self.assertPlace('London / Singapore', 'London')
+
+
+class CandidateProfileGeocodeTests(TestCase):
+
+    def test_profile_is_geocoded_on_save(self):
+        user = User.objects.create_user('cand@example.com', 'pw', role='candidate')
+        profile = CandidateProfile.objects.create(user=user, location='Bombay')
+        self.assertEqual(profile.location_normalized, 'Mumbai')
+
+        profile.location = 'Gurgaon'
+        profile.save(update_fields=['location'])
+        profile.refresh_from_db()
+        self.assertEqual((profile.location_normalized, profile.latitude), ('Gurugram', 28.4595))
+
+
+class LocationFilterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+        cls.multi_city = make_job(recruiter, location='Mumbai, Pune, Bangalore')
+        cls.alias = make_job(recruiter, location='Bengaluru, KA')
+        cls.elsewhere = make_job(recruiter, location='Delhi')
+
+    def test_gazetteer_place_matches_alias_and_any_listed_city(self):
+        self.assertEqual(self.multi_city.location_normalized, 'Mumbai')
+        found = set(Job.objects.filter(location_q('Bangalore')).values_list('id', flat=True))
+        self.assertEqual(found, {self.multi_city.id, self.alias.id})
+
+    def test_unknown_place_is_a_substring_match(self):
+        found = set(Job.objects.filter(location_q('pune')).values_list('id', flat=True))
+        self.assertEqual(found, {self.multi_city.id})
+
+    def test_bitmap_index_matches_orm(self):
+        snapshot = IndexSnapshot(version=None)
+        for location in ('Bangalore', 'Pune', 'Delhi', 'Nowhere'):
+            with self.subTest(location=location):
+                indexed = set(snapshot.page(snapshot.search({'location': location})))
+                expected = set(Job.objects.filter(location_q(location)).values_list('id', flat=True))
+                self.assertEqual(indexed, expected)
+
+
+class JobFilterParamTests(TestCase):
+    url = '/api/jobs/jobs/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.candidate = User.objects.create_user('cand@example.com', 'pw', role='candidate')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.candidate)
+
+    def test_malformed_numbers_are_a_400_naming_the_parameter(self):
+        for param, query in (
+            ('salary_min', {'salary_min': 'abc'}),
+            ('experience_max', {'experience_max': '2.5'}),
+            ('lat', {'lat': 'north', 'lng': '77.5'}),
+            ('lng', {'lat': '12.9', 'lng': 'inf'}),
+            ('lat', {'lat': '95', 'lng': '77.5'}),
+            ('radius_km', {'near': 'Pune', 'radius_km': '10km'}),
+            ('radius_km', {'near': 'Pune', 'radius_km': '-5'}),
+        ):
+            with self.subTest(query=query):
+                response = self.client.get(self.url, query)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(param, response.data)
+
+
+class JobFacetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+        make_job(cls.recruiter, salary_min=30000, salary_max=40000, required_experience=3)
+        make_job(cls.recruiter, location='Delhi', job_type='internship',
+                 salary_min=10000, salary_max=20000, required_experience=0)
+        make_job(cls.recruiter, company_name='Globex')
+        make_job(cls.recruiter, company_name='Globex', location='Delhi', job_type='contract', status='draft')
+
+    def setUp(self):
+        cache.clear()
+        job_facets.invalidate()
+
+    def test_counts_per_facet_and_bucket(self):
+        facets = job_facets.compute(Job.objects.filter(status='published'))
+        self.assertEqual(facets['total'], 3)
+        self.assertEqual(facets['company'], [{'value': 'Acme', 'count': 2}, {'value': 'Globex', 'count': 1}])
+        self.assertEqual(facets['location'], [{'value': 'Bangalore', 'count': 2}, {'value': 'Delhi', 'count': 1}])
+        self.assertEqual(facets['job_type'], [{'value': 'full_time', 'count': 2}, {'value': 'internship', 'count': 1}])
+        # Open-ended salaries and unknown experience count in every bucket, as in the list filters
+        self.assertEqual([bucket['count'] for bucket in facets['salary']], [2, 2, 1, 1])
+        self.assertEqual([bucket['count'] for bucket in facets['experience']], [2, 2, 1, 1])
+        self.assertEqual(facets['ranges'], {'salary_min': 10000, 'salary_max': 40000, 'experience_max': 3})
+
+    def test_bucket_counts_match_list_filters(self):
+        facets = job_facets.compute(Job.objects.filter(status='published'))
+        for (key, low, high), bucket in zip(SALARY_BUCKETS, facets['salary']):
+            with self.subTest(bucket=key):
+                self.assertEqual(bucket['count'], Job.objects.filter(salary_q(low, high), status='published').count())
+
+    def test_cached_facets_follow_job_changes_without_shared_cache(self):
+        self.assertEqual(job_facets.published_facets()['total'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            job = make_job(self.recruiter, company_name='Initech')
+        self.assertEqual(job_facets.published_facets()['total'], 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            job.delete()
+        self.assertEqual(job_facets.published_facets()['total'], 3)
+
+    def test_table_version_is_reused_between_requests(self):
+        version = job_facets.get_version()
+        with self.assertNumQueries(0):
+            self.assertEqual(job_facets.get_version(), version)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_cached_facets_follow_job_changes_with_shared_cache(self):
+        self.assertEqual(job_facets.published_facets()['total'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            job = make_job(self.recruiter, company_name='Initech')
+        self.assertEqual(job_facets.published_facets()['total'], 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            job.status = 'closed'
+            job.save()
+        self.assertEqual(job_facets.published_facets()['total'], 3)
+
+
+class JobBitmapIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+        make_job(cls.recruiter)
+
+    def setUp(self):
+        cache.clear()
+        job_facets.invalidate()
+
+    @mock.patch('jobs.utils.job_facets.TABLE_VERSION_SECONDS', 0)
+    def test_snapshot_is_rebuilt_when_another_process_changes_jobs(self):
+        index = JobBitmapIndex()
+        snapshot = index.snapshot()
+        self.assertIs(index.snapshot(), snapshot)
+
+        # Like a write from another process: no signal reaches this one
+        Job.objects.bulk_create([Job(
+            recruiter=self.recruiter, title='Go Developer', company_name='Acme', description='-',
+            requirements='-', responsibilities='-', job_type='contract', location='Delhi',
+            required_skills='go', status='published'
+        )])
+        rebuilt = index.snapshot()
+        self.assertIsNot(rebuilt, snapshot)
+        self.assertEqual(len(rebuilt.ids), 2)
+
+
+class JobViewCounterTests(TransactionTestCase):
+
+    def setUp(self):
+        recruiter = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+        self.job = make_job(recruiter)
+        self.counter = JobViewCounter()
+        self.addCleanup(self.counter.flush)
+
+    def views(self):
+        self.job.refresh_from_db(fields=['views_count'])
+        return self.job.views_count
+
+    @override_settings(JOB_VIEW_FLUSH_SECONDS=0)
+    def test_writes_straight_through_without_buffering(self):
+        self.assertEqual(self.counter.record(self.job.id), 0)
+        self.assertEqual(self.views(), 1)
+
+    @override_settings(JOB_VIEW_FLUSH_SECONDS=60, JOB_VIEW_FLUSH_THRESHOLD=3)
+    def test_buffer_is_written_as_one_update_at_the_threshold(self):
+        self.assertEqual(self.counter.record(self.job.id), 1)
+        self.assertEqual(self.counter.record(self.job.id), 2)
+        self.assertEqual(self.views(), 0)
+        self.assertEqual(self.counter.record(self.job.id), 0)
+        self.assertEqual(self.views(), 3)
+
+    @override_settings(JOB_VIEW_FLUSH_SECONDS=0.1)
+    def test_idle_buffer_is_flushed_by_the_timer(self):
+        self.counter.record(self.job.id)
+        self.counter.record(self.job.id)
+        timer = self.counter._timer
+        timer.join(5)
+        self.assertFalse(timer.is_alive())
+        self.assertEqual(self.counter.pending(self.job.id), 0)
+        self.assertEqual(self.views(), 2)
+
+
+class BulkUpdateStatusTests(TestCase):
+
+    url = '/api/jobs/applications/bulk_update_status/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+        cls.other_recruiter = User.objects.create_user('other@example.com', 'pw', role='recruiter')
+        job = make_job(cls.recruiter)
+        other_job = make_job(cls.other_recruiter)
+        cls.candidates = [
+            User.objects.create_user(f'cand{i}@example.com', 'pw', role='candidate') for i in range(3)
+        ]
+        cls.applications = [
+            Application.objects.create(job=job, candidate=candidate, resume_text='-')
+            for candidate in cls.candidates
+        ]
+        cls.applications[2].status = 'shortlisted'
+        cls.applications[2].save()
+        cls.foreign = Application.objects.create(job=other_job, candidate=cls.candidates[0], resume_text='-')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+
+    def status_notifications(self):
+        return Notification.objects.filter(notification_type='application_status_changed')
+
+    def test_moves_the_batch_and_notifies_changed_candidates(self):
+        before = self.status_notifications().count()
+        response = self.client.post(self.url, {
+            'status': 'shortlisted',
+            'application_ids': [application.id for application in self.applications]
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'status': 'shortlisted', 'updated': 2, 'unchanged': 1})
+        self.assertEqual(
+            Application.objects.filter(id__in=[a.id for a in self.applications], status='shortlisted').count(), 3
+        )
+        self.assertEqual(self.status_notifications().count() - before, 2)
+
+    def test_any_foreign_application_rejects_the_whole_batch(self):
+        before = self.status_notifications().count()
+        ids = [self.applications[0].id, self.foreign.id]
+        response = self.client.post(self.url, {'status': 'rejected', 'application_ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['application_ids'], [self.foreign.id])
+        self.assertFalse(Application.objects.filter(id__in=ids, status='rejected').exists())
+        self.assertEqual(self.status_notifications().count(), before)
+
+    def test_only_recruiters_may_update(self):
+        self.client.force_authenticate(self.candidates[0])
+        response = self.client.post(self.url, {
+            'status': 'rejected', 'application_ids': [self.applications[0].id]
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid_requests_are_rejected(self):
+        for payload in (
+            {'status': 'hired', 'application_ids': [self.applications[0].id]},
+            {'status': 'rejected', 'application_ids': []},
+            {'status': 'rejected', 'application_ids': ['1']},
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.client.post(self.url, payload, format='json').status_code, 400)
+
+
+class InterviewSchedulingTests(TestCase):
+
+    url = '/api/jobs/interviews/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+        other_recruiter = User.objects.create_user('other@example.com', 'pw', role='recruiter')
+        candidate = User.objects.create_user('cand@example.com', 'pw', role='candidate')
+        cls.application = Application.objects.create(job=make_job(cls.recruiter), candidate=candidate, resume_text='-')
+        cls.second_application = Application.objects.create(
+            job=make_job(cls.recruiter), candidate=User.objects.create_user('c2@example.com', 'pw', role='candidate'),
+            resume_text='-'
+        )
+        cls.foreign_application = Application.objects.create(
+            job=make_job(other_recruiter), candidate=candidate, resume_text='-'
+        )
+        # 09:00 a week from now, in the current time zone
+        cls.day = timezone.localtime(timezone.now() + timedelta(days=7)).replace(
+            hour=9, minute=0, second=0, microsecond=0
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+
+    def at(self, hour, minute=0):
+        return self.day.replace(hour=hour, minute=minute)
+
+    def book(self, application, start, duration=60, **fields):
+        return Interview.objects.create(
+            application=application, scheduled_datetime=start, duration_minutes=duration, **fields
+        )
+
+    def schedule(self, application, start, duration=60):
+        return self.client.post(self.url, {
+            'application': application.id,
+            'scheduled_datetime': start.isoformat(),
+            'duration_minutes': duration,
+        }, format='json')
+
+    def test_overlapping_interview_is_rejected(self):
+        existing = self.book(self.application, self.at(10))
+        response = self.schedule(self.second_application, self.at(10, 30))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f'Interview {existing.id}', response.data['conflicts'][0])
+
+    def test_back_to_back_and_cancelled_interviews_do_not_conflict(self):
+        self.book(self.application, self.at(10))
+        self.book(self.application, self.at(11), status='cancelled')
+        self.assertEqual(self.schedule(self.second_application, self.at(11)).status_code, 201)
+        self.assertEqual(self.schedule(self.second_application, self.at(9)).status_code, 201)
+
+    def test_candidate_calendar_with_another_recruiter_counts(self):
+        self.book(self.foreign_application, self.at(14))
+        self.assertEqual(self.schedule(self.application, self.at(14, 30)).status_code, 400)
+        self.assertEqual(self.schedule(self.second_application, self.at(14, 30)).status_code, 201)
+
+    def test_moving_an_interview_onto_another_is_rejected(self):
+        self.book(self.application, self.at(10))
+        interview = self.book(self.second_application, self.at(12))
+        response = self.client.patch(
+            f'{self.url}{interview.id}/', {'scheduled_datetime': self.at(10, 30).isoformat()}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch(f'{self.url}{interview.id}/', {'duration_minutes': 90}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_available_slots_skip_busy_intervals_and_working_hours(self):
+        self.book(self.application, self.at(9))
+        self.book(self.second_application, self.at(10, 30), duration=30)
+        slots = interview_scheduler.available_slots(
+            self.recruiter, self.at(0), self.at(0) + timedelta(days=2), duration_minutes=60, count=8
+        )
+        starts = [timezone.localtime(start) for start, _ in slots]
+        self.assertEqual(
+            [(start.day, start.hour, start.minute) for start in starts[:3]],
+            [(self.day.day, 11, 0), (self.day.day, 12, 0), (self.day.day, 13, 0)]
+        )
+        # 17:00 is the last hour-long slot of the day; the next one is 09:00 the day after
+        self.assertEqual((starts[6].hour, starts[7].hour), (17, 9))
+        self.assertNotEqual(starts[7].day, self.day.day)
+
+    def test_available_slots_also_avoid_the_candidate(self):
+        self.book(self.foreign_application, self.at(9), duration=120)
+        slots = interview_scheduler.available_slots(
+            self.recruiter, self.at(9), self.at(18), count=1, candidate=self.application.candidate
+        )
+        self.assertEqual(slots, [(self.at(11), self.at(12))])
+
+        response = self.client.get(f'{self.url}available_slots/', {
+            'from': self.at(9).isoformat(), 'to': self.at(18).isoformat(),
+            'count': 1, 'application': self.application.id,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['slots'], [{'start': self.at(11), 'end': self.at(12)}])
+
+    def test_impossible_slot_range_is_a_400(self):
+        for query in ({'from': '2026-02-30T10:00'}, {'to': '2026-01-01T25:00'}):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'{self.url}available_slots/', query).status_code, 400)
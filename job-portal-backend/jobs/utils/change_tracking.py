@@ -0,0 +1,64 @@
+"""
+Field change tracking for models
+
+Original values are captured when an instance is loaded from the database
+(Model.from_db), so "did the status change?" is answered in memory instead
+of re-reading the row in a pre_save signal.
+"""
+
+
+class ChangeTrackingMixin:
+    """
+    Track changes to selected fields since the instance was loaded or last saved
+
+    Usage:
+        class Application(ChangeTrackingMixin, models.Model):
+            tracked_fields = ('status',)
+
+        application.changed_fields        # {'status'}
+        application.original_value('status')
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self, fields=None):
+        # Deferred fields are not in __dict__ and are simply not tracked
+        fields = self.tracked_fields if fields is None else fields
+        snapshot = getattr(self, '_original_values', {})
+        snapshot.update({
+            field: self.__dict__[field]
+            for field in fields
+            if field in self.tracked_fields and field in self.__dict__
+        })
+        self._original_values = snapshot
+
+    @property
+    def changed_fields(self):
+        """Set of tracked fields whose value differs from the loaded one (empty for unsaved instances)"""
+        original_values = getattr(self, '_original_values', {})
+        return {
+            field for field, value in original_values.items()
+            if self.__dict__.get(field, value) != value
+        }
+
+    def has_changed(self, field):
+        return field in self.changed_fields
+
+    def original_value(self, field):
+        """Value of a tracked field as loaded from the database, or None if unknown"""
+        return getattr(self, '_original_values', {}).get(field)
+
+    def save(self, *args, **kwargs):
+        # post_save receivers run inside super().save() and still see the old snapshot
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot_tracked_fields(fields)
@@ -0,0 +1,189 @@
+"""
+Offline geocoding and radius search
+
+Free-text locations ("Bangalore, Karnataka", "Remote / Gurgaon") are matched
+against the gazetteer bundled in jobs/data/gazetteer.csv, so spellings of
+the same city share one canonical name and coordinates. States, provinces
+and countries from jobs/data/regions.csv qualify a match: "London, Ontario"
+is not London, GB. Models with
+location_normalized/latitude/longitude fields (Job, CandidateProfile) are
+searched by radius with a bounding box on the (latitude, longitude) index
+followed by an exact great-circle distance.
+"""
+import csv
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+GAZETTEER_PATH = Path(__file__).resolve().parent.parent / 'data' / 'gazetteer.csv'
+REGIONS_PATH = Path(__file__).resolve().parent.parent / 'data' / 'regions.csv'
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+# Fields filled in by geocode_instance
+GEO_FIELDS = ('location_normalized', 'latitude', 'longitude')
+
+# Longest alias, in words, tried inside a location string
+MAX_ALIAS_WORDS = 4
+
+# Aliases written "=sf" in the gazetteer only match a whole part of the
+# location, never a word inside one ("Sf Express office", "La Jolla")
+WHOLE_PART_MARKER = '='
+
+Place = namedtuple('Place', ['name', 'country', 'latitude', 'longitude'])
+Gazetteer = namedtuple('Gazetteer', ['places', 'part_places', 'regions'])
+
+
+@lru_cache(maxsize=1)
+def gazetteer():
+    """
+    Place and region lookups, loaded once per process
+
+    Returns:
+        Gazetteer of alias -> Place for aliases matched anywhere, alias ->
+        Place for whole-part aliases, and region alias -> set of country codes
+    """
+    places, part_places = {}, {}
+    with open(GAZETTEER_PATH, encoding='utf-8', newline='') as handle:
+        for row in csv.DictReader(handle):
+            place = Place(row['name'], row['country'], float(row['latitude']), float(row['longitude']))
+            for alias in row['aliases'].split('|'):
+                if alias.startswith(WHOLE_PART_MARKER):
+                    part_places[alias[len(WHOLE_PART_MARKER):]] = place
+                else:
+                    places[alias] = place
+            places.setdefault(row['name'].lower(), place)
+
+    # "CA" is California or Canada, so an alias can name several countries
+    regions = {}
+    with open(REGIONS_PATH, encoding='utf-8', newline='') as handle:
+        for row in csv.DictReader(handle):
+            for alias in row['aliases'].split('|'):
+                regions.setdefault(alias, set()).add(row['country'])
+    return Gazetteer(places, part_places, regions)
+
+
+def _clean(text):
+    return ' '.join(re.sub(r'[^\w\s.-]', ' ', text.lower()).split())
+
+
+@lru_cache(maxsize=4096)
+def geocode(location):
+    """
+    Match a free-text location to a gazetteer place
+
+    The whole string is tried first, then each comma/slash separated part,
+    then runs of up to MAX_ALIAS_WORDS words, longest first. A match is
+    dropped when another part names a region of a different country; parts
+    that are places themselves ("London / Singapore") list more locations.
+
+    Returns:
+        Place or None
+    """
+    if not location:
+        return None
+    places, part_places, regions = gazetteer()
+
+    cleaned = _clean(location)
+    if cleaned in places or cleaned in part_places:
+        return places.get(cleaned) or part_places[cleaned]
+
+    parts = [_clean(part) for part in re.split(r'[,/;|()\n]+', location)]
+    matches = [
+        places.get(part) or (
+            # A trailing region code is the region: "New Orleans, LA" is not Los Angeles
+            None if index and part in regions else part_places.get(part)
+        )
+        for index, part in enumerate(parts)
+    ]
+    qualifiers = [regions[part] for part, place in zip(parts, matches) if place is None and part in regions]
+
+    def qualified(place):
+        return all(place.country in countries for countries in qualifiers)
+
+    for place in matches:
+        if place is not None and qualified(place):
+            return place
+
+    for part in parts:
+        words = part.replace(' - ', ' ').split()
+        for size in range(min(MAX_ALIAS_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                place = places.get(' '.join(words[start:start + size]))
+                if place is not None and qualified(place):
+                    return place
+    return None
+
+
+def geocode_instance(instance):
+    """Fill location_normalized, latitude and longitude from instance.location"""
+    place = geocode(instance.location)
+    if place is None:
+        instance.location_normalized = ''
+        instance.latitude = instance.longitude = None
+    else:
+        instance.location_normalized = place.name
+        instance.latitude = place.latitude
+        instance.longitude = place.longitude
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def distance_expression(latitude, longitude):
+    """Haversine distance in km from (latitude, longitude), as a database expression"""
+    lat = math.radians(latitude)
+    delta_lat = Radians(F('latitude')) - Value(lat)
+    delta_lon = Radians(F('longitude')) - Value(math.radians(longitude))
+    a = (
+        Power(Sin(delta_lat / 2), 2) +
+        Value(math.cos(lat)) * Cos(Radians(F('latitude'))) * Power(Sin(delta_lon / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a), output_field=FloatField())
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Latitude/longitude ranges containing the circle
+
+    Returns:
+        (min_lat, max_lat, min_lon, max_lon); the longitude bounds are None
+        when the box would wrap the antimeridian or cover a pole
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    cos_lat = math.cos(math.radians(latitude))
+    if min_lat <= -90 or max_lat >= 90 or cos_lat < 1e-6:
+        return min_lat, max_lat, None, None
+
+    delta_lon = radius_km / (KM_PER_DEGREE * cos_lat)
+    if longitude - delta_lon < -180 or longitude + delta_lon > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, longitude - delta_lon, longitude + delta_lon
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Rows within radius_km of a point, nearest first, annotated with distance_km
+
+    The bounding box is answered by the (latitude, longitude) index; only the
+    rows inside it have their exact distance computed.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    queryset = queryset.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+    if min_lon is not None:
+        queryset = queryset.filter(longitude__gte=min_lon, longitude__lte=max_lon)
+    return (
+        queryset.annotate(distance_km=distance_expression(latitude, longitude))
+        .filter(distance_km__lte=radius_km)
+        .order_by('distance_km')
+    )
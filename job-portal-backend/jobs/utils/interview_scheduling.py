@@ -0,0 +1,130 @@
+"""
+Interview calendar queries
+
+Interviews are intervals [scheduled_datetime, ends_at). Two intervals overlap
+when each starts before the other ends, which the (ends_at,
+scheduled_datetime) index answers with a range scan instead of reading a
+recruiter's whole calendar.
+"""
+from datetime import timedelta
+from django.db.models import Q
+from django.utils import timezone
+from ..models import Interview
+
+# Interviews in these states occupy their slot
+BUSY_STATUSES = ('scheduled', 'rescheduled')
+
+
+class InterviewScheduler:
+    """Conflict checks and free-slot search over interview intervals"""
+
+    @staticmethod
+    def busy(start, end, recruiter=None, candidate=None, exclude_id=None):
+        """
+        Interviews overlapping [start, end) for a recruiter and/or candidate
+
+        Args:
+            start, end: Interval to check
+            recruiter: Only interviews for this recruiter's jobs
+            candidate: Only interviews of this candidate
+            exclude_id: Interview to ignore (the one being edited)
+        """
+        people = Q()
+        if recruiter is not None:
+            people |= Q(application__job__recruiter=recruiter)
+        if candidate is not None:
+            people |= Q(application__candidate=candidate)
+
+        queryset = Interview.objects.filter(
+            people,
+            ends_at__gt=start,
+            scheduled_datetime__lt=end,
+            status__in=BUSY_STATUSES
+        )
+        if exclude_id is not None:
+            queryset = queryset.exclude(id=exclude_id)
+        return queryset
+
+    def find_conflicts(self, start, duration_minutes, recruiter=None, candidate=None, exclude_id=None):
+        """
+        Interviews that clash with a new one
+
+        Returns:
+            List of (id, scheduled_datetime, ends_at) tuples, earliest first
+        """
+        end = start + timedelta(minutes=duration_minutes)
+        return list(
+            self.busy(start, end, recruiter, candidate, exclude_id)
+            .order_by('scheduled_datetime')
+            .values_list('id', 'scheduled_datetime', 'ends_at')
+        )
+
+    def available_slots(self, recruiter, range_start, range_end, duration_minutes=60, count=5,
+                        candidate=None, step_minutes=30, day_start=9, day_end=18):
+        """
+        Next free slots for a recruiter (and optionally a candidate)
+
+        Busy intervals in the range are read with one query, then swept
+        in order, so cost depends on the range and not the calendar size.
+
+        Args:
+            recruiter: Recruiter whose calendar is searched
+            range_start, range_end: Search window
+            duration_minutes: Length of the slot wanted
+            count: Number of slots to return
+            candidate: Also avoid this candidate's interviews
+            step_minutes: Slot start granularity
+            day_start, day_end: Working hours (current time zone)
+
+        Returns:
+            List of (start, end) datetimes
+        """
+        duration = timedelta(minutes=duration_minutes)
+        step = timedelta(minutes=step_minutes)
+        busy = list(
+            self.busy(range_start, range_end, recruiter, candidate)
+            .order_by('scheduled_datetime')
+            .values_list('scheduled_datetime', 'ends_at')
+        )
+
+        slots = []
+        busy_index = 0
+        cursor = self._align(max(range_start, timezone.now()), step)
+
+        while cursor + duration <= range_end and len(slots) < count:
+            day_open, day_close = self._working_hours(cursor, day_start, day_end)
+            if cursor < day_open:
+                cursor = day_open
+                continue
+            if cursor + duration > day_close:
+                cursor = day_open + timedelta(days=1)
+                continue
+
+            # Skip intervals that end before the candidate slot starts
+            while busy_index < len(busy) and busy[busy_index][1] <= cursor:
+                busy_index += 1
+
+            if busy_index < len(busy) and busy[busy_index][0] < cursor + duration:
+                cursor = self._align(busy[busy_index][1], step)
+                continue
+
+            slots.append((cursor, cursor + duration))
+            cursor += duration
+
+        return slots
+
+    @staticmethod
+    def _align(moment, step):
+        """Round moment up to the next step boundary within its hour"""
+        hour = moment.replace(minute=0, second=0, microsecond=0)
+        steps = -(-(moment - hour) // step)  # Ceiling division
+        return hour + steps * step
+
+    @staticmethod
+    def _working_hours(moment, day_start, day_end):
+        day_open = timezone.localtime(moment).replace(hour=day_start, minute=0, second=0, microsecond=0)
+        return day_open, day_open + timedelta(hours=day_end - day_start)
+
+
+# Global instance
+interview_scheduler = InterviewScheduler()
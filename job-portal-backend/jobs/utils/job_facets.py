@@ -0,0 +1,183 @@
+"""
+Facet counts for the job board filters
+
+Counts per company, location, job type, salary bucket and experience bucket
+are computed with one grouped aggregate query, whatever the number of jobs.
+The published-jobs facets are cached under the jobs version: with a shared
+cache, a counter that jobs/signals.py bumps whenever a Job is saved or
+deleted; without one, the row count and latest updated_at of the Job table,
+read at most every TABLE_VERSION_SECONDS per process.
+"""
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, Count, Max, Min, Value, When
+from ..models import Job
+from .job_filters import salary_q, experience_q
+
+# (key, salary_min, salary_max) -- same semantics as the salary_min/salary_max list filters
+SALARY_BUCKETS = [
+    ('0-25000', 0, 25000),
+    ('25000-50000', 25000, 50000),
+    ('50000-100000', 50000, 100000),
+    ('100000+', 100000, None),
+]
+
+# (key, experience_min, experience_max) -- years, as the experience_min/experience_max filters
+EXPERIENCE_BUCKETS = [
+    ('0-1', 0, 1),
+    ('2-4', 2, 4),
+    ('5-9', 5, 9),
+    ('10+', 10, None),
+]
+
+# Longest company/location lists returned, most common first
+FACET_TOP_N = 50
+
+FACETS_CACHE_TIMEOUT = 60 * 60
+
+# How long a process reuses the table-derived version without a shared cache;
+# other processes' job changes show up in facets and indexes within this time
+TABLE_VERSION_SECONDS = 5
+
+
+class JobFacetService:
+    """Compute and cache filter facets for job listings"""
+
+    version_key = 'jobs:facets:version'
+
+    def __init__(self):
+        # (version, monotonic expiry) of the table-derived version
+        self._table_version = None
+
+    def get_version(self):
+        """
+        Version of the Job table that cached facets and indexes are keyed on
+
+        With a shared cache (settings.SHARED_CACHE) this is a counter any
+        process can bump. A per-process cache would only see its own bumps,
+        so the version is then read from the table: row count plus latest
+        updated_at, which every save and delete moves. That aggregate scans
+        the table, so it is reused for TABLE_VERSION_SECONDS.
+        """
+        if settings.SHARED_CACHE:
+            return cache.get_or_set(self.version_key, 1, None)
+        memo = self._table_version
+        if memo is not None and time.monotonic() < memo[1]:
+            return memo[0]
+        state = Job.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+        latest = state['latest'].timestamp() if state['latest'] else 0
+        version = f"{state['count']}-{latest}"
+        self._table_version = (version, time.monotonic() + TABLE_VERSION_SECONDS)
+        return version
+
+    def invalidate(self):
+        """
+        Called on every Job save/delete; cached facets are rebuilt on next read
+
+        With a shared cache the counter is bumped for every process. Otherwise
+        only this process's reused table version is dropped, so it sees its
+        own change at once; the others pick it up when theirs expires.
+        """
+        if not settings.SHARED_CACHE:
+            self._table_version = None
+            return
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, None)
+
+    def compute(self, queryset, top_n=FACET_TOP_N):
+        """
+        Facet counts for any Job queryset in a single query
+
+        Rows are grouped by company, location, job type and one flag per
+        salary/experience bucket, so the database makes one pass over the
+        matching jobs and returns at most one row per distinct combination.
+        The per-facet counts are then summed up from those groups.
+
+        Returns:
+            Dict with 'company', 'location', 'job_type', 'salary' and
+            'experience' lists of {'value', 'count'} plus 'total' and 'ranges'
+        """
+        flags = {
+            f'salary_{index}': self._flag(salary_q(low, high))
+            for index, (_, low, high) in enumerate(SALARY_BUCKETS)
+        }
+        flags.update({
+            f'experience_{index}': self._flag(experience_q(low, high))
+            for index, (_, low, high) in enumerate(EXPERIENCE_BUCKETS)
+        })
+        groups = (
+            queryset.order_by()
+            .annotate(**flags)
+            .values('company_name', 'location', 'job_type', *flags)
+            .annotate(
+                count=Count('id'),
+                lowest_salary=Min('salary_min'),
+                highest_salary=Max('salary_max'),
+                most_experience=Max('required_experience')
+            )
+        )
+
+        total = 0
+        fields = {'company_name': Counter(), 'location': Counter(), 'job_type': Counter()}
+        buckets = Counter()
+        lows, highs, experience = [], [], []
+        for group in groups:
+            count = group['count']
+            total += count
+            for field, counter in fields.items():
+                counter[group[field]] += count
+            for flag in flags:
+                if group[flag]:
+                    buckets[flag] += count
+            lows.append(group['lowest_salary'])
+            highs.append(group['highest_salary'])
+            experience.append(group['most_experience'])
+
+        return {
+            'total': total,
+            'company': self._top(fields['company_name'], top_n),
+            'location': self._top(fields['location'], top_n),
+            'job_type': self._top(fields['job_type']),
+            'salary': [
+                {'value': key, 'count': buckets[f'salary_{index}']}
+                for index, (key, _, _) in enumerate(SALARY_BUCKETS)
+            ],
+            'experience': [
+                {'value': key, 'count': buckets[f'experience_{index}']}
+                for index, (key, _, _) in enumerate(EXPERIENCE_BUCKETS)
+            ],
+            'ranges': {
+                'salary_min': min((value for value in lows if value is not None), default=None),
+                'salary_max': max((value for value in highs if value is not None), default=None),
+                'experience_max': max((value for value in experience if value is not None), default=None),
+            },
+        }
+
+    @staticmethod
+    def _flag(condition):
+        return Case(When(condition, then=Value(True)), default=Value(False), output_field=BooleanField())
+
+    @staticmethod
+    def _top(counter, limit=None):
+        """Most common values first, ties by value"""
+        items = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+        if limit:
+            items = items[:limit]
+        return [{'value': value, 'count': count} for value, count in items]
+
+    def published_facets(self):
+        """Facets over all published jobs, served from the cache"""
+        key = f'jobs:facets:published:{self.get_version()}'
+        facets = cache.get(key)
+        if facets is None:
+            facets = self.compute(Job.objects.filter(status='published'))
+            cache.set(key, facets, FACETS_CACHE_TIMEOUT)
+        return facets
+
+
+# Global instance
+job_facets = JobFacetService()
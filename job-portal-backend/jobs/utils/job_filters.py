@@ -0,0 +1,46 @@
+"""
+Query building blocks shared by job listing, facets and the bitmap index
+
+Salary and experience filters are NULL-tolerant: a job that does not state a
+salary (or experience) matches every range.
+"""
+from django.db.models import Q
+from .geo import geocode
+
+
+def salary_q(salary_min=None, salary_max=None):
+    """Jobs whose offered salary range overlaps [salary_min, salary_max]"""
+    q = Q()
+    if salary_min is not None:
+        q &= Q(salary_max__isnull=True) | Q(salary_max__gte=salary_min)
+    if salary_max is not None:
+        q &= Q(salary_min__isnull=True) | Q(salary_min__lte=salary_max)
+    return q
+
+
+def experience_q(experience_min=None, experience_max=None):
+    """Jobs whose required experience is unknown or within [experience_min, experience_max]"""
+    if experience_min is not None and experience_max is not None:
+        return Q(required_experience__isnull=True) | Q(required_experience__range=(experience_min, experience_max))
+    if experience_min is not None:
+        return Q(required_experience__isnull=True) | Q(required_experience__gte=experience_min)
+    if experience_max is not None:
+        return Q(required_experience__isnull=True) | Q(required_experience__lte=experience_max)
+    return Q()
+
+
+def location_q(location):
+    """
+    Jobs in a location
+
+    A substring match on the raw text, as before, plus for a place the
+    gazetteer knows a match on the normalized name, so "Bangalore" also
+    finds "Bengaluru, KA". The substring match stays because a job stores
+    only the first city it names: "Mumbai, Pune, Bangalore" is normalized
+    to Mumbai but must still be found for Bangalore.
+    """
+    q = Q(location__icontains=location)
+    place = geocode(location)
+    if place is not None:
+        q |= Q(location_normalized=place.name)
+    return q
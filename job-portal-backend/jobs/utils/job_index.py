@@ -0,0 +1,241 @@
+"""
+In-memory bitmap index over published jobs
+
+Each worker keeps one bitmap per distinct company, location, job type and
+skills string, and per distinct salary/experience value. A bitmap is a
+Python int where bit i stands for the i-th newest published job, so a
+filter combination is a handful of &/| operations, the result count is a
+popcount and the first page of results is the lowest set bits. Only that
+page of ids goes to the database.
+
+The index is rebuilt (one query) when the jobs version has moved: the
+counter jobs/signals.py bumps on every Job save/delete when the cache is
+shared, otherwise the Job table's row count and latest updated_at, so every
+worker sees changes made by any other process. Enable it with JOB_BITMAP_INDEX.
+"""
+import logging
+import threading
+from django.conf import settings
+from ..models import Job
+from .geo import geocode
+from .job_facets import job_facets, SALARY_BUCKETS, EXPERIENCE_BUCKETS, FACET_TOP_N
+
+logger = logging.getLogger(__name__)
+
+
+class ValueIndex:
+    """Bitmaps per distinct value of one numeric field, NULLs kept apart"""
+
+    def __init__(self):
+        self.bitmaps = {}
+        self.null = 0
+
+    def add(self, value, bit):
+        if value is None:
+            self.null |= bit
+        else:
+            self.bitmaps[value] = self.bitmaps.get(value, 0) | bit
+
+    def freeze(self):
+        self.values = sorted(self.bitmaps)
+
+    def between(self, low=None, high=None):
+        """Jobs with low <= value <= high (either bound optional, NULLs excluded)"""
+        bitmap = 0
+        for value in self.values:
+            if high is not None and value > high:
+                break
+            if low is None or value >= low:
+                bitmap |= self.bitmaps[value]
+        return bitmap
+
+    def lowest(self, bitmap):
+        return next((value for value in self.values if self.bitmaps[value] & bitmap), None)
+
+    def highest(self, bitmap):
+        return next((value for value in reversed(self.values) if self.bitmaps[value] & bitmap), None)
+
+
+class IndexSnapshot:
+    """Immutable bitmaps for one jobs version"""
+
+    TEXT_FIELDS = ('company_name', 'location', 'location_normalized', 'job_type', 'required_skills')
+    RANGE_FIELDS = ('salary_min', 'salary_max', 'required_experience')
+
+    def __init__(self, version):
+        self.version = version
+        rows = (
+            Job.objects.filter(status='published')
+            .order_by('-created_at', '-id')
+            .values_list('id', *self.TEXT_FIELDS, *self.RANGE_FIELDS)
+        )
+
+        self.ids = []
+        self.text = {field: {} for field in self.TEXT_FIELDS}
+        self.ranges = {field: ValueIndex() for field in self.RANGE_FIELDS}
+        for position, row in enumerate(rows.iterator(chunk_size=2000)):
+            bit = 1 << position
+            self.ids.append(row[0])
+            for field, value in zip(self.TEXT_FIELDS, row[1:]):
+                self.text[field][value] = self.text[field].get(value, 0) | bit
+            for field, value in zip(self.RANGE_FIELDS, row[1 + len(self.TEXT_FIELDS):]):
+                self.ranges[field].add(value, bit)
+
+        for index in self.ranges.values():
+            index.freeze()
+        self.all = (1 << len(self.ids)) - 1
+
+    def contains(self, field, needle):
+        """Case-insensitive substring match, like __icontains"""
+        needle = needle.lower()
+        bitmap = 0
+        for value, value_bitmap in self.text[field].items():
+            if needle in (value or '').lower():
+                bitmap |= value_bitmap
+        return bitmap
+
+    def salary(self, salary_min=None, salary_max=None):
+        """Same rows as job_filters.salary_q"""
+        bitmap = self.all
+        if salary_min is not None:
+            index = self.ranges['salary_max']
+            bitmap &= index.null | index.between(low=salary_min)
+        if salary_max is not None:
+            index = self.ranges['salary_min']
+            bitmap &= index.null | index.between(high=salary_max)
+        return bitmap
+
+    def experience(self, experience_min=None, experience_max=None):
+        """Same rows as job_filters.experience_q"""
+        if experience_min is None and experience_max is None:
+            return self.all
+        index = self.ranges['required_experience']
+        return index.null | index.between(experience_min, experience_max)
+
+    def search(self, params):
+        """
+        Bitmap of published jobs matching the listing filters
+
+        Args:
+            params: Parsed filters, as JobViewSet.filter_params returns them
+                (radius searches are not indexed and go to the database)
+        """
+        bitmap = self.all
+        for param, field in (('skills', 'required_skills'), ('company', 'company_name')):
+            if params.get(param):
+                bitmap &= self.contains(field, params[param])
+        if params.get('location'):
+            # Same rule as job_filters.location_q
+            matches = self.contains('location', params['location'])
+            place = geocode(params['location'])
+            if place is not None:
+                matches |= self.text['location_normalized'].get(place.name, 0)
+            bitmap &= matches
+        if params.get('job_type'):
+            bitmap &= self.text['job_type'].get(params['job_type'], 0)
+        bitmap &= self.salary(params.get('salary_min'), params.get('salary_max'))
+        bitmap &= self.experience(params.get('experience_min'), params.get('experience_max'))
+        return bitmap
+
+    def page(self, bitmap, offset=0, limit=None):
+        """Job ids for the set bits in [offset, offset + limit), newest first"""
+        bits = bin(bitmap)[:1:-1]  # Lowest bit first
+        ids = []
+        position = bits.find('1')
+        skipped = 0
+        while position != -1 and (limit is None or len(ids) < limit):
+            if skipped < offset:
+                skipped += 1
+            else:
+                ids.append(self.ids[position])
+            position = bits.find('1', position + 1)
+        return ids
+
+    def facets(self, bitmap, top_n=FACET_TOP_N):
+        """Same structure as JobFacetService.compute, from the bitmaps"""
+        def counts(field, limit=None):
+            items = []
+            for value, value_bitmap in self.text[field].items():
+                count = (bitmap & value_bitmap).bit_count()
+                if count:
+                    items.append((value, count))
+            items.sort(key=lambda item: (-item[1], item[0]))
+            if limit:
+                items = items[:limit]
+            return [{'value': value, 'count': count} for value, count in items]
+
+        return {
+            'total': bitmap.bit_count(),
+            'company': counts('company_name', top_n),
+            'location': counts('location', top_n),
+            'job_type': counts('job_type'),
+            'salary': [
+                {'value': key, 'count': (bitmap & self.salary(low, high)).bit_count()}
+                for key, low, high in SALARY_BUCKETS
+            ],
+            'experience': [
+                {'value': key, 'count': (bitmap & self.experience(low, high)).bit_count()}
+                for key, low, high in EXPERIENCE_BUCKETS
+            ],
+            'ranges': {
+                'salary_min': self.ranges['salary_min'].lowest(bitmap),
+                'salary_max': self.ranges['salary_max'].highest(bitmap),
+                'experience_max': self.ranges['required_experience'].highest(bitmap),
+            },
+        }
+
+
+class IndexedJobs:
+    """
+    Search result as a lazy sequence for Django's Paginator
+
+    Slicing turns only the requested bits into ids and fetches those jobs
+    with one query, in index order.
+    """
+
+    def __init__(self, snapshot, bitmap, queryset):
+        self.snapshot = snapshot
+        self.bitmap = bitmap
+        self.queryset = queryset
+
+    def __len__(self):
+        return self.bitmap.bit_count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError('IndexedJobs only supports slicing')
+        start = key.start or 0
+        limit = None if key.stop is None else max(key.stop - start, 0)
+        ids = self.snapshot.page(self.bitmap, start, limit)
+        jobs = self.queryset.in_bulk(ids)
+        # A job unpublished since the snapshot was taken is simply dropped
+        return [jobs[job_id] for job_id in ids if job_id in jobs]
+
+
+class JobBitmapIndex:
+    """Per-worker holder of the current IndexSnapshot"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'JOB_BITMAP_INDEX', False)
+
+    def snapshot(self):
+        """Current snapshot, rebuilt first if any job changed (in any process) since it was built"""
+        version = job_facets.get_version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = IndexSnapshot(version)
+                logger.info(f"Built job bitmap index: {len(self._snapshot.ids)} jobs, version {version}")
+            return self._snapshot
+
+
+# Global instance
+job_index = JobBitmapIndex()
@@ -0,0 +1,120 @@
+"""
+Job view counting
+
+Views are added with F('views_count') + n in an UPDATE, so increments are
+never lost and updated_at is left alone. With JOB_VIEW_FLUSH_SECONDS > 0 the
+increments are first buffered in the worker process and written as one
+aggregated UPDATE per flush, so a popular job costs one row write per
+interval instead of one per view.
+
+A buffer is flushed at the latest JOB_VIEW_FLUSH_SECONDS after its first
+view, by a timer thread, so an idle worker never holds views and a killed
+worker loses at most that many seconds of them.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Value, When
+from ..models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobViewCounter:
+    """Per-process buffer of job view increments"""
+
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def flush_seconds(self):
+        return getattr(settings, 'JOB_VIEW_FLUSH_SECONDS', 10)
+
+    @property
+    def flush_threshold(self):
+        return getattr(settings, 'JOB_VIEW_FLUSH_THRESHOLD', 1000)
+
+    def record(self, job_id):
+        """
+        Count one view
+
+        Returns:
+            Number of this job's views still waiting in the buffer (0 if
+            written straight through)
+        """
+        if self.flush_seconds <= 0:
+            Job.objects.filter(pk=job_id).update(views_count=F('views_count') + 1)
+            return 0
+
+        with self._lock:
+            if self._timer is None:
+                self._schedule_flush()
+            self._pending[job_id] += 1
+            pending = self._pending[job_id]
+            due = sum(self._pending.values()) >= self.flush_threshold
+
+        if due:
+            self.flush()
+            return 0
+        return pending
+
+    def _schedule_flush(self):
+        """Start the timer that flushes the buffer begun by this view (caller holds the lock)"""
+        self._timer = threading.Timer(self.flush_seconds, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            connection.close()  # The timer thread's own connection
+
+    def pending(self, job_id):
+        with self._lock:
+            return self._pending.get(job_id, 0)
+
+    def flush(self):
+        """
+        Write all buffered views in a single UPDATE
+
+        Returns:
+            Number of views written
+        """
+        with self._lock:
+            deltas, self._pending = self._pending, Counter()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not deltas:
+            return 0
+
+        try:
+            Job.objects.filter(pk__in=deltas.keys()).update(
+                views_count=F('views_count') + Case(
+                    *[When(pk=job_id, then=Value(delta)) for job_id, delta in deltas.items()],
+                    default=Value(0),
+                    output_field=IntegerField()
+                )
+            )
+        except Exception as e:
+            # Put the views back so the next flush retries them
+            with self._lock:
+                self._pending.update(deltas)
+                if self._timer is None:
+                    self._schedule_flush()
+            logger.error(f"Failed to flush job views: {str(e)}")
+            return 0
+
+        return sum(deltas.values())
+
+
+# Global instance
+job_view_counter = JobViewCounter()
+atexit.register(job_view_counter.flush)
@@ -2,10 +2,22 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from django.db import transaction
 from django.http import FileResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from datetime import timedelta
+import math
 
 from .models import Job, Application, SavedJob, Interview
+from .utils.interview_scheduling import interview_scheduler
+from .utils.view_counter import job_view_counter
+from .utils.job_filters import salary_q, experience_q, location_q
+from .utils.geo import geocode, within_radius
+from .utils.job_facets import job_facets
+from .utils.job_index import job_index, IndexedJobs
 from .serializers import (
     JobSerializer,
     JobListSerializer,
@@ -15,7 +27,35 @@ from .serializers import (
     InterviewSerializer
 )
 from accounts.permissions import IsRecruiter, IsCandidate
-from accounts.models import CandidateProfile
+from accounts.models import CandidateProfile, User
+from notifications.utils.notification_service import notification_service
+
+# Largest batch accepted by ApplicationViewSet.bulk_update_status
+BULK_STATUS_UPDATE_LIMIT = 500
+
+# Radius search defaults for JobViewSet (?near=, ?lat=&lng=, ?near_me=true)
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 500
+
+
+def parse_number(param, value, cast=int):
+    """Parse a numeric query parameter; anything else is a 400 naming the parameter"""
+    if not value:
+        return None
+    try:
+        number = cast(value)
+    except ValueError:
+        raise ValidationError({param: f"'{value}' is not a valid number"})
+    if not math.isfinite(number):
+        raise ValidationError({param: f"'{value}' is not a valid number"})
+    return number
+
+
+class JobFacetPagination(PageNumberPagination):
+    """Pages for the faceted job listing (?facets=true)"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
 
 
 class JobViewSet(viewsets.ModelViewSet):
@@ -27,6 +67,13 @@ class JobViewSet(viewsets.ModelViewSet):
     queryset = Job.objects.all()
     permission_classes = [IsAuthenticated]
 
+    # Query parameters understood by apply_filters
+    FILTER_PARAMS = (
+        'skills', 'location', 'company', 'job_type',
+        'salary_min', 'salary_max', 'experience_min', 'experience_max',
+        'near', 'lat', 'lng', 'near_me', 'radius_km',
+    )
+
     def get_serializer_class(self):
         if self.action == 'list':
             return JobListSerializer
@@ -43,62 +90,105 @@ class JobViewSet(viewsets.ModelViewSet):
             # Candidates see only published jobs
             queryset = queryset.filter(status='published')
 
-        # Apply filters from query parameters
-        skills = self.request.query_params.get('skills', None)
-        if skills:
+        return self.apply_filters(queryset)
+
+    def filter_params(self):
+        """Listing filters from the query string, numbers parsed and radius centre resolved"""
+        if hasattr(self, '_filter_params'):
+            return self._filter_params
+
+        params = {}
+        for param in self.FILTER_PARAMS:
+            value = self.request.query_params.get(param, None)
+            if param.startswith(('salary_', 'experience_')):
+                value = parse_number(param, value)
+            params[param] = value
+
+        # Radius search centre: a known place, explicit coordinates or the candidate's profile
+        origin = None
+        if params['near']:
+            place = geocode(params['near'])
+            if place is None:
+                raise ValidationError({'near': f"Unknown location '{params['near']}'"})
+            origin = (place.latitude, place.longitude)
+        elif params['lat'] and params['lng']:
+            origin = (parse_number('lat', params['lat'], float), parse_number('lng', params['lng'], float))
+            if not (-90 <= origin[0] <= 90 and -180 <= origin[1] <= 180):
+                raise ValidationError({'lat': 'Coordinates must be within lat -90..90 and lng -180..180'})
+        elif params['near_me'] == 'true':
+            origin = CandidateProfile.objects.filter(
+                user=self.request.user, latitude__isnull=False
+            ).values_list('latitude', 'longitude').first()
+            if origin is None:
+                raise ValidationError({'near_me': 'Add a recognised location to your profile first'})
+        params['origin'] = origin
+        radius_km = parse_number('radius_km', params['radius_km'], float) or DEFAULT_RADIUS_KM
+        if radius_km < 0:
+            raise ValidationError({'radius_km': 'Radius cannot be negative'})
+        params['radius_km'] = min(radius_km, MAX_RADIUS_KM)
+
+        self._filter_params = params
+        return params
+
+    def apply_filters(self, queryset):
+        """Narrow a Job queryset by the listing filters in the query string"""
+        params = self.filter_params()
+
+        if params['skills']:
             # Search for skills in required_skills field
-            queryset = queryset.filter(required_skills__icontains=skills)
+            queryset = queryset.filter(required_skills__icontains=params['skills'])
 
-        location = self.request.query_params.get('location', None)
-        if location:
-            queryset = queryset.filter(location__icontains=location)
+        if params['location']:
+            queryset = queryset.filter(location_q(params['location']))
 
-        company = self.request.query_params.get('company', None)
-        if company:
-            queryset = queryset.filter(company_name__icontains=company)
+        if params['company']:
+            queryset = queryset.filter(company_name__icontains=params['company'])
 
-        job_type = self.request.query_params.get('job_type', None)
-        if job_type:
-            queryset = queryset.filter(job_type=job_type)
+        if params['job_type']:
+            queryset = queryset.filter(job_type=params['job_type'])
 
-        # Salary range filter (include jobs with NULL salary or within range)
-        salary_min = self.request.query_params.get('salary_min', None)
-        salary_max = self.request.query_params.get('salary_max', None)
+        # Salary and experience ranges (jobs with NULL salary/experience always match)
+        queryset = queryset.filter(salary_q(params['salary_min'], params['salary_max']))
+        queryset = queryset.filter(experience_q(params['experience_min'], params['experience_max']))
 
-        if salary_min:
-            queryset = queryset.filter(
-                Q(salary_max__isnull=True) |
-                Q(salary_max__gte=int(salary_min))
-            )
+        if params['origin'] is not None:
+            # Nearest first, with distance_km on each job
+            queryset = within_radius(queryset, *params['origin'], params['radius_km'])
 
-        if salary_max:
-            queryset = queryset.filter(
-                Q(salary_min__isnull=True) |
-                Q(salary_min__lte=int(salary_max))
-            )
+        return queryset
 
-        # Experience filter (include jobs with NULL experience or within range)
-        experience_min = self.request.query_params.get('experience_min', None)
-        experience_max = self.request.query_params.get('experience_max', None)
+    def list(self, request, *args, **kwargs):
+        """
+        List jobs
+
+        With ?facets=true the response is a page of results (page, page_size)
+        together with facet counts for the whole filtered set. Candidates are
+        served from the in-memory bitmap index when JOB_BITMAP_INDEX is on.
+        """
+        faceted = request.query_params.get('facets') == 'true'
+        params = self.filter_params()
+        use_index = job_index.enabled and request.user.role == 'candidate' and params['origin'] is None
+        if not faceted and not use_index:
+            return super().list(request, *args, **kwargs)
+
+        if use_index:
+            snapshot = job_index.snapshot()
+            bitmap = snapshot.search(params)
+            jobs = IndexedJobs(snapshot, bitmap, Job.objects.filter(status='published'))
+        else:
+            jobs = self.filter_queryset(self.get_queryset())
 
-        if experience_min and experience_max:
-            # Filter jobs where experience is either NULL or within the range
-            queryset = queryset.filter(
-                Q(required_experience__isnull=True) |
-                Q(required_experience__range=(int(experience_min), int(experience_max)))
-            )
-        elif experience_min:
-            queryset = queryset.filter(
-                Q(required_experience__isnull=True) |
-                Q(required_experience__gte=int(experience_min))
-            )
-        elif experience_max:
-            queryset = queryset.filter(
-                Q(required_experience__isnull=True) |
-                Q(required_experience__lte=int(experience_max))
-            )
+        if not faceted:
+            serializer = self.get_serializer(jobs[:], many=True)
+            return Response(serializer.data)
 
-        return queryset
+        paginator = JobFacetPagination()
+        page = paginator.paginate_queryset(jobs, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+
+        response = paginator.get_paginated_response(serializer.data)
+        response.data['facets'] = snapshot.facets(bitmap) if use_index else job_facets.compute(jobs)
+        return response
 
     def perform_create(self, serializer):
         # Only recruiters can create jobs
@@ -110,43 +200,48 @@ class JobViewSet(viewsets.ModelViewSet):
     def increment_views(self, request, pk=None):
         """Increment view count when a job is viewed"""
         job = self.get_object()
-        job.views_count += 1
-        job.save()
-        return Response({'views_count': job.views_count})
+        # Atomic F() increment (possibly buffered); never rewrites the row or bumps updated_at
+        pending = job_view_counter.record(job.id)
+        return Response({'views_count': job.views_count + max(pending, 1)})
 
     @action(detail=False, methods=['get'])
     def filter_options(self, request):
         """Get available filter options from published jobs"""
         jobs = Job.objects.filter(status='published')
 
-        # Get unique companies
-        companies = jobs.values_list('company_name', flat=True).distinct()
-
-        # Get unique locations
-        locations = jobs.values_list('location', flat=True).distinct()
-
-        # Get job types
-        job_types = jobs.values_list('job_type', flat=True).distinct()
-
-        # Get salary range
-        salary_range = {
-            'min': jobs.order_by('salary_min').values_list('salary_min', flat=True).first() or 0,
-            'max': jobs.order_by('-salary_max').values_list('salary_max', flat=True).first() or 200000
-        }
-
-        # Get experience range (always start from 0)
-        max_exp = jobs.order_by('-required_experience').values_list('required_experience', flat=True).first()
-        experience_range = {
-            'min': 0,  # Always start from 0
-            'max': max_exp if max_exp else 20
-        }
+        # With the bitmap index enabled every facet set comes from memory.
+        # Otherwise facets for the current filter set are computed live and
+        # the unfiltered board is served from the cache that Job saves/deletes invalidate
+        params = self.filter_params()
+        if job_index.enabled and params['origin'] is None:
+            snapshot = job_index.snapshot()
+            facets = snapshot.facets(snapshot.search(params))
+        elif any(request.query_params.get(param) for param in self.FILTER_PARAMS):
+            facets = job_facets.compute(self.apply_filters(jobs))
+        else:
+            facets = job_facets.published_facets()
 
+        ranges = facets['ranges']
         return Response({
-            'companies': list(companies),
-            'locations': list(locations),
-            'job_types': list(job_types),
-            'salary_range': salary_range,
-            'experience_range': experience_range
+            'companies': [item['value'] for item in facets['company']],
+            'locations': [item['value'] for item in facets['location']],
+            'job_types': [item['value'] for item in facets['job_type']],
+            'salary_range': {
+                'min': ranges['salary_min'] or 0,
+                'max': ranges['salary_max'] or 200000
+            },
+            'experience_range': {
+                'min': 0,  # Always start from 0
+                'max': ranges['experience_max'] or 20
+            },
+            'facets': {
+                'total': facets['total'],
+                'company': facets['company'],
+                'location': facets['location'],
+                'job_type': facets['job_type'],
+                'salary': facets['salary'],
+                'experience': facets['experience'],
+            }
         })
 
     @action(detail=True, methods=['get'])
@@ -163,6 +258,39 @@ class JobViewSet(viewsets.ModelViewSet):
         serializer = ApplicationSerializer(applications, many=True, context={'request': request})
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def nearby_candidates(self, request, pk=None):
+        """Candidates whose profile location is within radius_km of the job (recruiter only)"""
+        job = self.get_object()
+        if request.user.role != 'recruiter' or job.recruiter != request.user:
+            return Response(
+                {'error': 'You do not have permission to view these candidates'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        if job.latitude is None:
+            return Response(
+                {'error': 'The job location could not be matched to a known place'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        radius_km = self.filter_params()['radius_km']
+        profiles = within_radius(
+            CandidateProfile.objects.select_related('user'), job.latitude, job.longitude, radius_km
+        )[:100]
+        return Response({
+            'radius_km': radius_km,
+            'candidates': [
+                {
+                    'id': profile.user_id,
+                    'name': profile.user.get_full_name(),
+                    'email': profile.user.email,
+                    'location': profile.location,
+                    'distance_km': round(profile.distance_km, 1),
+                }
+                for profile in profiles
+            ]
+        })
+
 
 class ApplicationViewSet(viewsets.ModelViewSet):
     """
@@ -197,7 +325,9 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         # Only candidates can apply
         if self.request.user.role != 'candidate':
             raise PermissionError("Only candidates can apply to jobs")
-        serializer.save(candidate=self.request.user)
+        # Notifications (and their queued emails) commit together with the application
+        with transaction.atomic():
+            serializer.save(candidate=self.request.user)
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -220,11 +350,86 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             )
 
         application.status = new_status
-        application.save()
+        with transaction.atomic():
+            application.save()
 
         serializer = self.get_serializer(application)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'])
+    def bulk_update_status(self, request):
+        """
+        Move many applications to one status (recruiter only)
+
+        Ownership is checked with a single query and the whole batch is
+        all-or-nothing: status UPDATE and candidate notifications (bulk
+        INSERT, emails queued on the outbox) commit in one transaction.
+        """
+        if request.user.role != 'recruiter':
+            return Response(
+                {'error': 'Only recruiters can update application status'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        new_status = request.data.get('status')
+        if new_status not in dict(Application.STATUS_CHOICES):
+            return Response(
+                {'error': 'Invalid status'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        application_ids = request.data.get('application_ids')
+        if (not isinstance(application_ids, list) or not application_ids or
+                not all(isinstance(i, int) for i in application_ids)):
+            return Response(
+                {'error': 'application_ids must be a non-empty list of ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        application_ids = set(application_ids)
+        if len(application_ids) > BULK_STATUS_UPDATE_LIMIT:
+            return Response(
+                {'error': f'At most {BULK_STATUS_UPDATE_LIMIT} applications can be updated at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            applications = list(
+                Application.objects
+                .filter(id__in=application_ids, job__recruiter=request.user)
+                .select_related('job', 'candidate')
+                .select_for_update(of=('self',))
+            )
+
+            not_permitted = application_ids - {application.id for application in applications}
+            if not_permitted:
+                transaction.set_rollback(True)
+                return Response(
+                    {
+                        'error': 'You do not have permission to update some of these applications',
+                        'application_ids': sorted(not_permitted)
+                    },
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            changed = [application for application in applications if application.status != new_status]
+            Application.objects.filter(id__in=[application.id for application in changed]).update(
+                status=new_status,
+                updated_at=timezone.now()
+            )
+
+            notifications = []
+            for application in changed:
+                original_status = application.status
+                application.status = new_status
+                notifications.append(notification_service.application_status_changed_data(application, original_status))
+            notification_service.create_notifications(notifications, send_email=True)
+
+        return Response({
+            'status': new_status,
+            'updated': len(changed),
+            'unchanged': len(applications) - len(changed)
+        })
+
     @action(detail=True, methods=['get'])
     def download_resume(self, request, pk=None):
         """Download candidate resume (recruiter only)"""
@@ -369,7 +574,13 @@ class InterviewViewSet(viewsets.ModelViewSet):
         if application.job.recruiter != self.request.user:
             raise PermissionError("You can only schedule interviews for your own job postings")
 
-        serializer.save()
+        with transaction.atomic():
+            self._check_conflicts(
+                serializer.validated_data['scheduled_datetime'],
+                serializer.validated_data.get('duration_minutes', 60),
+                application.candidate
+            )
+            serializer.save()
 
     def perform_update(self, serializer):
         """Only recruiters can update interviews"""
@@ -381,7 +592,48 @@ class InterviewViewSet(viewsets.ModelViewSet):
         if interview.application.job.recruiter != self.request.user:
             raise PermissionError("You can only update interviews for your own job postings")
 
-        serializer.save()
+        with transaction.atomic():
+            new_datetime = serializer.validated_data.get('scheduled_datetime', interview.scheduled_datetime)
+            new_duration = serializer.validated_data.get('duration_minutes', interview.duration_minutes)
+            if (new_datetime, new_duration) != (interview.scheduled_datetime, interview.duration_minutes):
+                self._check_conflicts(new_datetime, new_duration, interview.application.candidate, interview.id)
+
+            # A moved interview needs a fresh reminder
+            if new_datetime != interview.scheduled_datetime:
+                serializer.save(reminder_sent=False)
+            else:
+                serializer.save()
+
+    def _check_conflicts(self, start, duration_minutes, candidate, exclude_id=None):
+        """
+        Reject an interview that overlaps the recruiter's or candidate's calendar
+
+        Must run inside a transaction: the recruiter and candidate rows are
+        locked so two concurrent bookings for either of them cannot both pass
+        the check. Locking in pk order keeps two bookings from deadlocking.
+        """
+        list(
+            User.objects.select_for_update()
+            .filter(pk__in=[self.request.user.pk, candidate.pk])
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+
+        conflicts = interview_scheduler.find_conflicts(
+            start,
+            duration_minutes,
+            recruiter=self.request.user,
+            candidate=candidate,
+            exclude_id=exclude_id
+        )
+        if conflicts:
+            raise ValidationError({
+                'scheduled_datetime': ['This time overlaps another interview for the recruiter or candidate'],
+                'conflicts': [
+                    f"Interview {interview_id}: {starts.isoformat()} - {ends.isoformat()}"
+                    for interview_id, starts, ends in conflicts
+                ]
+            })
 
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
@@ -401,10 +653,85 @@ class InterviewViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(interview)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def available_slots(self, request):
+        """
+        Suggest free interview slots (recruiter only)
+
+        Query params: from, to (ISO datetimes, default next 7 days),
+        duration (minutes, default 60), count (default 5), application
+        (also avoid that candidate's interviews), day_start/day_end (hours).
+        """
+        if request.user.role != 'recruiter':
+            return Response(
+                {'error': 'Only recruiters can search interview slots'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        now = timezone.now()
+        try:
+            # Well-formed but impossible values (2026-02-30T10:00) raise ValueError
+            range_start = parse_datetime(request.query_params.get('from', '')) or now
+            range_end = parse_datetime(request.query_params.get('to', '')) or range_start + timedelta(days=7)
+        except ValueError:
+            return Response(
+                {'error': 'from and to must be valid ISO 8601 datetimes'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if timezone.is_naive(range_start):
+            range_start = timezone.make_aware(range_start)
+        if timezone.is_naive(range_end):
+            range_end = timezone.make_aware(range_end)
+
+        try:
+            duration = int(request.query_params.get('duration', 60))
+            count = min(int(request.query_params.get('count', 5)), 50)
+            day_start = int(request.query_params.get('day_start', 9))
+            day_end = int(request.query_params.get('day_end', 18))
+        except ValueError:
+            return Response(
+                {'error': 'duration, count, day_start and day_end must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (duration <= 0 or count <= 0 or not 0 <= day_start < day_end <= 24 or
+                range_end <= range_start or range_end - range_start > timedelta(days=60)):
+            return Response(
+                {'error': 'Invalid slot search parameters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        candidate = None
+        application_id = request.query_params.get('application')
+        if application_id:
+            application = Application.objects.filter(
+                id=application_id,
+                job__recruiter=request.user
+            ).select_related('candidate').first()
+            if application is None:
+                return Response(
+                    {'error': 'Application not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            candidate = application.candidate
+
+        slots = interview_scheduler.available_slots(
+            request.user,
+            range_start,
+            range_end,
+            duration_minutes=duration,
+            count=count,
+            candidate=candidate,
+            day_start=day_start,
+            day_end=day_end
+        )
+        return Response({
+            'duration_minutes': duration,
+            'slots': [{'start': start, 'end': end} for start, end in slots]
+        })
+
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get upcoming interviews for the user"""
-        from django.utils import timezone
 
         queryset = self.get_queryset().filter(
             scheduled_datetime__gte=timezone.now(),
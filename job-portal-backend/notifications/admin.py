@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationArchive
 
 
 @admin.register(Notification)
@@ -27,3 +27,12 @@ class NotificationAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at')
         }),
     )
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ['recipient', 'notification_type', 'title', 'created_at', 'archived_at']
+    list_filter = ['notification_type', 'created_at']
+    search_fields = ['recipient__email', 'title', 'message']
+    readonly_fields = ['created_at', 'archived_at']
+    date_hierarchy = 'created_at'
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from notifications.utils.retention import NotificationRetention
+
+
+class Command(BaseCommand):
+    help = 'Move read notifications older than the retention window into the archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Retention window (default NOTIFICATION_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows moved per transaction')
+        parser.add_argument('--export', help='Also append archived rows to this .jsonl.gz file')
+        parser.add_argument('--no-archive-table', action='store_true',
+                            help='Do not copy rows into NotificationArchive (use with --export)')
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches')
+        parser.add_argument('--purge-archive-days', type=int,
+                            help='Also delete archived rows older than this many days')
+
+    def handle(self, *args, **options):
+        retention = NotificationRetention(days=options['days'], batch_size=options['batch_size'])
+
+        archived = retention.run(
+            export_path=options['export'],
+            keep_copy=not options['no_archive_table'],
+            max_batches=options['max_batches']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {archived} notifications older than {retention.days} days archived"
+        ))
+
+        if options['purge_archive_days']:
+            purged = retention.purge_archive(options['purge_archive_days'])
+            self.stdout.write(self.style.SUCCESS(f"Purged {purged} archived notifications"))
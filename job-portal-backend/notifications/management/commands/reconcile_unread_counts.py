@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from notifications.utils.unread_counter import unread_counter
+
+
+class Command(BaseCommand):
+    help = 'Correct cached unread notification counters against the notifications table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users checked per query')
+        parser.add_argument('--user', type=int, help='Only reconcile this user id')
+
+    def handle(self, *args, **options):
+        if not settings.SHARED_CACHE:
+            # This process's cache is not the one the web workers read, and without
+            # a shared cache they count from the table anyway
+            self.stdout.write(self.style.WARNING('No shared cache (REDIS_URL): nothing to reconcile'))
+            return
+
+        users = get_user_model().objects.filter(is_active=True).order_by('id')
+        if options['user']:
+            users = users.filter(id=options['user'])
+        user_ids = list(users.values_list('id', flat=True))
+
+        corrected = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(user_ids), batch_size):
+            corrected += unread_counter.reconcile(user_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {corrected} of {len(user_ids)} counters corrected"
+        ))
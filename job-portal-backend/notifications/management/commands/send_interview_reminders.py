@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from notifications.utils.interview_reminders import InterviewReminderScheduler
+
+
+class Command(BaseCommand):
+    help = 'Queue reminder notifications for interviews starting soon'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Interviews claimed per batch')
+        parser.add_argument('--hours', type=int, help='Reminder lead time (default INTERVIEW_REMINDER_HOURS)')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when idle')
+        parser.add_argument('--interval', type=float, default=60, help='Seconds to sleep when nothing is due')
+
+    def handle(self, *args, **options):
+        scheduler = InterviewReminderScheduler(hours=options['hours'])
+        total = 0
+
+        while True:
+            reminded = scheduler.process_batch(batch_size=options['batch_size'])
+            total += reminded
+
+            if reminded:
+                self.stdout.write(f"Batch: {reminded} reminders queued")
+                continue
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} reminders queued"))
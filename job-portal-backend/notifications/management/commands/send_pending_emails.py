@@ -0,0 +1,36 @@
+import time
+from django.core.management.base import BaseCommand
+from notifications.utils.email_outbox import email_outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending notification emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Notifications claimed per batch')
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent deliveries per batch')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when idle')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to sleep when the outbox is empty')
+
+    def handle(self, *args, **options):
+        totals = {'claimed': 0, 'sent': 0, 'failed': 0}
+
+        while True:
+            result = email_outbox.process_batch(
+                batch_size=options['batch_size'],
+                workers=options['workers']
+            )
+            for key in totals:
+                totals[key] += result[key]
+
+            if result['claimed']:
+                self.stdout.write(f"Batch: {result['sent']} sent, {result['failed']} failed")
+                continue
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {totals['sent']} sent, {totals['failed']} failed of {totals['claimed']} claimed"
+        ))
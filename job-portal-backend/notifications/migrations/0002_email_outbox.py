@@ -0,0 +1,78 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:10
+
+from django.db import migrations, models
+import uuid
+
+
+def backfill_email_outbox(apps, schema_editor):
+    Notification = apps.get_model("notifications", "Notification")
+    Notification.objects.filter(is_emailed=True).update(email_status="sent")
+    # AddField evaluates uuid4 once, so give every existing row its own key
+    for notification in Notification.objects.only("id").iterator():
+        Notification.objects.filter(pk=notification.pk).update(idempotency_key=uuid.uuid4())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="email_attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="email_status",
+            field=models.CharField(
+                choices=[
+                    ("not_requested", "Not Requested"),
+                    ("pending", "Pending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                ],
+                default="not_requested",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="idempotency_key",
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="next_email_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="notification_type",
+            field=models.CharField(
+                choices=[
+                    ("application_submitted", "Application Submitted"),
+                    ("application_status_changed", "Application Status Changed"),
+                    ("new_application", "New Application Received"),
+                    ("job_match", "New Job Match"),
+                    ("resume_viewed", "Resume Viewed"),
+                    ("interview_scheduled", "Interview Scheduled"),
+                    ("interview_cancelled", "Interview Cancelled"),
+                    ("interview_rescheduled", "Interview Rescheduled"),
+                    ("job_expiring", "Job Posting Expiring Soon"),
+                    ("system", "System Notification"),
+                ],
+                max_length=50,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["email_status", "next_email_attempt_at"],
+                name="notificatio_email_s_de611f_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_email_outbox, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:15
+
+from django.db import migrations, models
+
+
+def backfill_pending_payloads(apps, schema_editor):
+    # Only emails still waiting in the outbox need a payload to render from
+    Notification = apps.get_model("notifications", "Notification")
+    Application = apps.get_model("jobs", "Application")
+
+    pending = list(
+        Notification.objects.filter(
+            email_status__in=["pending", "failed"], application_id__isnull=False
+        )
+    )
+    applications = Application.objects.select_related("job", "candidate").in_bulk(
+        {n.application_id for n in pending}
+    )
+    for notification in pending:
+        application = applications.get(notification.application_id)
+        if application is None:
+            continue
+        candidate = application.candidate
+        notification.payload = {
+            "job_title": application.job.title,
+            "candidate_name": candidate.first_name or candidate.email.split("@")[0],
+            "new_status": application.get_status_display(),
+        }
+    Notification.objects.bulk_update(pending, ["payload"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_email_outbox"),
+        ("jobs", "0005_activity_window_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="payload",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(backfill_pending_payloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("notifications", "0003_notification_payload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "notification_type",
+                    models.CharField(
+                        choices=[
+                            ("application_submitted", "Application Submitted"),
+                            (
+                                "application_status_changed",
+                                "Application Status Changed",
+                            ),
+                            ("new_application", "New Application Received"),
+                            ("job_match", "New Job Match"),
+                            ("resume_viewed", "Resume Viewed"),
+                            ("interview_scheduled", "Interview Scheduled"),
+                            ("interview_cancelled", "Interview Cancelled"),
+                            ("interview_rescheduled", "Interview Rescheduled"),
+                            ("job_expiring", "Job Posting Expiring Soon"),
+                            ("system", "System Notification"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("message", models.TextField()),
+                ("link", models.CharField(blank=True, max_length=500, null=True)),
+                ("payload", models.JSONField(blank=True, default=dict)),
+                ("job_id", models.IntegerField(blank=True, null=True)),
+                ("application_id", models.IntegerField(blank=True, null=True)),
+                ("email_sent_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "recipient",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_notifications",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["recipient", "-created_at"],
+                        name="notificatio_recipie_914bcc_idx",
+                    )
+                ],
+            },
+        ),
+    ]
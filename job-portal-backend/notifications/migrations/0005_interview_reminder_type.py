@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0004_notification_archive"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notification",
+            name="notification_type",
+            field=models.CharField(
+                choices=[
+                    ("application_submitted", "Application Submitted"),
+                    ("application_status_changed", "Application Status Changed"),
+                    ("new_application", "New Application Received"),
+                    ("job_match", "New Job Match"),
+                    ("resume_viewed", "Resume Viewed"),
+                    ("interview_scheduled", "Interview Scheduled"),
+                    ("interview_cancelled", "Interview Cancelled"),
+                    ("interview_rescheduled", "Interview Rescheduled"),
+                    ("interview_reminder", "Interview Reminder"),
+                    ("job_expiring", "Job Posting Expiring Soon"),
+                    ("system", "System Notification"),
+                ],
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notificationarchive",
+            name="notification_type",
+            field=models.CharField(
+                choices=[
+                    ("application_submitted", "Application Submitted"),
+                    ("application_status_changed", "Application Status Changed"),
+                    ("new_application", "New Application Received"),
+                    ("job_match", "New Job Match"),
+                    ("resume_viewed", "Resume Viewed"),
+                    ("interview_scheduled", "Interview Scheduled"),
+                    ("interview_cancelled", "Interview Cancelled"),
+                    ("interview_rescheduled", "Interview Rescheduled"),
+                    ("interview_reminder", "Interview Reminder"),
+                    ("job_expiring", "Job Posting Expiring Soon"),
+                    ("system", "System Notification"),
+                ],
+                max_length=50,
+            ),
+        ),
+    ]
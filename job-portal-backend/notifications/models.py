@@ -1,5 +1,7 @@
+import uuid
 from django.db import models
 from django.conf import settings
+from .utils.unread_counter import unread_counter
 
 
 class Notification(models.Model):
@@ -15,6 +17,7 @@ class Notification(models.Model):
         ('interview_scheduled', 'Interview Scheduled'),
         ('interview_cancelled', 'Interview Cancelled'),
         ('interview_rescheduled', 'Interview Rescheduled'),
+        ('interview_reminder', 'Interview Reminder'),
         ('job_expiring', 'Job Posting Expiring Soon'),
         ('system', 'System Notification'),
     )
@@ -29,10 +32,28 @@ class Notification(models.Model):
     message = models.TextField()
     link = models.CharField(max_length=500, blank=True, null=True)  # Link to relevant page
 
+    EMAIL_STATUS_CHOICES = (
+        ('not_requested', 'Not Requested'),
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
     is_read = models.BooleanField(default=False)
     is_emailed = models.BooleanField(default=False)  # Track if email was sent
     email_sent_at = models.DateTimeField(null=True, blank=True)
 
+    # Email outbox: rows with email_status='pending' are delivered by the
+    # send_pending_emails worker, never inside the request that created them
+    email_status = models.CharField(max_length=20, choices=EMAIL_STATUS_CHOICES, default='not_requested')
+    email_attempts = models.PositiveSmallIntegerField(default=0)
+    next_email_attempt_at = models.DateTimeField(null=True, blank=True)
+    idempotency_key = models.UUIDField(default=uuid.uuid4, editable=False)
+
+    # Everything the email needs, captured when the notification is created
+    # (job_title, candidate_name, new_status, ...) so delivery never re-queries
+    payload = models.JSONField(default=dict, blank=True)
+
     # Optional: related objects for context
     job_id = models.IntegerField(null=True, blank=True)
     application_id = models.IntegerField(null=True, blank=True)
@@ -45,6 +66,7 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['recipient', '-created_at']),
             models.Index(fields=['recipient', 'is_read']),
+            models.Index(fields=['email_status', 'next_email_attempt_at']),
         ]
 
     def __str__(self):
@@ -55,6 +77,7 @@ class Notification(models.Model):
         if not self.is_read:
             self.is_read = True
             self.save(update_fields=['is_read', 'updated_at'])
+            unread_counter.adjust_on_commit(self.recipient_id, -1)
 
     def mark_as_emailed(self):
         """Mark that email was sent"""
@@ -62,4 +85,44 @@ class Notification(models.Model):
         if not self.is_emailed:
             self.is_emailed = True
             self.email_sent_at = timezone.now()
-            self.save(update_fields=['is_emailed', 'email_sent_at', 'updated_at'])
+            self.email_status = 'sent'
+            self.next_email_attempt_at = None
+            self.save(update_fields=[
+                'is_emailed', 'email_sent_at', 'email_status', 'next_email_attempt_at', 'updated_at'
+            ])
+
+
+class NotificationArchive(models.Model):
+    """
+    Cold storage for old read notifications
+
+    Rows are moved here by `python manage.py archive_notifications` so the
+    hot Notification table and its indexes only hold the recent working set.
+    Delivery bookkeeping (email status, attempts, keys) is dropped; the id is
+    kept from the original row.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_notifications'
+    )
+    notification_type = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    link = models.CharField(max_length=500, blank=True, null=True)
+    payload = models.JSONField(default=dict, blank=True)
+    job_id = models.IntegerField(null=True, blank=True)
+    application_id = models.IntegerField(null=True, blank=True)
+    email_sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient_id} - {self.title} (archived)"
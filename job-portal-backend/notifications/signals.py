@@ -1,9 +1,8 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.conf import settings
 from jobs.models import Application, Interview
 from .utils.notification_service import notification_service
-from .utils.email_service import email_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,7 +26,8 @@ def application_created_notification(sender, instance, created, **kwargs):
                 link=f'/dashboard',
                 job_id=instance.job.id,
                 application_id=instance.id,
-                send_email=True
+                send_email=True,
+                payload={'job_title': instance.job.title}
             )
             logger.info(f"Candidate notification created for application {instance.id}")
         except Exception as e:
@@ -44,74 +44,53 @@ def application_created_notification(sender, instance, created, **kwargs):
                 link=f'/dashboard',
                 job_id=instance.job.id,
                 application_id=instance.id,
-                send_email=True
+                send_email=True,
+                payload={'candidate_name': candidate_name, 'job_title': instance.job.title}
             )
             logger.info(f"Recruiter notification created for application {instance.id}")
         except Exception as e:
             logger.error(f"Error creating recruiter notification: {str(e)}")
 
 
-# Store original status before save
-@receiver(pre_save, sender=Application)
-def store_original_status(sender, instance, **kwargs):
-    """Store the original status before update"""
-    if instance.pk:  # Only for existing instances
-        try:
-            original = Application.objects.get(pk=instance.pk)
-            instance._original_status = original.status
-        except Application.DoesNotExist:
-            instance._original_status = None
-    else:
-        instance._original_status = None
+def _status_changed(instance, created, update_fields):
+    """
+    Whether this save wrote a new status
+
+    Answered from the snapshot ChangeTrackingMixin took when the instance was
+    loaded, so no extra query is made and non-status saves bail out here.
+    """
+    if created or (update_fields is not None and 'status' not in update_fields):
+        return False
+    return instance.has_changed('status') and instance.original_value('status') is not None
 
 
 @receiver(post_save, sender=Application)
-def application_status_changed_notification(sender, instance, created, **kwargs):
+def application_status_changed_notification(sender, instance, created, update_fields=None, **kwargs):
     """
     Send notification when application status changes
     Only notify candidate
     """
-    if not created and hasattr(instance, '_original_status'):
-        original_status = instance._original_status
-        new_status = instance.status
-
-        # Only notify if status actually changed
-        if original_status and original_status != new_status:
-            try:
-                notification_service.create_notification(
-                    recipient=instance.candidate,
-                    notification_type='application_status_changed',
-                    title='Application Status Updated',
-                    message=f'Your application for {instance.job.title} status changed to {new_status}',
-                    link=f'/dashboard',
-                    job_id=instance.job.id,
-                    application_id=instance.id,
-                    send_email=True
-                )
-                logger.info(f"Status change notification created for application {instance.id}")
-            except Exception as e:
-                logger.error(f"Error creating status change notification: {str(e)}")
-
-
-# Store original status before interview save
-@receiver(pre_save, sender=Interview)
-def store_original_interview_status(sender, instance, **kwargs):
-    """Store the original status before update"""
-    if instance.pk:  # Only for existing instances
-        try:
-            original = Interview.objects.get(pk=instance.pk)
-            instance._original_status = original.status
-        except Interview.DoesNotExist:
-            instance._original_status = None
-    else:
-        instance._original_status = None
+    if not _status_changed(instance, created, update_fields):
+        return
+
+    try:
+        notification_service.create_notification(
+            **notification_service.application_status_changed_data(instance, instance.original_value('status')),
+            send_email=True
+        )
+        logger.info(f"Status change notification created for application {instance.id}")
+    except Exception as e:
+        logger.error(f"Error creating status change notification: {str(e)}")
 
 
 @receiver(post_save, sender=Interview)
-def interview_notification(sender, instance, created, **kwargs):
+def interview_notification(sender, instance, created, update_fields=None, **kwargs):
     """
-    Send notification when interview is scheduled or status changes
+    Send notification when interview is scheduled or cancelled
     """
+    if not created and not (_status_changed(instance, created, update_fields) and instance.status == 'cancelled'):
+        return
+
     try:
         candidate = instance.application.candidate
         job_title = instance.application.job.title
@@ -126,48 +105,36 @@ def interview_notification(sender, instance, created, **kwargs):
                 link=f'/dashboard',
                 job_id=instance.application.job.id,
                 application_id=instance.application.id,
-                send_email=False  # We'll send custom email below
+                send_email=True,
+                payload={
+                    'job_title': job_title,
+                    'scheduled_at': instance.scheduled_datetime.isoformat(),
+                    'interview_type': instance.interview_type,
+                    'location': instance.location,
+                    'notes': instance.notes,
+                }
             )
 
-            # Send custom interview email
-            email_service.send_interview_scheduled_email(
-                candidate=candidate,
-                job_title=job_title,
-                interview_datetime=instance.scheduled_datetime,
-                interview_type=instance.interview_type,
-                location=instance.location,
-                notes=instance.notes
+            logger.info(f"Interview scheduled notification queued for interview {instance.id}")
+
+        else:
+            # Interview cancelled
+            notification_service.create_notification(
+                recipient=candidate,
+                notification_type='interview_cancelled',
+                title='Interview Cancelled',
+                message=f'Your interview for {job_title} scheduled on {instance.scheduled_datetime.strftime("%B %d, %Y")} has been cancelled',
+                link=f'/dashboard',
+                job_id=instance.application.job.id,
+                application_id=instance.application.id,
+                send_email=True,
+                payload={
+                    'job_title': job_title,
+                    'scheduled_at': instance.scheduled_datetime.isoformat(),
+                }
             )
 
-            logger.info(f"Interview scheduled notification sent for interview {instance.id}")
-
-        elif hasattr(instance, '_original_status'):
-            # Status changed
-            original_status = instance._original_status
-            new_status = instance.status
-
-            if original_status and original_status != new_status:
-                if new_status == 'cancelled':
-                    # Interview cancelled
-                    notification_service.create_notification(
-                        recipient=candidate,
-                        notification_type='interview_cancelled',
-                        title='Interview Cancelled',
-                        message=f'Your interview for {job_title} scheduled on {instance.scheduled_datetime.strftime("%B %d, %Y")} has been cancelled',
-                        link=f'/dashboard',
-                        job_id=instance.application.job.id,
-                        application_id=instance.application.id,
-                        send_email=False  # We'll send custom email below
-                    )
-
-                    # Send cancellation email
-                    email_service.send_interview_cancelled_email(
-                        candidate=candidate,
-                        job_title=job_title,
-                        interview_datetime=instance.scheduled_datetime
-                    )
-
-                    logger.info(f"Interview cancelled notification sent for interview {instance.id}")
+            logger.info(f"Interview cancelled notification queued for interview {instance.id}")
 
     except Exception as e:
         logger.error(f"Error creating interview notification: {str(e)}")
@@ -1,3 +1,325 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from jobs.models import Application, Interview, Job
+from .models import Notification
+from .utils.email_outbox import EmailOutbox
+from .utils.interview_reminders import InterviewReminderScheduler
+from .utils.notification_service import NotificationService
+from .utils.unread_counter import unread_counter
+from .views import redeem_stream_ticket
+
+
+def notify(recipient, title='Hello'):
+    return NotificationService.create_notification(
+        recipient=recipient,
+        notification_type='system',
+        title=title,
+        message='Message',
+        send_email=False,
+    )
+
+
+def make_application():
+    recruiter = User.objects.create_user('rec@example.com', 'pw', role='recruiter')
+    candidate = User.objects.create_user('cand@example.com', 'pw', role='candidate')
+    job = Job.objects.create(
+        recruiter=recruiter, title='Python Developer', company_name='Acme', description='-',
+        requirements='-', responsibilities='-', job_type='full_time', location='Delhi',
+        required_skills='python', status='published'
+    )
+    return Application.objects.create(job=job, candidate=candidate, resume_text='-')
+
+
+class UnreadCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('cand@example.com', 'pw', role='candidate')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_per_process_cache_counts_from_the_table(self):
+        notify(self.user)
+        cache.set(unread_counter.count_key(self.user.id), 99)
+        self.assertEqual(unread_counter.get(self.user.id), 1)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_shared_counter_follows_creates_and_reads(self):
+        self.assertEqual(unread_counter.get(self.user.id), 0)
+        version = unread_counter.get_version(self.user.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            first = notify(self.user)
+            notify(self.user)
+        self.assertEqual(unread_counter.get(self.user.id), 2)
+        self.assertGreater(unread_counter.get_version(self.user.id), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.mark_as_read()
+        self.assertEqual(unread_counter.get(self.user.id), 1)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_reconcile_corrects_drifted_counters(self):
+        notify(self.user)
+        cache.set(unread_counter.count_key(self.user.id), 5)
+        self.assertEqual(unread_counter.reconcile([self.user.id]), 1)
+        self.assertEqual(unread_counter.get(self.user.id), 1)
+        self.assertEqual(unread_counter.reconcile([self.user.id]), 0)
+
+
+class StreamTicketTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('cand@example.com', 'pw', role='candidate')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_stream_is_disabled_without_shared_cache(self):
+        self.assertEqual(self.client.post('/api/notifications/stream_ticket/').status_code, 404)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_ticket_is_single_use(self):
+        response = self.client.post('/api/notifications/stream_ticket/')
+        self.assertEqual(response.status_code, 200)
+        ticket = response.data['ticket']
+        self.assertEqual(redeem_stream_ticket(ticket), self.user.id)
+        self.assertIsNone(redeem_stream_ticket(ticket))
+        self.assertIsNone(redeem_stream_ticket('made-up'))
+
+    @override_settings(SHARED_CACHE=True)
+    def test_ticket_of_deactivated_user_is_refused(self):
+        ticket = self.client.post('/api/notifications/stream_ticket/').data['ticket']
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertIsNone(redeem_stream_ticket(ticket))
+
+    @override_settings(SHARED_CACHE=True)
+    async def test_stream_refuses_missing_ticket_and_access_tokens(self):
+        response = await self.async_client.get('/api/notifications/stream/')
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get('/api/notifications/stream/', {'token': 'an-access-token'})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_answers_404_without_shared_cache(self):
+        response = await self.async_client.get('/api/notifications/stream/')
+        self.assertEqual(response.status_code, 404)
+
+
+class UnreadCountViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('cand@example.com', 'pw', role='candidate')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_count_is_not_modified(self):
+        notify(self.user)
+        response = self.client.get('/api/notifications/unread_count/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'count': 1})
+
+        etag = response['ETag']
+        response = self.client.get('/api/notifications/unread_count/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        notify(self.user)
+        response = self.client.get('/api/notifications/unread_count/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'count': 2})
+
+    def test_mark_all_as_read_resets_the_count(self):
+        notify(self.user)
+        notify(self.user)
+        response = self.client.post('/api/notifications/mark_all_as_read/')
+        self.assertEqual(response.data['count'], 2)
+        self.assertFalse(Notification.objects.filter(recipient=self.user, is_read=False).exists())
+        self.assertEqual(self.client.get('/api/notifications/unread_count/').data, {'count': 0})
+
+
+class InterviewReminderTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.application = make_application()
+        cls.candidate = cls.application.candidate
+
+    def interview(self, hours, status='scheduled'):
+        return Interview.objects.create(
+            application=self.application,
+            scheduled_datetime=timezone.now() + timedelta(hours=hours),
+            status=status
+        )
+
+    def test_reminds_scheduled_and_rescheduled_interviews_once(self):
+        scheduled = self.interview(2)
+        rescheduled = self.interview(5, status='rescheduled')
+        self.interview(3, status='cancelled')
+        self.interview(48)
+
+        scheduler = InterviewReminderScheduler(hours=24)
+        self.assertEqual(set(scheduler.due()), {scheduled, rescheduled})
+        self.assertEqual(scheduler.process_batch(), 2)
+        self.assertEqual(scheduler.process_batch(), 0)
+        self.assertEqual(
+            Notification.objects.filter(recipient=self.candidate, notification_type='interview_reminder').count(), 2
+        )
+
+
+@override_settings(
+    EMAIL_DELIVERY_BACKEND='smtp',
+    EMAIL_HOST_USER='noreply@example.com',
+    EMAIL_DIGEST_MINUTES={'new_application': 30, 'application_submitted': 30},
+)
+class EmailOutboxTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice@example.com', 'pw', role='recruiter')
+        cls.bob = User.objects.create_user('bob@example.com', 'pw', role='recruiter')
+
+    def setUp(self):
+        self.outbox = EmailOutbox()
+
+    def queue(self, recipient, notification_type='new_application', due=False, candidate='Carol'):
+        notification = NotificationService.create_notification(
+            recipient=recipient,
+            notification_type=notification_type,
+            title='New application',
+            message='-',
+            payload={'candidate_name': candidate, 'job_title': 'Python Developer'},
+        )
+        if due:
+            Notification.objects.filter(id=notification.id).update(
+                next_email_attempt_at=timezone.now() - timedelta(minutes=1)
+            )
+        return Notification.objects.get(id=notification.id)
+
+    def test_claimed_rows_are_leased(self):
+        due = self.queue(self.alice, due=True)
+        self.queue(self.alice)
+
+        self.assertEqual([n.id for n in self.outbox.claim_batch()], [due.id])
+        self.assertEqual(self.outbox.claim_batch(), [])
+        due.refresh_from_db()
+        self.assertGreater(due.next_email_attempt_at, timezone.now())
+
+    def test_digest_siblings_are_claimed_per_recipient_and_type(self):
+        alice_due = self.queue(self.alice, due=True)
+        alice_sibling = self.queue(self.alice)
+        alice_other_type = self.queue(self.alice, 'application_submitted')
+        bob_due = self.queue(self.bob, 'application_submitted', due=True)
+        bob_sibling = self.queue(self.bob, 'application_submitted')
+        bob_other_type = self.queue(self.bob)
+
+        claimed = self.outbox.claim_batch()
+        self.assertEqual({n.id for n in claimed}, {alice_due.id, bob_due.id})
+        siblings = self.outbox.claim_digest_siblings(claimed)
+        self.assertEqual({n.id for n in siblings}, {alice_sibling.id, bob_sibling.id})
+
+        # Rows of other pairs are not leased along the way
+        for notification in (alice_other_type, bob_other_type):
+            before = notification.next_email_attempt_at
+            notification.refresh_from_db()
+            self.assertEqual(notification.next_email_attempt_at, before)
+
+    def test_digest_is_sent_as_one_email(self):
+        self.queue(self.alice, due=True, candidate='Carol')
+        self.queue(self.alice, candidate='Dave')
+        self.queue(self.alice, candidate='Erin')
+
+        result = self.outbox.process_batch()
+        self.assertEqual(result, {'claimed': 3, 'sent': 3, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['alice@example.com'])
+        self.assertFalse(Notification.objects.exclude(email_status='sent').exists())
+
+    @override_settings(EMAIL_DELIVERY_BACKEND='resend', RESEND_API_KEY='', EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failed_send_backs_off_then_gives_up(self):
+        outbox = EmailOutbox()
+        notification = self.queue(self.alice, due=True)
+
+        self.assertEqual(outbox.process_batch()['failed'], 1)
+        notification.refresh_from_db()
+        self.assertEqual((notification.email_status, notification.email_attempts), ('pending', 1))
+        self.assertGreater(notification.next_email_attempt_at, timezone.now())
+
+        Notification.objects.filter(id=notification.id).update(next_email_attempt_at=timezone.now())
+        self.assertEqual(outbox.process_batch()['failed'], 1)
+        notification.refresh_from_db()
+        self.assertEqual((notification.email_status, notification.email_attempts), ('failed', 2))
+        self.assertIsNone(notification.next_email_attempt_at)
+
+
+class StatusChangeNotificationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.application = make_application()
+
+    def status_notifications(self):
+        return Notification.objects.filter(
+            recipient=self.application.candidate, notification_type='application_status_changed'
+        ).order_by('id')
+
+    def test_status_change_notifies_the_candidate_once(self):
+        application = Application.objects.get(id=self.application.id)
+        application.status = 'shortlisted'
+        self.assertEqual(application.changed_fields, {'status'})
+        application.save()
+
+        notification = self.status_notifications().get()
+        self.assertEqual(notification.payload['old_status'], 'Applied')
+        self.assertEqual(notification.payload['new_status'], 'Shortlisted')
+        self.assertEqual(notification.email_status, 'pending')
+
+        # The snapshot moves with the save: no repeat, and the next change starts from here
+        application.save()
+        application.status = 'rejected'
+        application.save()
+        self.assertEqual(
+            [n.payload['old_status'] for n in self.status_notifications()], ['Applied', 'Shortlisted']
+        )
+
+    def test_saves_that_do_not_write_a_new_status_are_silent(self):
+        application = Application.objects.get(id=self.application.id)
+        application.cover_letter = 'Updated'
+        application.save()
+        application.status = 'shortlisted'
+        application.save(update_fields=['cover_letter'])
+        self.assertFalse(self.status_notifications().exists())
+
+    def test_status_checked_without_rereading_the_row(self):
+        application = Application.objects.select_related('job', 'candidate').get(id=self.application.id)
+        application.status = 'shortlisted'
+        # UPDATE, notification INSERT and nothing else
+        with self.assertNumQueries(2):
+            application.save()
+
+    def test_interview_scheduled_and_cancelled(self):
+        interview = Interview.objects.create(
+            application=self.application, scheduled_datetime=timezone.now() + timedelta(days=2)
+        )
+        interview.location = 'Room 1'
+        interview.save()
+        interview.status = 'cancelled'
+        interview.save()
+        self.assertEqual(
+            list(Notification.objects.filter(
+                recipient=self.application.candidate, notification_type__startswith='interview'
+            ).order_by('id').values_list('notification_type', flat=True)),
+            ['interview_scheduled', 'interview_cancelled']
+        )
@@ -0,0 +1,219 @@
+import logging
+import random
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from ..models import Notification
+from .email_service import email_service, RESEND_BATCH_LIMIT
+from .notification_service import notification_service
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutbox:
+    """
+    Delivers notification emails queued by NotificationService
+
+    Pending rows are claimed in batches, their related applications are
+    loaded in one query, and the rendered emails go out through the
+    provider's batch API. Digest types (EMAIL_DIGEST_MINUTES) are rolled
+    into a single email per recipient. Failed rows are rescheduled with
+    exponential backoff. Every send carries an idempotency key derived from
+    the notifications it covers, so a retry after a crash or timeout never
+    sends a duplicate.
+    """
+
+    def __init__(self):
+        self.max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+        self.backoff_seconds = getattr(settings, 'EMAIL_OUTBOX_BACKOFF_SECONDS', 60)
+        self.lease_seconds = getattr(settings, 'EMAIL_OUTBOX_LEASE_SECONDS', 300)
+        self.digest_types = set(getattr(settings, 'EMAIL_DIGEST_MINUTES', {}))
+
+    def claim_batch(self, batch_size=50):
+        """
+        Claim up to batch_size due notifications
+
+        Claiming pushes next_email_attempt_at forward by the lease, so other
+        workers skip the rows while they are being sent, and a worker that
+        dies mid-batch only delays its rows until the lease runs out.
+        """
+        now = timezone.now()
+        return self._claim(
+            Notification.objects.filter(email_status='pending', next_email_attempt_at__lte=now),
+            now,
+            limit=batch_size
+        )
+
+    def claim_digest_siblings(self, claimed):
+        """
+        Claim the not-yet-due rows that belong in the same digests as claimed
+
+        A digest becomes due when its oldest row does; everything else the
+        recipient received of that type since then rides along.
+        """
+        groups = {
+            (n.recipient_id, n.notification_type)
+            for n in claimed
+            if n.notification_type in self.digest_types
+        }
+        if not groups:
+            return []
+
+        # Match each (recipient, type) pair exactly: recipient__in x type__in would
+        # also lease other pairs' rows and hold them back for a whole lease
+        in_groups = Q()
+        for recipient_id, notification_type in groups:
+            in_groups |= Q(recipient_id=recipient_id, notification_type=notification_type)
+
+        queryset = Notification.objects.filter(
+            in_groups,
+            email_status='pending'
+        ).exclude(id__in=[n.id for n in claimed])
+        return self._claim(queryset, timezone.now())
+
+    def _claim(self, queryset, now, limit=None):
+        with transaction.atomic():
+            queryset = queryset.order_by('next_email_attempt_at')
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+
+            ids = queryset.values_list('id', flat=True)
+            claimed_ids = list(ids[:limit] if limit else ids)
+            if not claimed_ids:
+                return []
+
+            Notification.objects.filter(id__in=claimed_ids).update(
+                next_email_attempt_at=now + timedelta(seconds=self.lease_seconds)
+            )
+
+        return list(Notification.objects.filter(id__in=claimed_ids).select_related('recipient'))
+
+    def build_messages(self, notifications):
+        """
+        Render emails for a batch of claimed notifications
+
+        Returns:
+            (messages, unsendable) where messages is a list of
+            (message dict, [notifications it covers]) and unsendable lists
+            notifications that have no email to send. Messages are rendered
+            together, one template at a time.
+        """
+        specs = []
+        unsendable = []
+
+        digests = defaultdict(list)
+        singles = []
+        for notification in notifications:
+            if notification.notification_type in self.digest_types:
+                digests[(notification.recipient_id, notification.notification_type)].append(notification)
+            else:
+                singles.append(notification)
+
+        for group in digests.values():
+            if len(group) == 1:
+                singles.append(group[0])
+                continue
+            spec = notification_service.build_digest_email(group[0].recipient, group, render=False)
+            if spec:
+                specs.append((spec, group))
+            else:
+                unsendable.extend(group)
+
+        for notification in singles:
+            spec = notification_service.build_notification_email(notification, render=False)
+            if spec:
+                specs.append((spec, [notification]))
+            else:
+                unsendable.append(notification)
+
+        rendered = email_service.render_messages([spec for spec, _ in specs])
+        messages = [(message, covered) for message, (_, covered) in zip(rendered, specs)]
+        return messages, unsendable
+
+    def _send_chunk(self, chunk):
+        """Send up to one provider batch; returns one boolean per message"""
+        keys = sorted(str(n.idempotency_key) for _, covered in chunk for n in covered)
+        batch_key = uuid.uuid5(uuid.NAMESPACE_OID, ','.join(keys))
+        return email_service.send_batch([message for message, _ in chunk], idempotency_key=batch_key)
+
+    def process_batch(self, batch_size=50, workers=4):
+        """
+        Claim and deliver one batch
+
+        Returns:
+            Dict with claimed, sent and failed counts
+        """
+        claimed = self.claim_batch(batch_size)
+        if not claimed:
+            return {'claimed': 0, 'sent': 0, 'failed': 0}
+        claimed += self.claim_digest_siblings(claimed)
+
+        messages, unsendable = self.build_messages(claimed)
+        chunks = [messages[i:i + RESEND_BATCH_LIMIT] for i in range(0, len(messages), RESEND_BATCH_LIMIT)]
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = [result for chunk_results in pool.map(self._send_chunk, chunks) for result in chunk_results]
+
+        sent, failed = [], []
+        for (_, covered), result in zip(messages, results):
+            (sent if result else failed).extend(covered)
+
+        self._mark_sent(sent)
+        for notification in failed:
+            self._schedule_retry(notification)
+        self._mark_unsendable(unsendable)
+
+        return {'claimed': len(claimed), 'sent': len(sent), 'failed': len(failed) + len(unsendable)}
+
+    def _mark_sent(self, notifications):
+        if not notifications:
+            return
+        now = timezone.now()
+        Notification.objects.filter(id__in=[n.id for n in notifications]).update(
+            is_emailed=True,
+            email_status='sent',
+            email_sent_at=now,
+            email_attempts=F('email_attempts') + 1,
+            next_email_attempt_at=None,
+            updated_at=now
+        )
+
+    def _mark_unsendable(self, notifications):
+        """Notifications whose type has no email or whose application is gone"""
+        if not notifications:
+            return
+        Notification.objects.filter(id__in=[n.id for n in notifications]).update(
+            email_status='failed',
+            next_email_attempt_at=None
+        )
+        logger.warning(f"{len(notifications)} notifications have no email to send")
+
+    def _schedule_retry(self, notification):
+        attempts = notification.email_attempts + 1
+
+        if attempts >= self.max_attempts:
+            Notification.objects.filter(id=notification.id).update(
+                email_status='failed',
+                email_attempts=attempts,
+                next_email_attempt_at=None
+            )
+            logger.error(f"Giving up on email for notification {notification.id} after {attempts} attempts")
+            return
+
+        # Exponential backoff with jitter so failed rows don't retry in lockstep
+        delay = self.backoff_seconds * (2 ** (attempts - 1))
+        delay = delay * random.uniform(0.8, 1.2)
+        Notification.objects.filter(id=notification.id).update(
+            email_attempts=attempts,
+            next_email_attempt_at=timezone.now() + timedelta(seconds=delay)
+        )
+        logger.warning(f"Email for notification {notification.id} failed, retry {attempts} in {int(delay)}s")
+
+
+# Global instance
+email_outbox = EmailOutbox()
@@ -1,18 +1,82 @@
 import logging
 import resend
 from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from .email_templates import email_renderer, greeting_name
 
 logger = logging.getLogger(__name__)
 
+# Resend accepts at most this many emails per batch request
+RESEND_BATCH_LIMIT = 100
+
+STATUS_EMOJI = {
+    'Under Review': '👀', 'Shortlisted': '⭐', 'OA Round': '📝',
+    'Tech Round': '💻', 'HR Round': '🤝', 'Offer Received': '🎉',
+    'Rejected': '😔', 'Accepted': '✅'
+}
+
+INTERVIEW_TYPE_EMOJI = {'phone': '📞', 'video': '🎥', 'in_person': '🏢'}
+
 
 class EmailService:
     """
     Email service using Resend API (works on cloud servers like Render).
+
+    Bulk delivery goes through send_batch, which uses the Resend batch
+    endpoint or, with EMAIL_DELIVERY_BACKEND = 'smtp', a single reused SMTP
+    connection.
+
+    HTML comes from the precompiled templates in email_templates; every
+    message carries a generated plain-text alternative.
     """
 
-    def send_email(self, to_email, subject, html_content):
+    def build_email(self, to_email, subject, template, context, theme='default', render=True):
+        """
+        Build a message dict from an email template
+
+        Args:
+            to_email: Recipient address
+            subject: Subject line
+            template: Template name in notifications/emails
+            context: Template variables
+            theme: Colour theme from email_templates.THEMES
+            render: If False, return the unrendered spec for render_messages
+
+        Returns:
+            Dict with 'to', 'subject', 'html' and 'text' (or the spec when render=False)
+        """
+        spec = {'to': to_email, 'subject': subject, 'template': template, 'context': context, 'theme': theme}
+        if not render:
+            return spec
+        return self.render_messages([spec])[0]
+
+    def render_messages(self, specs):
+        """
+        Render many unrendered specs, one pass per template
+
+        Returns:
+            Message dicts in the same order as specs
+        """
+        groups = {}
+        for index, spec in enumerate(specs):
+            groups.setdefault((spec['template'], spec['theme']), []).append(index)
+
+        messages = [None] * len(specs)
+        for (template, theme), indexes in groups.items():
+            rendered = email_renderer.render_many(template, [specs[i]['context'] for i in indexes], theme)
+            for index, (html, text) in zip(indexes, rendered):
+                spec = specs[index]
+                messages[index] = {'to': spec['to'], 'subject': spec['subject'], 'html': html, 'text': text}
+        return messages
+
+    def send_message(self, message, idempotency_key=None):
+        return self.send_email(message['to'], message['subject'], message['html'], idempotency_key,
+                               text_content=message.get('text'))
+
+    def send_email(self, to_email, subject, html_content, idempotency_key=None, text_content=None):
         api_key = getattr(settings, 'RESEND_API_KEY', '')
-        from_name = getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI')
+        from_name = email_renderer.base_context['from_name']
 
         if not api_key:
             logger.warning("RESEND_API_KEY not configured. Email not sent.")
@@ -26,13 +90,103 @@ class EmailService:
                 "subject": subject,
                 "html": html_content,
             }
-            resend.Emails.send(params)
+            if text_content:
+                params["text"] = text_content
+            # Resend drops repeats of the same key, so retries never duplicate an email
+            options = {"idempotency_key": str(idempotency_key)} if idempotency_key else None
+            resend.Emails.send(params, options)
             logger.info(f"Email sent successfully to {to_email}")
             return True
         except Exception as e:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
             return False
 
+    def send_batch(self, messages, idempotency_key=None):
+        """
+        Send many emails with as few provider round trips as possible
+
+        Args:
+            messages: List of dicts with 'to', 'subject', 'html' and optionally 'text'
+            idempotency_key: Optional key identifying this exact batch
+
+        Returns:
+            List of booleans, one per message, True if it was sent
+        """
+        if not messages:
+            return []
+
+        backend = getattr(settings, 'EMAIL_DELIVERY_BACKEND', 'resend')
+        if backend == 'smtp':
+            return self._send_batch_smtp(messages)
+        return self._send_batch_resend(messages, idempotency_key)
+
+    def _send_batch_resend(self, messages, idempotency_key=None):
+        api_key = getattr(settings, 'RESEND_API_KEY', '')
+        from_name = email_renderer.base_context['from_name']
+
+        if not api_key:
+            logger.warning("RESEND_API_KEY not configured. Emails not sent.")
+            return [False] * len(messages)
+
+        results = []
+        resend.api_key = api_key
+
+        for start in range(0, len(messages), RESEND_BATCH_LIMIT):
+            chunk = messages[start:start + RESEND_BATCH_LIMIT]
+            params = [
+                {
+                    "from": f"{from_name} <onboarding@resend.dev>",
+                    "to": [message['to']],
+                    "subject": message['subject'],
+                    "html": message['html'],
+                    **({"text": message['text']} if message.get('text') else {}),
+                }
+                for message in chunk
+            ]
+            options = {"idempotency_key": f"{idempotency_key}-{start}"} if idempotency_key else None
+
+            try:
+                # Strict validation: the whole chunk is accepted or rejected
+                resend.Batch.send(params, options)
+                results.extend([True] * len(chunk))
+                logger.info(f"Batch of {len(chunk)} emails sent successfully")
+            except Exception as e:
+                logger.error(f"Failed to send batch of {len(chunk)} emails: {str(e)}")
+                results.extend([False] * len(chunk))
+
+        return results
+
+    def _send_batch_smtp(self, messages):
+        from_name = email_renderer.base_context['from_name']
+        from_email = f"{from_name} <{settings.EMAIL_HOST_USER}>"
+        results = []
+
+        # One connection for the whole batch instead of a handshake per email
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for message in messages:
+                email = EmailMultiAlternatives(
+                    subject=message['subject'],
+                    body=message.get('text', ''),
+                    from_email=from_email,
+                    to=[message['to']],
+                    connection=connection
+                )
+                email.attach_alternative(message['html'], 'text/html')
+                try:
+                    results.append(email.send() == 1)
+                except Exception as e:
+                    logger.error(f"Failed to send email to {message['to']}: {str(e)}")
+                    results.append(False)
+        except Exception as e:
+            logger.error(f"SMTP connection failed: {str(e)}")
+            results.extend([False] * (len(messages) - len(results)))
+        finally:
+            connection.close()
+
+        return results
+
     def send_otp_email(self, user, otp_code, purpose):
         if purpose == 'registration':
             subject = "Verify Your Email - TalentBridge AI"
@@ -41,238 +195,115 @@ class EmailService:
             subject = "Your Login OTP - TalentBridge AI"
             action_text = "log in to your account"
 
-        from_name = getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI')
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                          color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .otp-box {{ background: white; border: 2px dashed #667eea; padding: 20px;
-                           text-align: center; margin: 20px 0; border-radius: 10px; }}
-                .otp-code {{ font-size: 40px; font-weight: bold; color: #667eea; letter-spacing: 8px; }}
-                .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header"><h1>🔐 Your OTP Code</h1></div>
-                <div class="content">
-                    <p>Hi {user.first_name or user.email.split('@')[0]},</p>
-                    <p>Use the OTP below to {action_text}:</p>
-                    <div class="otp-box">
-                        <div class="otp-code">{otp_code}</div>
-                        <p style="color: #666; margin-top: 10px;">Valid for 10 minutes</p>
-                    </div>
-                    <p>If you did not request this, please ignore this email.</p>
-                </div>
-                <div class="footer"><p>© 2024 {from_name}. All rights reserved.</p></div>
-            </div>
-        </body>
-        </html>
-        """
-        return self.send_email(user.email, subject, html_content)
-
-    def send_application_submitted_email(self, user, job_title, application_id):
-        subject = f"Application Submitted - {job_title}"
-        from_name = getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI')
-        html_content = f"""
-        <!DOCTYPE html><html><head><style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .button {{ background: #667eea; color: white; padding: 12px 30px; text-decoration: none;
-                      border-radius: 5px; display: inline-block; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-        </style></head><body>
-            <div class="container">
-                <div class="header"><h1>🎉 Application Submitted!</h1></div>
-                <div class="content">
-                    <p>Hi {user.first_name or user.email.split('@')[0]},</p>
-                    <p>Your application for <strong>{job_title}</strong> has been submitted successfully!</p>
-                    <p>The recruiter will review your application and get back to you soon.</p>
-                    <a href="{settings.FRONTEND_URL}/dashboard" class="button">View Application Status</a>
-                    <p>Good luck! 🚀</p>
-                </div>
-                <div class="footer"><p>© 2024 {from_name}. All rights reserved.</p></div>
-            </div>
-        </body></html>
-        """
-        return self.send_email(user.email, subject, html_content)
-
-    def send_application_status_changed_email(self, user, job_title, old_status, new_status, application_id):
-        subject = f"Application Status Update - {job_title}"
-        from_name = getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI')
-        status_emoji = {
-            'Under Review': '👀', 'Shortlisted': '⭐', 'OA Round': '📝',
-            'Tech Round': '💻', 'HR Round': '🤝', 'Offer Received': '🎉',
-            'Rejected': '😔', 'Accepted': '✅'
-        }
-        emoji = status_emoji.get(new_status, '📬')
-        html_content = f"""
-        <!DOCTYPE html><html><head><style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .status-box {{ background: white; padding: 20px; border-left: 4px solid #667eea;
-                          margin: 20px 0; border-radius: 5px; }}
-            .button {{ background: #667eea; color: white; padding: 12px 30px; text-decoration: none;
-                      border-radius: 5px; display: inline-block; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-        </style></head><body>
-            <div class="container">
-                <div class="header"><h1>{emoji} Application Status Updated</h1></div>
-                <div class="content">
-                    <p>Hi {user.first_name or user.email.split('@')[0]},</p>
-                    <p>Your application for <strong>{job_title}</strong> has been updated.</p>
-                    <div class="status-box"><p><strong>New Status:</strong> {new_status}</p></div>
-                    <a href="{settings.FRONTEND_URL}/dashboard" class="button">View Details</a>
-                </div>
-                <div class="footer"><p>© 2024 {from_name}. All rights reserved.</p></div>
-            </div>
-        </body></html>
-        """
-        return self.send_email(user.email, subject, html_content)
-
-    def send_new_application_email(self, recruiter, candidate_name, job_title, application_id):
-        subject = f"New Application Received - {job_title}"
-        from_name = getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI')
-        html_content = f"""
-        <!DOCTYPE html><html><head><style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .candidate-box {{ background: white; padding: 20px; margin: 20px 0; border-radius: 5px; }}
-            .button {{ background: #667eea; color: white; padding: 12px 30px; text-decoration: none;
-                      border-radius: 5px; display: inline-block; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-        </style></head><body>
-            <div class="container">
-                <div class="header"><h1>📬 New Application Received!</h1></div>
-                <div class="content">
-                    <p>Hi {recruiter.first_name or recruiter.email.split('@')[0]},</p>
-                    <p>You have received a new application for <strong>{job_title}</strong>.</p>
-                    <div class="candidate-box"><p><strong>Candidate:</strong> {candidate_name}</p></div>
-                    <a href="{settings.FRONTEND_URL}/dashboard" class="button">Review Application</a>
-                </div>
-                <div class="footer"><p>© 2024 {from_name}. All rights reserved.</p></div>
-            </div>
-        </body></html>
-        """
-        return self.send_email(recruiter.email, subject, html_content)
-
-    def send_interview_scheduled_email(self, candidate, job_title, interview_datetime, interview_type, location, notes=""):
-        type_emoji = {'phone': '📞', 'video': '🎥', 'in_person': '🏢'}.get(interview_type, '📅')
-        type_display = interview_type.replace('_', ' ').title()
-        formatted_date = interview_datetime.strftime("%A, %B %d, %Y")
-        formatted_time = interview_datetime.strftime("%I:%M %p")
-        from_name = getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI')
-        subject = f"Interview Scheduled - {job_title}"
-        html_content = f"""
-        <!DOCTYPE html><html><head><style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .interview-box {{ background: white; padding: 20px; margin: 20px 0; border-radius: 5px;
-                             border-left: 4px solid #10b981; }}
-            .button {{ background: #10b981; color: white; padding: 12px 30px; text-decoration: none;
-                      border-radius: 5px; display: inline-block; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-        </style></head><body>
-            <div class="container">
-                <div class="header"><h1>{type_emoji} Interview Scheduled!</h1></div>
-                <div class="content">
-                    <p>Hi {candidate.first_name or candidate.email.split('@')[0]},</p>
-                    <p>Your interview for <strong>{job_title}</strong> has been scheduled.</p>
-                    <div class="interview-box">
-                        <p><strong>Date:</strong> {formatted_date}</p>
-                        <p><strong>Time:</strong> {formatted_time}</p>
-                        <p><strong>Type:</strong> {type_display}</p>
-                        {f'<p><strong>Location/Link:</strong> {location}</p>' if location else ''}
-                        {f'<p><strong>Notes:</strong> {notes}</p>' if notes else ''}
-                    </div>
-                    <a href="{settings.FRONTEND_URL}/dashboard" class="button">View Details</a>
-                </div>
-                <div class="footer"><p>© 2024 {from_name}. All rights reserved.</p></div>
-            </div>
-        </body></html>
-        """
-        return self.send_email(candidate.email, subject, html_content)
-
-    def send_interview_cancelled_email(self, candidate, job_title, interview_datetime):
-        formatted_date = interview_datetime.strftime("%A, %B %d, %Y at %I:%M %p")
-        from_name = getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI')
-        subject = f"Interview Cancelled - {job_title}"
-        html_content = f"""
-        <!DOCTYPE html><html><head><style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .info-box {{ background: white; padding: 20px; margin: 20px 0; border-radius: 5px;
-                       border-left: 4px solid #ef4444; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-        </style></head><body>
-            <div class="container">
-                <div class="header"><h1>❌ Interview Cancelled</h1></div>
-                <div class="content">
-                    <p>Hi {candidate.first_name or candidate.email.split('@')[0]},</p>
-                    <p>Your interview for <strong>{job_title}</strong> has been cancelled.</p>
-                    <div class="info-box">
-                        <p><strong>Originally scheduled for:</strong> {formatted_date}</p>
-                    </div>
-                    <p>The recruiter will contact you if they wish to reschedule.</p>
-                </div>
-                <div class="footer"><p>© 2024 {from_name}. All rights reserved.</p></div>
-            </div>
-        </body></html>
+        message = self.build_email(user.email, subject, 'otp', {
+            'greeting_name': greeting_name(user),
+            'action_text': action_text,
+            'otp_code': otp_code,
+        })
+        return self.send_message(message)
+
+    def send_application_submitted_email(self, user, job_title, application_id, idempotency_key=None):
+        message = self.build_application_submitted_email(user, job_title, application_id)
+        return self.send_message(message, idempotency_key)
+
+    def build_application_submitted_email(self, user, job_title, application_id, render=True):
+        return self.build_email(user.email, f"Application Submitted - {job_title}", 'application_submitted', {
+            'greeting_name': greeting_name(user),
+            'job_title': job_title,
+        }, render=render)
+
+    def send_application_status_changed_email(self, user, job_title, old_status, new_status, application_id,
+                                              idempotency_key=None):
+        message = self.build_application_status_changed_email(user, job_title, old_status, new_status, application_id)
+        return self.send_message(message, idempotency_key)
+
+    def build_application_status_changed_email(self, user, job_title, old_status, new_status, application_id,
+                                               render=True):
+        return self.build_email(user.email, f"Application Status Update - {job_title}", 'application_status_changed', {
+            'greeting_name': greeting_name(user),
+            'job_title': job_title,
+            'new_status': new_status,
+            'status_emoji': STATUS_EMOJI.get(new_status, '📬'),
+        }, render=render)
+
+    def send_new_application_email(self, recruiter, candidate_name, job_title, application_id, idempotency_key=None):
+        message = self.build_new_application_email(recruiter, candidate_name, job_title, application_id)
+        return self.send_message(message, idempotency_key)
+
+    def build_new_application_email(self, recruiter, candidate_name, job_title, application_id, render=True):
+        return self.build_email(recruiter.email, f"New Application Received - {job_title}", 'new_application', {
+            'greeting_name': greeting_name(recruiter),
+            'candidate_name': candidate_name,
+            'job_title': job_title,
+        }, render=render)
+
+    def build_new_application_digest_email(self, recruiter, applications, render=True):
         """
-        return self.send_email(candidate.email, subject, html_content)
-
-    def send_job_match_email(self, user, job_title, company, job_id):
-        subject = f"New Job Match: {job_title}"
-        from_name = getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI')
-        html_content = f"""
-        <!DOCTYPE html><html><head><style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                      color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .job-box {{ background: white; padding: 20px; margin: 20px 0; border-radius: 5px; }}
-            .button {{ background: #667eea; color: white; padding: 12px 30px; text-decoration: none;
-                      border-radius: 5px; display: inline-block; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-        </style></head><body>
-            <div class="container">
-                <div class="header"><h1>🎯 Perfect Job Match Found!</h1></div>
-                <div class="content">
-                    <p>Hi {user.first_name or user.email.split('@')[0]},</p>
-                    <p>We found a job that matches your profile!</p>
-                    <div class="job-box">
-                        <h3>{job_title}</h3>
-                        <p><strong>Company:</strong> {company}</p>
-                    </div>
-                    <a href="{settings.FRONTEND_URL}/jobs/{job_id}" class="button">View Job</a>
-                </div>
-                <div class="footer"><p>© 2024 {from_name}. All rights reserved.</p></div>
-            </div>
-        </body></html>
+        Roll many new applications into one email
+
+        Args:
+            recruiter: Recipient
+            applications: List of (candidate_name, job_title) tuples
         """
-        return self.send_email(user.email, subject, html_content)
+        subject = f"{len(applications)} New Applications Received"
+        return self.build_email(recruiter.email, subject, 'new_application_digest', {
+            'greeting_name': greeting_name(recruiter),
+            'applications': applications,
+        }, render=render)
+
+    def send_interview_scheduled_email(self, candidate, job_title, interview_datetime, interview_type, location, notes="",
+                                       idempotency_key=None):
+        message = self.build_interview_scheduled_email(
+            candidate, job_title, interview_datetime, interview_type, location, notes
+        )
+        return self.send_message(message, idempotency_key)
+
+    def build_interview_scheduled_email(self, candidate, job_title, interview_datetime, interview_type, location,
+                                        notes="", render=True):
+        return self.build_email(candidate.email, f"Interview Scheduled - {job_title}", 'interview_scheduled', {
+            'greeting_name': greeting_name(candidate),
+            'job_title': job_title,
+            'type_emoji': INTERVIEW_TYPE_EMOJI.get(interview_type, '📅'),
+            'type_display': interview_type.replace('_', ' ').title(),
+            'formatted_date': interview_datetime.strftime("%A, %B %d, %Y"),
+            'formatted_time': interview_datetime.strftime("%I:%M %p"),
+            'location': location,
+            'notes': notes,
+        }, theme='success', render=render)
+
+    def build_interview_reminder_email(self, candidate, job_title, interview_datetime, interview_type, location,
+                                       render=True):
+        return self.build_email(candidate.email, f"Interview Reminder - {job_title}", 'interview_reminder', {
+            'greeting_name': greeting_name(candidate),
+            'job_title': job_title,
+            'type_display': interview_type.replace('_', ' ').title(),
+            'formatted_date': interview_datetime.strftime("%A, %B %d, %Y"),
+            'formatted_time': interview_datetime.strftime("%I:%M %p"),
+            'location': location,
+        }, theme='success', render=render)
+
+    def send_interview_cancelled_email(self, candidate, job_title, interview_datetime, idempotency_key=None):
+        message = self.build_interview_cancelled_email(candidate, job_title, interview_datetime)
+        return self.send_message(message, idempotency_key)
+
+    def build_interview_cancelled_email(self, candidate, job_title, interview_datetime, render=True):
+        return self.build_email(candidate.email, f"Interview Cancelled - {job_title}", 'interview_cancelled', {
+            'greeting_name': greeting_name(candidate),
+            'job_title': job_title,
+            'formatted_date': interview_datetime.strftime("%A, %B %d, %Y at %I:%M %p"),
+        }, theme='danger', render=render)
+
+    def send_job_match_email(self, user, job_title, company, job_id, idempotency_key=None):
+        message = self.build_job_match_email(user, job_title, company, job_id)
+        return self.send_message(message, idempotency_key)
+
+    def build_job_match_email(self, user, job_title, company, job_id, render=True):
+        return self.build_email(user.email, f"New Job Match: {job_title}", 'job_match', {
+            'greeting_name': greeting_name(user),
+            'job_title': job_title,
+            'company': company,
+            'job_id': job_id,
+        }, render=render)
 
 
 # Global instance
@@ -0,0 +1,103 @@
+"""
+Email template rendering
+
+Templates live in notifications/templates/notifications/emails and share one
+layout (base.html). Each template is parsed and compiled once per process and
+reused for every send, so rendering a batch only costs the context merge.
+"""
+import re
+from functools import lru_cache
+from html import unescape
+
+from django.conf import settings
+from django.template.loader import get_template
+from django.utils.functional import cached_property
+
+TEMPLATE_DIR = 'notifications/emails'
+
+# Header/button colours per theme
+THEMES = {
+    'default': {'accent': '#667eea', 'accent_dark': '#764ba2'},
+    'success': {'accent': '#10b981', 'accent_dark': '#059669'},
+    'danger': {'accent': '#ef4444', 'accent_dark': '#dc2626'},
+}
+
+_STYLE_RE = re.compile(r'<(style|head)[^>]*>.*?</\1>', re.S | re.I)
+_LINK_RE = re.compile(r'<a\s[^>]*href="([^"]*)"[^>]*>(.*?)</a>', re.S | re.I)
+_BLOCK_RE = re.compile(r'</?(p|div|h[1-6]|br|tr|li)[^>]*>', re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'[ \t]+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+@lru_cache(maxsize=None)
+def _compiled(name):
+    return get_template(f"{TEMPLATE_DIR}/{name}.html")
+
+
+def html_to_text(html):
+    """
+    Build the plain-text alternative for an HTML email
+
+    Links keep their URL ("View Job (https://...)") so the text part stays usable.
+    """
+    text = _STYLE_RE.sub('', html)
+    text = _LINK_RE.sub(lambda m: f"{m.group(2).strip()} ({m.group(1)})", text)
+    text = _BLOCK_RE.sub('\n', text)
+    text = unescape(_TAG_RE.sub('', text))
+    lines = (_SPACE_RE.sub(' ', line).strip() for line in text.splitlines())
+    return _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+
+
+class EmailTemplateRenderer:
+    """Render email templates into (html, text) pairs"""
+
+    @cached_property
+    def base_context(self):
+        # Settings are read once per process rather than on every send
+        return {
+            'from_name': getattr(settings, 'EMAIL_FROM_NAME', 'TalentBridge AI'),
+            'frontend_url': settings.FRONTEND_URL,
+        }
+
+    def get_template(self, name):
+        return _compiled(name)
+
+    def render(self, name, context, theme='default'):
+        """
+        Render one email
+
+        Args:
+            name: Template name without extension, e.g. 'job_match'
+            context: Template variables for this recipient
+            theme: Key of THEMES used for the header and buttons
+
+        Returns:
+            Tuple of (html, text)
+        """
+        template = self.get_template(name)
+        html = template.render({**self.base_context, **THEMES[theme], **context})
+        return html, html_to_text(html)
+
+    def render_many(self, name, contexts, theme='default'):
+        """
+        Render the same template for many recipients
+
+        Returns:
+            List of (html, text) tuples in the order of contexts
+        """
+        template = self.get_template(name)
+        shared = {**self.base_context, **THEMES[theme]}
+        rendered = []
+        for context in contexts:
+            html = template.render({**shared, **context})
+            rendered.append((html, html_to_text(html)))
+        return rendered
+
+
+def greeting_name(user):
+    return user.first_name or user.email.split('@')[0]
+
+
+# Global instance
+email_renderer = EmailTemplateRenderer()
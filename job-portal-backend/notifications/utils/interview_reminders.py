@@ -0,0 +1,89 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from jobs.models import Interview
+from jobs.utils.interview_scheduling import BUSY_STATUSES
+from .notification_service import notification_service
+
+logger = logging.getLogger(__name__)
+
+
+class InterviewReminderScheduler:
+    """
+    Queue reminders for interviews starting within INTERVIEW_REMINDER_HOURS
+
+    Due interviews are found with a range scan on the
+    (scheduled_datetime, status) index. Each batch is claimed, turned into
+    reminder notifications (one bulk INSERT, emails go through the outbox)
+    and flagged reminder_sent in one transaction. Where the database
+    supports SKIP LOCKED, several workers can run at once without sending
+    a reminder twice.
+    """
+
+    def __init__(self, hours=None):
+        self.hours = hours if hours is not None else getattr(settings, 'INTERVIEW_REMINDER_HOURS', 24)
+
+    def due(self, now=None):
+        """Upcoming interviews still on the calendar (scheduled or rescheduled) and not yet reminded"""
+        now = now or timezone.now()
+        return Interview.objects.filter(
+            scheduled_datetime__gt=now,
+            scheduled_datetime__lte=now + timedelta(hours=self.hours),
+            status__in=BUSY_STATUSES,
+            reminder_sent=False
+        )
+
+    def process_batch(self, batch_size=500, now=None):
+        """
+        Claim and remind one batch of due interviews
+
+        Returns:
+            Number of interviews reminded
+        """
+        with transaction.atomic():
+            queryset = (
+                self.due(now)
+                .select_related('application__job', 'application__candidate')
+                .order_by('scheduled_datetime')
+            )
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True, of=('self',))
+            interviews = list(queryset[:batch_size])
+            if not interviews:
+                return 0
+
+            notification_service.create_notifications([
+                self.reminder_data(interview) for interview in interviews
+            ], send_email=True)
+            Interview.objects.filter(id__in=[interview.id for interview in interviews]).update(reminder_sent=True)
+
+        logger.info(f"Queued reminders for {len(interviews)} interviews")
+        return len(interviews)
+
+    @staticmethod
+    def reminder_data(interview):
+        """create_notification arguments for one interview's reminder"""
+        application = interview.application
+        job_title = application.job.title
+        return {
+            'recipient': application.candidate,
+            'notification_type': 'interview_reminder',
+            'title': 'Interview Reminder',
+            'message': f'Reminder: your interview for {job_title} is on '
+                       f'{timezone.localtime(interview.scheduled_datetime).strftime("%B %d, %Y at %I:%M %p")}',
+            'link': '/dashboard',
+            'job_id': application.job_id,
+            'application_id': application.id,
+            'payload': {
+                'job_title': job_title,
+                'scheduled_at': interview.scheduled_datetime.isoformat(),
+                'interview_type': interview.interview_type,
+                'location': interview.location,
+            },
+        }
+
+
+# Global instance
+interview_reminder_scheduler = InterviewReminderScheduler()
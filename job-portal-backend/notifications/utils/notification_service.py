@@ -1,7 +1,13 @@
 import logging
+from collections import Counter
+from datetime import timedelta
 from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from jobs.models import Application
 from ..models import Notification
 from .email_service import email_service
+from .unread_counter import unread_counter
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +27,16 @@ class NotificationService:
         link=None,
         job_id=None,
         application_id=None,
-        send_email=True
+        send_email=True,
+        payload=None
     ):
         """
-        Create a notification and optionally send email
+        Create a notification and optionally queue an email
+
+        The email is not sent here: the row is written with
+        email_status='pending' in the caller's transaction and delivered
+        later by the send_pending_emails worker, so the request never waits
+        on the email provider.
 
         Args:
             recipient: User instance
@@ -34,12 +46,13 @@ class NotificationService:
             link: Optional link to relevant page
             job_id: Optional related job ID
             application_id: Optional related application ID
-            send_email: Whether to send email notification
+            send_email: Whether to queue an email notification
+            payload: Data the email is rendered from (job_title, candidate_name, ...)
 
         Returns:
             Notification instance
         """
-        # Create in-app notification
+        # Create in-app notification (and its outbox entry if emailing)
         notification = Notification.objects.create(
             recipient=recipient,
             notification_type=notification_type,
@@ -47,70 +60,216 @@ class NotificationService:
             message=message,
             link=link,
             job_id=job_id,
-            application_id=application_id
+            application_id=application_id,
+            payload=payload or {},
+            email_status='pending' if send_email else 'not_requested',
+            next_email_attempt_at=NotificationService.first_email_attempt_at(notification_type) if send_email else None
         )
 
-        logger.info(f"Created notification: {notification.id} for {recipient.email}")
+        unread_counter.adjust_on_commit(recipient.id, 1)
 
-        # Send email if requested
-        if send_email:
-            notification_service.send_notification_email(notification)
+        logger.info(f"Created notification: {notification.id} for {recipient.email}")
 
         return notification
 
     @staticmethod
-    def send_notification_email(notification):
-        """Send email for a notification based on type"""
-        try:
-            notification_type = notification.notification_type
+    def create_notifications(notifications, send_email=True):
+        """
+        Create many notifications with a single bulk INSERT
+
+        Bulk counterpart of create_notification for batch operations; emails
+        are queued on the outbox exactly the same way.
+
+        Args:
+            notifications: List of dicts with create_notification arguments
+                (recipient, notification_type, title, message, link, job_id,
+                application_id, payload)
+            send_email: Whether to queue an email for each notification
+
+        Returns:
+            List of created Notification instances
+        """
+        objects = [
+            Notification(
+                recipient=data['recipient'],
+                notification_type=data['notification_type'],
+                title=data['title'],
+                message=data['message'],
+                link=data.get('link'),
+                job_id=data.get('job_id'),
+                application_id=data.get('application_id'),
+                payload=data.get('payload') or {},
+                email_status='pending' if send_email else 'not_requested',
+                next_email_attempt_at=(
+                    NotificationService.first_email_attempt_at(data['notification_type']) if send_email else None
+                )
+            )
+            for data in notifications
+        ]
+        created = Notification.objects.bulk_create(objects, batch_size=500)
+
+        for recipient_id, count in Counter(n.recipient_id for n in created).items():
+            unread_counter.adjust_on_commit(recipient_id, count)
+
+        logger.info(f"Created {len(created)} notifications in bulk")
+
+        return created
+
+    @staticmethod
+    def application_status_changed_data(application, original_status):
+        """
+        Notification for a candidate whose application moved out of original_status
+
+        Returns:
+            Dict of create_notification arguments
+        """
+        job_title = application.job.title
+        return {
+            'recipient': application.candidate,
+            'notification_type': 'application_status_changed',
+            'title': 'Application Status Updated',
+            'message': f'Your application for {job_title} status changed to {application.status}',
+            'link': '/dashboard',
+            'job_id': application.job_id,
+            'application_id': application.id,
+            'payload': {
+                'job_title': job_title,
+                'old_status': dict(Application.STATUS_CHOICES).get(original_status, original_status),
+                'new_status': application.get_status_display(),
+            },
+        }
+
+    @staticmethod
+    def first_email_attempt_at(notification_type):
+        """
+        When a newly queued email becomes due
+
+        Digest types (EMAIL_DIGEST_MINUTES) wait out their window so the
+        worker can roll everything that arrives meanwhile into one email.
+        """
+        digest_minutes = getattr(settings, 'EMAIL_DIGEST_MINUTES', {}).get(notification_type)
+        if digest_minutes:
+            return timezone.now() + timedelta(minutes=digest_minutes)
+        return timezone.now()
+
+    @staticmethod
+    def build_notification_email(notification, render=True):
+        """
+        Build the email for a notification from its payload, without sending it
+
+        Pure function of the notification row (and its loaded recipient):
+        nothing is queried and the message text is never parsed.
 
+        Args:
+            notification: Notification instance (with recipient loaded)
+            render: If False, return an unrendered spec for EmailService.render_messages
+
+        Returns:
+            Message dict for EmailService.send_batch, or None if this
+            notification has no email
+        """
+        payload = notification.payload
+        if not payload:
+            return None
+
+        notification_type = notification.notification_type
+        recipient = notification.recipient
+
+        try:
             if notification_type == 'application_submitted':
-                # Get job title from notification message or parse it
-                job_title = notification.message.split("for ")[-1].split(" has")[0]
-                success = email_service.send_application_submitted_email(
-                    notification.recipient,
-                    job_title,
-                    notification.application_id
+                return email_service.build_application_submitted_email(
+                    recipient,
+                    payload['job_title'],
+                    notification.application_id,
+                    render=render
                 )
 
-            elif notification_type == 'application_status_changed':
-                # Parse message for job title and status
-                # Assuming message format: "Your application for {job} status changed to {status}"
-                parts = notification.message.split("for ")
-                if len(parts) > 1:
-                    job_title = parts[1].split(" status")[0]
-                    new_status = parts[1].split("to ")[-1].strip()
-                    success = email_service.send_application_status_changed_email(
-                        notification.recipient,
-                        job_title,
-                        "",  # old status not needed
-                        new_status,
-                        notification.application_id
-                    )
-                else:
-                    success = False
-
-            elif notification_type == 'new_application':
-                # Parse candidate name and job title from message
-                parts = notification.message.split(" applied for ")
-                if len(parts) > 1:
-                    candidate_name = parts[0].replace("New application: ", "")
-                    job_title = parts[1]
-                    success = email_service.send_new_application_email(
-                        notification.recipient,
-                        candidate_name,
-                        job_title,
-                        notification.application_id
-                    )
-                else:
-                    success = False
-
-            elif notification_type == 'job_match':
-                # Parse job details from message
-                # For now, use generic email or skip
-                success = False  # Implement when needed
-            else:
-                success = False
+            if notification_type == 'application_status_changed':
+                return email_service.build_application_status_changed_email(
+                    recipient,
+                    payload['job_title'],
+                    payload.get('old_status', ''),
+                    payload['new_status'],
+                    notification.application_id,
+                    render=render
+                )
+
+            if notification_type == 'new_application':
+                return email_service.build_new_application_email(
+                    recipient,
+                    payload['candidate_name'],
+                    payload['job_title'],
+                    notification.application_id,
+                    render=render
+                )
+
+            if notification_type == 'interview_scheduled':
+                return email_service.build_interview_scheduled_email(
+                    recipient,
+                    payload['job_title'],
+                    timezone.localtime(parse_datetime(payload['scheduled_at'])),
+                    payload['interview_type'],
+                    payload.get('location'),
+                    payload.get('notes', ''),
+                    render=render
+                )
+
+            if notification_type == 'interview_reminder':
+                return email_service.build_interview_reminder_email(
+                    recipient,
+                    payload['job_title'],
+                    timezone.localtime(parse_datetime(payload['scheduled_at'])),
+                    payload['interview_type'],
+                    payload.get('location'),
+                    render=render
+                )
+
+            if notification_type == 'interview_cancelled':
+                return email_service.build_interview_cancelled_email(
+                    recipient,
+                    payload['job_title'],
+                    timezone.localtime(parse_datetime(payload['scheduled_at'])),
+                    render=render
+                )
+
+            if notification_type == 'job_match':
+                return email_service.build_job_match_email(
+                    recipient,
+                    payload['job_title'],
+                    payload['company'],
+                    notification.job_id,
+                    render=render
+                )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Invalid email payload for notification {notification.id}: {str(e)}")
+
+        return None
+
+    @staticmethod
+    def build_digest_email(recipient, notifications, render=True):
+        """Roll several notifications of one recipient into a single digest email"""
+        items = [
+            (n.payload['candidate_name'], n.payload['job_title'])
+            for n in notifications
+            if 'candidate_name' in n.payload and 'job_title' in n.payload
+        ]
+        if not items:
+            return None
+        return email_service.build_new_application_digest_email(recipient, items, render=render)
+
+    @staticmethod
+    def send_notification_email(notification):
+        """
+        Send email for a notification right away, bypassing the outbox
+
+        Returns:
+            True if the email was sent
+        """
+        success = False
+        try:
+            message = NotificationService.build_notification_email(notification)
+            if message:
+                success = email_service.send_message(message, idempotency_key=notification.idempotency_key)
 
             if success:
                 notification.mark_as_emailed()
@@ -121,6 +280,8 @@ class NotificationService:
         except Exception as e:
             logger.error(f"Error sending email for notification {notification.id}: {str(e)}")
 
+        return success
+
 
 # Global instance
 notification_service = NotificationService()
@@ -0,0 +1,124 @@
+import gzip
+import json
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from ..models import Notification, NotificationArchive
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_FIELDS = [
+    'id', 'recipient_id', 'notification_type', 'title', 'message', 'link',
+    'payload', 'job_id', 'application_id', 'email_sent_at', 'created_at',
+]
+
+
+class NotificationRetention:
+    """
+    Move old read notifications out of the hot table
+
+    Rows are walked in primary key order and handled in small batches, each
+    in its own short transaction: copy to NotificationArchive (and optionally
+    a gzipped JSON Lines file), then delete by primary key. No long-running
+    statement ever holds locks on the notifications table.
+    """
+
+    def __init__(self, days=None, batch_size=1000):
+        self.days = days if days is not None else getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 90)
+        self.batch_size = batch_size
+
+    def cutoff(self, now=None):
+        return (now or timezone.now()) - timedelta(days=self.days)
+
+    def eligible(self, cutoff):
+        """Read notifications older than cutoff whose email is not still waiting"""
+        return Notification.objects.filter(
+            is_read=True,
+            created_at__lt=cutoff
+        ).exclude(email_status='pending')
+
+    def archive_batch(self, cutoff, after_id=0, export=None, keep_copy=True):
+        """
+        Archive one batch of rows with id > after_id
+
+        Args:
+            cutoff: Only rows created before this are archived
+            after_id: Keyset position from the previous batch
+            export: Optional open text file; each row is written as one JSON line
+            keep_copy: Copy rows into NotificationArchive before deleting them
+
+        Returns:
+            (number of rows archived, last id seen), last id is None when done
+        """
+        rows = list(
+            self.eligible(cutoff)
+            .filter(id__gt=after_id)
+            .order_by('id')
+            .values(*ARCHIVED_FIELDS)[:self.batch_size]
+        )
+        if not rows:
+            return 0, None
+
+        ids = [row['id'] for row in rows]
+        with transaction.atomic():
+            if keep_copy:
+                NotificationArchive.objects.bulk_create(
+                    [NotificationArchive(**row) for row in rows],
+                    ignore_conflicts=True  # Reruns after a crash are harmless
+                )
+            if export is not None:
+                export.writelines(json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in rows)
+            Notification.objects.filter(id__in=ids).delete()
+
+        return len(rows), ids[-1]
+
+    def run(self, export_path=None, keep_copy=True, max_batches=None, now=None):
+        """
+        Archive everything eligible, batch by batch
+
+        Args:
+            export_path: Optional path of a .jsonl.gz file to append rows to
+            keep_copy: Copy rows into NotificationArchive
+            max_batches: Stop after this many batches (None for no limit)
+
+        Returns:
+            Number of notifications archived
+        """
+        cutoff = self.cutoff(now)
+        export = gzip.open(export_path, 'at', encoding='utf-8') if export_path else None
+        total, after_id, batches = 0, 0, 0
+
+        try:
+            while max_batches is None or batches < max_batches:
+                count, after_id = self.archive_batch(cutoff, after_id, export, keep_copy)
+                if after_id is None:
+                    break
+                total += count
+                batches += 1
+        finally:
+            if export is not None:
+                export.close()
+
+        logger.info(f"Archived {total} notifications older than {cutoff.isoformat()}")
+        return total
+
+    def purge_archive(self, days, now=None):
+        """
+        Delete archived rows older than days, in batches
+
+        Returns:
+            Number of archived rows deleted
+        """
+        cutoff = (now or timezone.now()) - timedelta(days=days)
+        total = 0
+        while True:
+            ids = list(
+                NotificationArchive.objects.filter(created_at__lt=cutoff)
+                .order_by('id').values_list('id', flat=True)[:self.batch_size]
+            )
+            if not ids:
+                return total
+            total += NotificationArchive.objects.filter(id__in=ids).delete()[0]
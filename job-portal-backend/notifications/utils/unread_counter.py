@@ -0,0 +1,123 @@
+"""
+Per-user unread notification counters kept in the cache
+
+Every change also bumps a per-user version key. The notification stream
+watches only that key, so idle connections never touch the database.
+
+Counters are only correct across processes with a shared cache
+(settings.SHARED_CACHE, i.e. REDIS_URL). Without one, a change in one
+worker never reaches the others, so get() counts from the table instead.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+# Counters are rebuilt from the table when missing, so they can expire safely
+COUNTER_TIMEOUT = 60 * 60 * 24
+
+
+class UnreadCounter:
+    """Cached unread count and change version for each user"""
+
+    @staticmethod
+    def count_key(user_id):
+        return f"notifications:unread:{user_id}"
+
+    @staticmethod
+    def version_key(user_id):
+        return f"notifications:version:{user_id}"
+
+    def get(self, user_id):
+        """Unread count for a user; a cache miss or a per-process cache falls back to one COUNT query"""
+        if not settings.SHARED_CACHE:
+            return self.count(user_id)
+        count = cache.get(self.count_key(user_id))
+        if count is None:
+            count = self.recount(user_id)
+        return count
+
+    @staticmethod
+    def count(user_id):
+        """Unread count straight from the notifications table"""
+        from ..models import Notification
+
+        return Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+
+    def recount(self, user_id):
+        """Rebuild a user's counter from the notifications table"""
+        count = self.count(user_id)
+        cache.set(self.count_key(user_id), count, COUNTER_TIMEOUT)
+        return count
+
+    def get_version(self, user_id):
+        return cache.get(self.version_key(user_id), 0)
+
+    def adjust(self, user_id, delta):
+        """
+        Add delta to a user's counter and bump their version
+
+        A missing counter is left missing: the next get() recounts it, which is
+        cheaper and safer than guessing a starting value.
+        """
+        if delta:
+            try:
+                count = cache.incr(self.count_key(user_id), delta)
+                if count < 0:
+                    self.recount(user_id)
+            except ValueError:
+                pass
+        self._bump_version(user_id)
+
+    def reset(self, user_id, count=0):
+        """Set a user's counter outright (e.g. after mark_all_as_read)"""
+        cache.set(self.count_key(user_id), count, COUNTER_TIMEOUT)
+        self._bump_version(user_id)
+
+    def _bump_version(self, user_id):
+        key = self.version_key(user_id)
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+    def reconcile(self, user_ids):
+        """
+        Correct cached counters for a batch of users against the table
+
+        One grouped COUNT for the batch; only counters that drifted are
+        rewritten (and their version bumped, so open streams refresh).
+
+        Returns:
+            Number of counters corrected
+        """
+        from ..models import Notification
+
+        user_ids = list(user_ids)
+        actual = dict(
+            Notification.objects
+            .filter(recipient_id__in=user_ids, is_read=False)
+            .values('recipient_id')
+            .annotate(count=Count('id'))
+            .values_list('recipient_id', 'count')
+        )
+        cached = cache.get_many([self.count_key(user_id) for user_id in user_ids])
+
+        drifted = {
+            user_id: actual.get(user_id, 0)
+            for user_id in user_ids
+            if cached.get(self.count_key(user_id), actual.get(user_id, 0)) != actual.get(user_id, 0)
+        }
+        cache.set_many({self.count_key(user_id): count for user_id, count in drifted.items()}, COUNTER_TIMEOUT)
+        for user_id in drifted:
+            self._bump_version(user_id)
+        return len(drifted)
+
+    def adjust_on_commit(self, user_id, delta):
+        """Adjust after the current transaction commits, so rollbacks never count"""
+        transaction.on_commit(lambda: self.adjust(user_id, delta))
+
+
+# Global instance
+unread_counter = UnreadCounter()
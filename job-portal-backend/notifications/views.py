@@ -1,10 +1,28 @@
+import asyncio
+import json
+import secrets
+import time
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from .models import Notification
 from .serializers import NotificationSerializer
+from .utils.unread_counter import unread_counter
+
+# Send a comment line this often so proxies keep idle streams open
+STREAM_KEEPALIVE_SECONDS = 15
+# How long EventSource waits before reconnecting after the stream closes
+STREAM_RETRY_MS = 3000
+# Lifetime of a stream ticket; it only has to survive until EventSource connects
+STREAM_TICKET_SECONDS = 60
 
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
@@ -36,10 +54,12 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['post'])
     def mark_all_as_read(self, request):
         """Mark all notifications as read for current user"""
-        count = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).update(is_read=True)
+        with transaction.atomic():
+            count = Notification.objects.filter(
+                recipient=request.user,
+                is_read=False
+            ).update(is_read=True)
+            unread_counter.adjust_on_commit(request.user.id, -count)
         return Response({
             'success': True,
             'message': f'{count} notifications marked as read',
@@ -48,13 +68,44 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        """Get count of unread notifications"""
-        count = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
+        """
+        Get count of unread notifications
+
+        Served from the cached counter. Clients sending If-None-Match with the
+        last ETag get an empty 304 while the count is unchanged.
+        """
+        count = unread_counter.get(request.user.id)
+        etag = f'"unread-{request.user.id}-{count}"'
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({
+                'count': count
+            })
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    @action(detail=False, methods=['post'])
+    def stream_ticket(self, request):
+        """
+        Issue a single-use ticket for the notification stream
+
+        EventSource cannot send an Authorization header, so the stream URL
+        carries this ticket instead of the access token. Without a shared
+        cache the stream is disabled (404) and the client polls unread_count.
+        """
+        if not settings.SHARED_CACHE:
+            return Response(
+                {'error': 'Notification stream is not enabled'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        ticket = secrets.token_urlsafe(32)
+        cache.set(_ticket_key(ticket), request.user.id, STREAM_TICKET_SECONDS)
         return Response({
-            'count': count
+            'ticket': ticket,
+            'expires_in': STREAM_TICKET_SECONDS
         })
 
     @action(detail=False, methods=['get'])
@@ -66,3 +117,113 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         )[:10]
         serializer = self.get_serializer(notifications, many=True)
         return Response(serializer.data)
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _ticket_key(ticket):
+    return f"notifications:stream-ticket:{ticket}"
+
+
+def redeem_stream_ticket(ticket):
+    """
+    User id a stream ticket was issued to, or None
+
+    A ticket works once: deleting it is what claims it, so two connections
+    racing with the same ticket cannot both get through.
+    """
+    if not ticket:
+        return None
+    key = _ticket_key(ticket)
+    user_id = cache.get(key)
+    if user_id is None or not cache.delete(key):
+        return None
+    if not get_user_model().objects.filter(id=user_id, is_active=True).exists():
+        return None
+    return user_id
+
+
+def _notifications_after(user_id, last_id):
+    notifications = Notification.objects.filter(recipient_id=user_id, id__gt=last_id).order_by('id')[:20]
+    return NotificationSerializer(notifications, many=True).data
+
+
+def _latest_notification_id(user_id):
+    return Notification.objects.filter(recipient_id=user_id).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+# Version checks only read the cache, so they run in the shared thread pool
+# instead of queueing behind sync views on the thread-sensitive executor
+_get_version = sync_to_async(unread_counter.get_version, thread_sensitive=False)
+
+
+async def _notification_events(user_id):
+    """
+    Event stream for one user
+
+    Between changes only the cached version key is read; the database is hit
+    only when the version moves.
+    """
+    poll_seconds = settings.NOTIFICATION_STREAM_POLL_SECONDS
+    deadline = time.monotonic() + settings.NOTIFICATION_STREAM_MAX_SECONDS
+
+    version = await _get_version(user_id)
+    count = await sync_to_async(unread_counter.get)(user_id)
+    last_id = await sync_to_async(_latest_notification_id)(user_id)
+
+    yield f"retry: {STREAM_RETRY_MS}\n" + _sse('unread_count', {'count': count, 'delta': 0})
+
+    last_sent = time.monotonic()
+    while time.monotonic() < deadline:
+        await asyncio.sleep(poll_seconds)
+
+        current_version = await _get_version(user_id)
+        if current_version == version:
+            if time.monotonic() - last_sent >= STREAM_KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield ": keepalive\n\n"
+            continue
+        version = current_version
+
+        new_notifications = await sync_to_async(_notifications_after)(user_id, last_id)
+        for notification in new_notifications:
+            last_id = notification['id']
+            yield _sse('notification', notification)
+
+        new_count = await sync_to_async(unread_counter.get)(user_id)
+        yield _sse('unread_count', {'count': new_count, 'delta': new_count - count})
+        count = new_count
+        last_sent = time.monotonic()
+
+
+async def notification_stream(request):
+    """
+    Push new notifications and unread count changes as server-sent events
+
+    GET /api/notifications/stream/?ticket=<ticket from POST stream_ticket/>
+
+    Events:
+        unread_count: {"count": 3, "delta": 1}
+        notification: a serialized notification
+
+    Only enabled with a shared cache (REDIS_URL): idle streams then cost one
+    cache read per poll. Without one the client keeps polling unread_count.
+    The connection closes after NOTIFICATION_STREAM_MAX_SECONDS and the
+    client reconnects with a fresh ticket.
+    """
+    if not settings.SHARED_CACHE:
+        return JsonResponse({'error': 'Notification stream is not enabled'}, status=404)
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI (runserver) the async stream would be buffered, never pushed
+        return JsonResponse({'error': 'Notification stream requires the ASGI server'}, status=501)
+
+    user_id = await sync_to_async(redeem_stream_ticket)(request.GET.get('ticket'))
+    if user_id is None:
+        return JsonResponse({'error': 'Invalid or expired stream ticket'}, status=401)
+
+    response = StreamingHttpResponse(_notification_events(user_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx-style proxies from buffering events
+    return response